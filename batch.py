@@ -0,0 +1,142 @@
+import os
+import sys
+import time
+import argparse
+import threading
+import pandas as pd
+from ui import jobs
+from generator.xirr import proc
+from utils.processor import Processor
+
+STEPS = ('holdings', 'excel', 'report', 'xirr')
+
+class ConsoleJob:
+    def __init__(self, every=25):
+        self.stop = threading.Event()
+        self.every = every
+
+    @property
+    def cancelled(self):
+        return self.stop.is_set()
+
+    def check(self):
+        if self.stop.is_set():
+            raise KeyboardInterrupt()
+
+    def log(self, msg):
+        print(msg, flush=True)
+
+    def step(self, done, total, msg=''):
+        if msg and total and done % self.every == 0:
+            print(f"[{done + 1}/{total}] {msg}", flush=True)
+
+    def downloaded(self, success, total, fails):
+        pass
+
+def read_clients(values):
+    if not values:
+        return None
+
+    codes = []
+    for value in values:
+        if os.path.isfile(value):
+            if value.lower().endswith(('.xlsx', '.xls')):
+                df = pd.read_excel(value)
+                col = next((c for c in df.columns if 'code' in str(c).lower()), df.columns[0])
+                codes += df[col].dropna().astype(str).str.strip().tolist()
+            else:
+                with open(value) as f:
+                    codes += [line.strip() for line in f if line.strip()]
+        else:
+            codes += [c.strip() for c in value.split(',') if c.strip()]
+    return codes
+
+def start_date_arg(value):
+    try:
+        return pd.to_datetime(value).date()
+    except (ValueError, TypeError):
+        raise argparse.ArgumentTypeError(f"invalid date: {value!r}, expected YYYY-MM-DD")
+
+def parse_args(argv):
+    desktop = jobs.desktop_dir()
+    p = argparse.ArgumentParser(prog='portfolio_review batch',
+                                description='Run the holdings -> Excel -> PDF -> XIRR pipeline without the UI.')
+    p.add_argument('--holdings', default=os.path.join(desktop, 'Holding'), help='holdings workbook folder')
+    p.add_argument('--ledger', default=os.path.join(desktop, 'Ledger'), help='ledger folder')
+    p.add_argument('--mf', default=os.path.join(desktop, 'MF Transactions'), help='MF transactions folder')
+    p.add_argument('--out', default=desktop,
+                   help='output root; excel_reports, client_reports and xirr_reports are created under it')
+    p.add_argument('--excel-out', help='internal review sheet folder (default OUT/excel_reports)')
+    p.add_argument('--report-out', help='client report folder (default OUT/client_reports)')
+    p.add_argument('--xirr-out', help='XIRR report folder (default OUT/xirr_reports)')
+    p.add_argument('--clients', action='append', metavar='CODES',
+                   help='comma separated client codes, or a .txt/.xlsx file of codes; repeatable')
+    p.add_argument('--steps', default=','.join(STEPS),
+                   help=f"comma separated subset of {','.join(STEPS)} (default: all)")
+    p.add_argument('--excel-engine', choices=('workbook', 'stream'),
+                   help='internal review sheet writer (default: $PORTFOLIO_REVIEW_EXCEL or workbook)')
+    p.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='worker processes')
+    p.add_argument('--init-val', type=float, default=100000, help='initial portfolio value for XIRR')
+    p.add_argument('--start-date', type=start_date_arg, help='XIRR start date, YYYY-MM-DD')
+    p.add_argument('--full', action='store_true', help='reprocess every holdings file, ignoring the manifest')
+    return p.parse_args(argv)
+
+def run(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    steps = [s.strip() for s in args.steps.split(',') if s.strip()]
+    bad = [s for s in steps if s not in STEPS]
+    if bad:
+        print(f"Unknown steps: {', '.join(bad)}", file=sys.stderr)
+        return 2
+
+    clients = read_clients(args.clients)
+    excel_out = args.excel_out or os.path.join(args.out, 'excel_reports')
+    report_out = args.report_out or os.path.join(args.out, 'client_reports')
+    xirr_out = args.xirr_out or os.path.join(args.out, 'xirr_reports')
+    cons_path = os.path.join(args.holdings, 'Consolidated_Holdings.xlsx')
+
+    job = ConsoleJob()
+    failed = False
+    t = time.perf_counter()
+
+    try:
+        if 'holdings' in steps:
+            processor = Processor(args.holdings)
+            out_file = processor.process_holdings(workers=args.workers, incremental=not args.full)
+            failed |= out_file is None
+
+        if 'xirr' in steps:
+            job.log("Generating XIRR reports...")
+            out_files = proc(init_val=args.init_val, start_date=args.start_date, workers=args.workers,
+                             ldg_dir=args.ledger, mf_dir=args.mf, out_dir=xirr_out,
+                             cons_path=cons_path, codes=clients)
+            job.log(f"✅ Generated {len(out_files or [])} XIRR reports in {xirr_out}")
+            failed |= not out_files
+
+        if 'excel' in steps:
+            res = jobs.generate_excel(job, args.holdings, ledger_folder=args.ledger,
+                                      out_dir=excel_out, clients=clients, engine=args.excel_engine)
+            job.log(f"✅ Generated {res.get('processed', 0)}/{res['total']} Excel reports in {excel_out}")
+            failed |= not res.get('processed')
+
+        if 'report' in steps:
+            res = jobs.generate_reports(job, holding_folder=args.holdings, ledger_folder=args.ledger,
+                                        out_dir=report_out, xirr_dir=xirr_out, clients=clients,
+                                        workers=args.workers)
+            if res is None:
+                job.log("⚠️ No holdings files found for client reports")
+                failed = True
+            else:
+                job.log(f"✅ Generated {res['processed']} client reports, skipped {res['skipped']}, in {report_out}")
+                failed |= not res['processed']
+    except KeyboardInterrupt:
+        job.stop.set()
+        print("⏹ Cancelled", file=sys.stderr)
+        return 130
+
+    job.log(f"Done in {time.perf_counter() - t:.1f}s")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(run())
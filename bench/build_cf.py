@@ -0,0 +1,59 @@
+import sys
+import time
+import random
+import tracemalloc
+import pandas as pd
+from datetime import date, timedelta
+
+from generator.xirr import build_cf
+
+def make_ldg(n, seed=0):
+    rnd = random.Random(seed)
+    base = date(2020, 1, 1)
+    rows = []
+    for _ in range(n):
+        vch = rnd.choice(['Payin', 'Payout', 'Bill'])
+        amt = f"{rnd.randint(1000, 90000):,}"
+        rows.append({
+            'Voucher Type': vch,
+            'Effective Date': (base + timedelta(days=rnd.randint(0, 1500))).strftime('%Y-%m-%d'),
+            'Credit': amt if vch == 'Payin' else None,
+            'Debit': amt if vch == 'Payout' else None,
+            'Balance': rnd.randint(-5000, 5000),
+        })
+    return pd.DataFrame(rows)
+
+def make_mf(n, seed=0):
+    rnd = random.Random(seed)
+    base = date(2020, 1, 1)
+    return pd.DataFrame({
+        'Transaction Date': [(base + timedelta(days=rnd.randint(0, 1500))).strftime('%d-%b-%Y') for _ in range(n)],
+        'Transaction Type': [rnd.choice(['Buy', 'Sell', 'Dividend']) for _ in range(n)],
+        'Transaction Value': [rnd.randint(500, 50000) for _ in range(n)],
+    })
+
+def run(n, reps=3):
+    ldg = make_ldg(n)
+    mft = make_mf(n)
+
+    best = None
+    for _ in range(reps):
+        t = time.perf_counter()
+        build_cf(ldg, mft, 100000, 150000, date(2020, 1, 1))
+        el = time.perf_counter() - t
+        best = el if best is None else min(best, el)
+
+    tracemalloc.start()
+    build_cf(ldg, mft, 100000, 150000, date(2020, 1, 1))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return best, peak
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [100, 1000, 10000]
+
+    print(f"{'rows':>8} {'time (ms)':>12} {'peak (KiB)':>12}")
+    for n in sizes:
+        el, peak = run(n)
+        print(f"{2 * n:>8} {el * 1000:>12.1f} {peak / 1024:>12.1f}")
@@ -0,0 +1,83 @@
+import os
+import sys
+import time
+import random
+import tempfile
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+from generator.excel import excel_generator
+
+WIDTH = 14
+
+def blank():
+    return [np.nan] * WIDTH
+
+def line(*cells, at=0):
+    row = blank()
+    for i, v in enumerate(cells):
+        row[at + i] = v
+    return row
+
+def make_holdings(n, seed=0):
+    rnd = random.Random(seed)
+    stocks = ['HDFC Bank', 'Reliance Industries', 'GOLD BEES ETF', 'NIFTY BEES ETF', 'Nifty 1D Rate Liquid BeES']
+    schemes = ['Parag Parikh Flexi Cap', 'SBI Magnum Gilt Fund', 'ICICI Liquid Fund', 'HDFC Short Term Debt']
+    bonds = ['Some NCD 2027', 'NHAI Tax Free 2030', 'SGB 2028 Series', 'GOI 7.26% 2033']
+
+    def eq_row(name):
+        row = line(name, rnd.randint(1, 500), round(rnd.uniform(50, 3000), 2), 'INE000',
+                   round(rnd.uniform(50, 3000), 2), round(rnd.uniform(-50000, 50000), 2))
+        row[10] = round(rnd.uniform(1000, 500000), 2)
+        return row
+
+    def mf_row():
+        row = line(rnd.choice(['Equity', 'Debt', 'Cash']), rnd.choice(schemes), round(rnd.uniform(1, 900), 3),
+                   round(rnd.uniform(1000, 50000), 2), np.nan, round(rnd.uniform(1000, 50000), 2),
+                   round(rnd.uniform(-5000, 5000), 2))
+        row[12] = round(rnd.uniform(1000, 500000), 2)
+        return row
+
+    header = ['Instrument Name', 'Qty', 'Buy Price', 'ISIN', 'Curr Price', 'P&L'] + [f'x{i}' for i in range(6, WIDTH)]
+    header[10] = 'Market Value'
+    mf_header = ['Asset Type', 'Scheme Name', 'Folio', 'Units', 'x4', 'NAV', 'P&L'] + [f'x{i}' for i in range(7, WIDTH)]
+    mf_header[12] = 'Market Value'
+
+    rows = [line('Holding Statement', at=5), line('Client Equity Code/UCID/Name', 'B001/UB1/Bench Client'), blank()]
+    rows += [line('Equity:-'), header] + [eq_row(rnd.choice(stocks)) for _ in range(n)]
+    rows += [line('Total:'), blank(), blank(), blank()]
+    rows += [line('Mutual Fund:-'), mf_header] + [mf_row() for _ in range(n)]
+    rows += [line('Total:'), blank(), blank(), blank()]
+    rows += [line('FnO:-'), line('Instrument Name'), line('Total:'), blank()]
+    rows += [line('Bond:-'), header] + [eq_row(rnd.choice(bonds)) for _ in range(max(1, n // 10))]
+    rows += [line('Total:'), blank(), line('Disclaimer text')]
+    return pd.DataFrame(rows, columns=[f'Unnamed: {i}' for i in range(WIDTH)])
+
+def run(n, engine, reps=3):
+    df = make_holdings(n)
+    ldg = pd.DataFrame({'Balance': [25000]})
+
+    best = None
+    for _ in range(reps):
+        t = time.perf_counter()
+        os.remove(excel_generator(df, ldg, engine=engine))
+        el = time.perf_counter() - t
+        best = el if best is None else min(best, el)
+
+    tracemalloc.start()
+    os.remove(excel_generator(df, ldg, engine=engine))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return best, peak
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [100, 1000, 5000]
+
+    os.chdir(tempfile.mkdtemp())
+    print(f"{'rows':>8} {'engine':>10} {'time (ms)':>12} {'peak (KiB)':>12}")
+    for n in sizes:
+        for engine in ('workbook', 'stream'):
+            el, peak = run(n, engine)
+            print(f"{2 * n:>8} {engine:>10} {el * 1000:>12.1f} {peak / 1024:>12.1f}")
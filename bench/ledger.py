@@ -0,0 +1,21 @@
+import sys
+import time
+from datetime import date
+
+from bench.build_cf import make_ldg
+from generator.xirr import ldg_flows
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    ldg = make_ldg(n)
+
+    best = None
+    for _ in range(3):
+        t = time.perf_counter()
+        flows, _ = ldg_flows(ldg, date.today())
+        el = time.perf_counter() - t
+        best = el if best is None else min(best, el)
+
+    print(f"ledger rows: {n}")
+    print(f"flows: {len(flows)}")
+    print(f"ldg_flows: {best * 1000:.1f} ms")
@@ -0,0 +1,46 @@
+import os
+import sys
+import time
+import tempfile
+from reportlab.lib.styles import getSampleStyleSheet
+
+from generator.report import report_styles, table_styles, report_doc, cover
+
+def legacy(path):
+    for _ in range(4):
+        getSampleStyleSheet()
+        report_styles.cache_clear()
+        table_styles.cache_clear()
+        report_styles()
+        table_styles()
+    report_doc(os.path.join(path, 'cover.pdf'))
+    report_doc(os.path.join(path, 'out.pdf'))
+    cover('C001', 'Client')
+
+def shared(path):
+    report_styles()
+    table_styles()
+    report_doc(os.path.join(path, 'out.pdf'))
+    cover('C001', 'Client')
+
+def best(fn, path, n, reps=5):
+    out = None
+    for _ in range(reps):
+        t = time.perf_counter()
+        for _ in range(n):
+            fn(path)
+        el = (time.perf_counter() - t) / n
+        out = el if out is None else min(out, el)
+    return out
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    with tempfile.TemporaryDirectory() as path:
+        old = best(legacy, path, n)
+        new = best(shared, path, n)
+
+    print(f"reports: {n}")
+    print(f"per-report setup, rebuilt styles + 2 docs: {old * 1e6:8.1f} us")
+    print(f"per-report setup, shared registry:         {new * 1e6:8.1f} us")
+    print(f"saved per 1000 reports: {(old - new) * 1000 * 1000:.0f} ms")
@@ -0,0 +1,52 @@
+import io
+import sys
+import time
+import random
+import numpy as np
+import pandas as pd
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import SimpleDocTemplate
+
+from generator.report import deq, deb
+from utils.holdings import Positions
+
+WORDS = ['HDFC', 'ICICI', 'Prudential', 'Nippon', 'India', 'Flexi', 'Cap', 'Fund', 'Direct', 'Plan',
+         'Growth', 'Liquid', 'Short', 'Term', 'Debt', 'Index', 'Nifty', '50', 'Value', 'Option']
+
+def make_positions(n, name_col, cols, seed=0, schemes=300):
+    rnd = random.Random(seed)
+    pool = [' '.join(rnd.choice(WORDS) for _ in range(rnd.randint(3, 9))) for _ in range(schemes)]
+    names = pd.Categorical([rnd.choice(pool) for _ in range(n)])
+    values = {c: np.round(np.array([rnd.uniform(0, 500000) for _ in range(n)]), rnd.choice([0, 2])) for c in cols}
+    return Positions(name_col, names, values)
+
+def totals(data, cols):
+    return ['Total:'] + [round(float(np.nansum(data.col(c))), 2) for c in cols]
+
+def run(n):
+    eq = make_positions(max(1, n // 10), 0, [1, 2, 4, 5, 10], seed=1)
+    mf = make_positions(n, 1, [2, 3, 5, 6, 12], seed=2)
+    empty = eq.take(np.zeros(len(eq), dtype=bool))
+    eq_cols, mf_cols = [1, 2, 4, 5, 10], [2, 3, 5, 6, 12]
+
+    t = time.perf_counter()
+    content = deq(eq, totals(eq, eq_cols), empty, totals(empty, eq_cols), mf, totals(mf, mf_cols))
+    content += deb(empty, totals(empty, eq_cols), mf, totals(mf, mf_cols), empty, totals(empty, eq_cols))
+    built = time.perf_counter() - t
+
+    t = time.perf_counter()
+    SimpleDocTemplate(io.BytesIO(), pagesize=letter).build(content)
+    laid = time.perf_counter() - t
+    return built, laid
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    best = None
+    for _ in range(3):
+        r = run(n)
+        best = r if best is None else min(best, r)
+
+    print(f"mf rows: {n} (x2 tables)")
+    print(f"deq + deb flowables: {best[0] * 1000:8.1f} ms")
+    print(f"layout + render:     {best[1] * 1000:8.1f} ms")
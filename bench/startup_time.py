@@ -0,0 +1,45 @@
+import os
+import sys
+import json
+import subprocess
+
+HEAVY = ('pandas', 'numpy', 'scipy', 'matplotlib', 'reportlab', 'openpyxl', 'selenium')
+
+CHILD = r'''
+import sys, time, json
+t0 = time.perf_counter()
+from PyQt5.QtWidgets import QApplication
+app = QApplication(sys.argv[:1])
+t1 = time.perf_counter()
+from ui.ui import Main
+t2 = time.perf_counter()
+w = Main()
+w.show()
+app.processEvents()
+t3 = time.perf_counter()
+heavy = sorted({m.split('.')[0] for m in sys.modules} & set(json.loads(sys.argv[1])))
+print(json.dumps({'qt': t1 - t0, 'import': t2 - t1, 'window': t3 - t2, 'total': t3 - t0, 'heavy': heavy}))
+w.close()
+'''
+
+def measure(root):
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    env['PYTHONPATH'] = root + os.pathsep + env.get('PYTHONPATH', '')
+    out = subprocess.run([sys.executable, '-c', CHILD, json.dumps(HEAVY)], cwd=root, env=env,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+if __name__ == "__main__":
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    reps = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    runs = [measure(root) for _ in range(reps)]
+    best = min(runs, key=lambda r: r['total'])
+
+    print(f"runs: {reps} (best shown)")
+    print(f"QApplication:  {best['qt'] * 1000:8.1f} ms")
+    print(f"import ui.ui:  {best['import'] * 1000:8.1f} ms")
+    print(f"Main().show(): {best['window'] * 1000:8.1f} ms")
+    print(f"total:         {best['total'] * 1000:8.1f} ms")
+    print(f"heavy modules loaded: {', '.join(best['heavy']) or 'none'}")
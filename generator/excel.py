@@ -1,11 +1,28 @@
+import os
 import pandas as pd
 from openpyxl import Workbook
-from utils.format import format_num
+from utils.format import format_num, NUM_FMT
+from utils.holdings import as_holdings
+from utils.xlsx import StreamBook
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import PatternFill, Alignment, Font, Border, Side
 from openpyxl.formula.translate import Translator
 
-def excel_generator(df, df2):    
+ENGINES = ('workbook', 'stream')
+
+BOLD = Font(bold=True)
+CENTER = Alignment(horizontal="center")
+LEFT = Alignment(horizontal="left")
+TOTAL_ROW_FILL = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
+
+def excel_engine(engine=None):
+    engine = (engine or os.environ.get('PORTFOLIO_REVIEW_EXCEL', 'workbook')).lower()
+    if engine not in ENGINES:
+        print(f"Unknown Excel engine '{engine}', using workbook")
+        return 'workbook'
+    return engine
+
+def excel_generator(df, df2, sheet=None, engine=None):    
     available_cash = 0
     try:
         balance_col = None
@@ -27,38 +44,21 @@ def excel_generator(df, df2):
         print(f"Error accessing balance: {e}")
         available_cash = 0
         
-    client_info_row = df[df['Unnamed: 0'] == 'Client Equity Code/UCID/Name'].index[0]
-    client_info = str(df.iloc[client_info_row, 1]).strip()
-    parts = client_info.split('/')
-    client_code = parts[0].strip()  
-    client_name = parts[-1].strip()  
-
-    equity_row = df[df['Unnamed: 0'] == 'Equity:-'].index[0]
-    mf_row = df[df['Unnamed: 0'] == 'Mutual Fund:-'].index[0]
-    fno_row = df[df['Unnamed: 0'] == 'FnO:-'].index[0]
-    bond_row = df[df['Unnamed: 0'] == 'Bond:-'].index[0]
-
-    equity_header = df.iloc[equity_row + 1].tolist()
-    equity_end = mf_row - 4  
-    equity_data = df.iloc[equity_row + 2:equity_end].copy()
-
-    mf_header = df.iloc[mf_row + 1].tolist()
-    mf_end = fno_row - 4
-    mf_data = df.iloc[mf_row + 2:mf_end].copy()
-
-    bond_header = df.iloc[bond_row + 1].tolist()
-    bond_end = len(df)
-    for i in range(bond_row + 2, len(df)):
-        if i >= len(df) or pd.isna(df.iloc[i, 0]) or df.iloc[i, 0] == '':
-            bond_end = i
-            break
-    bond_data = df.iloc[bond_row + 2:bond_end].copy()
-
-    equity_data = equity_data[equity_data['Unnamed: 0'] != 'Total:']
-    mf_data = mf_data[mf_data['Unnamed: 0'] != 'Total:']
-    bond_data = bond_data[bond_data['Unnamed: 0'] != 'Total:']
-
-    wb = Workbook()
+    holdings = as_holdings(df, sheet)
+    
+    client_code = holdings.header.code
+    client_name = holdings.header.name
+
+    equity_data = holdings.equity
+    equity_header = equity_data.header
+
+    mf_data = holdings.mf
+    mf_header = mf_data.header
+
+    bond_data = holdings.bond
+    bond_header = bond_data.header
+
+    wb = StreamBook() if excel_engine(engine) == 'stream' else Workbook()
     ws = wb.active
 
     light_blue_fill = PatternFill(start_color="ADD8E6", end_color="ADD8E6", fill_type="solid")
@@ -69,15 +69,19 @@ def excel_generator(df, df2):
 
     ws.cell(row=1, column=1, value=client_name)
     ws.cell(row=1, column=1).fill = light_blue_fill
-    ws.cell(row=1, column=1).font = Font(bold=True)
-    ws.cell(row=1, column=1).alignment = Alignment(horizontal="center")
+    ws.cell(row=1, column=1).font = BOLD
+    ws.cell(row=1, column=1).alignment = CENTER
 
     ws.cell(row=2, column=1, value=client_code)
     ws.cell(row=2, column=1).fill = light_blue_fill
-    ws.cell(row=2, column=1).alignment = Alignment(horizontal="center")
+    ws.cell(row=2, column=1).alignment = CENTER
+
+    is_etf = equity_data.contains('ETF')
+    is_liquid = equity_data.contains('Nifty 1D Rate Liquid BeES')
+    is_gilt = equity_data.contains('Nippon India ETF Nifty 8-13 yr G-Sec LongTerm Gilt')
+    is_5yr = equity_data.contains('Nippon India ETF Nifty 5 Yr Benchmark GSec')
 
-    direct_equity = equity_data[~equity_data['Unnamed: 0'].str.contains('ETF', na=False)]
-    direct_equity = direct_equity[~direct_equity['Unnamed: 0'].str.contains('Nifty 1D Rate Liquid BeES', na=False)]
+    direct_equity = equity_data.take(~is_etf & ~is_liquid)
 
     equity_cols_to_keep = [0, 1, 2, 4, 10, 5]  
     equity_rename = {2: "Buy Price", 10: "P&L"}
@@ -89,62 +93,45 @@ def excel_generator(df, df2):
 
     
     market_value_col = equity_cols_to_keep[4]  
-    market_values = pd.to_numeric(direct_equity[f'Unnamed: {market_value_col}'], errors='coerce')
-    direct_equity_market_value = market_values.sum() if not market_values.isna().all() else 0
+    direct_equity_market_value = direct_equity.total(market_value_col)
     direct_equity_total.append(direct_equity_market_value)
 
     
     pnl_col = equity_cols_to_keep[5]  
-    pnl_values = pd.to_numeric(direct_equity[f'Unnamed: {pnl_col}'], errors='coerce')
-    direct_equity_pnl = pnl_values.sum() if not pnl_values.isna().all() else 0
+    direct_equity_pnl = direct_equity.total(pnl_col)
     direct_equity_total.append(direct_equity_pnl)
 
-    etf_equity = equity_data[equity_data['Unnamed: 0'].str.contains('ETF', na=False)]
-    etf_equity = etf_equity[~etf_equity['Unnamed: 0'].str.contains('Nifty 1D Rate Liquid BeES', na=False)]
-    etf_equity = etf_equity[~etf_equity['Unnamed: 0'].str.contains('Nippon India ETF Nifty 8-13 yr G-Sec LongTerm Gilt', na=False)]
-    etf_equity = etf_equity[~etf_equity['Unnamed: 0'].str.contains('Nippon India ETF Nifty 5 Yr Benchmark GSec', na=False)]
+    etf_equity = equity_data.take(is_etf & ~is_liquid & ~is_gilt & ~is_5yr)
 
     
     etf_equity_total = ['Total:']
     
     etf_equity_total.extend([''] * 3)
-
-    
-    market_values = pd.to_numeric(etf_equity[f'Unnamed: {market_value_col}'], errors='coerce')
-    etf_equity_market_value = market_values.sum() if not market_values.isna().all() else 0
+    etf_equity_market_value = etf_equity.total(market_value_col)
     etf_equity_total.append(etf_equity_market_value)
-
-    
-    pnl_values = pd.to_numeric(etf_equity[f'Unnamed: {pnl_col}'], errors='coerce')
-    etf_equity_pnl = pnl_values.sum() if not pnl_values.isna().all() else 0
+    etf_equity_pnl = etf_equity.total(pnl_col)
     etf_equity_total.append(etf_equity_pnl)
 
-    debt_etf = equity_data[equity_data['Unnamed: 0'].str.contains('Nifty 1D Rate Liquid BeES', na=False)]
-    nifty_5yr_etf = equity_data[equity_data['Unnamed: 0'].str.contains('Nippon India ETF Nifty 5 Yr Benchmark GSec', na=False)]
+    debt_etf = equity_data.take(is_liquid)
+    nifty_5yr_etf = equity_data.take(is_5yr)
 
     if not nifty_5yr_etf.empty:
-        debt_etf = pd.concat([debt_etf, nifty_5yr_etf], ignore_index=True)
+        debt_etf = debt_etf.append(nifty_5yr_etf)
     
     debt_etf_total = ['Total:']
     
     debt_etf_total.extend([''] * 3)
-
-    
-    market_values = pd.to_numeric(debt_etf[f'Unnamed: {market_value_col}'], errors='coerce')
-    debt_etf_market_value = market_values.sum() if not market_values.isna().all() else 0
+    debt_etf_market_value = debt_etf.total(market_value_col)
     debt_etf_total.append(debt_etf_market_value)
-
-    
-    pnl_values = pd.to_numeric(debt_etf[f'Unnamed: {pnl_col}'], errors='coerce')
-    debt_etf_pnl = pnl_values.sum() if not pnl_values.isna().all() else 0
+    debt_etf_pnl = debt_etf.total(pnl_col)
     debt_etf_total.append(debt_etf_pnl)
 
-    gilt_etf = equity_data[equity_data['Unnamed: 0'].str.contains('Nippon India ETF Nifty 8-13 yr G-Sec LongTerm Gilt', na=False)]
+    gilt_etf = equity_data.take(is_gilt)
 
     mf_cols_to_keep = [1, 2, 3, 5, 12, 6]  
     mf_rename = {3: "Buy Price", 12: "P&L"}
 
-    equity_mf = mf_data[mf_data['Unnamed: 0'] == 'Equity']
+    equity_mf = mf_data.take(mf_data.asset_is('Equity'))
 
     
     equity_mf_total = ['Total:']
@@ -153,49 +140,28 @@ def excel_generator(df, df2):
 
     
     mf_market_value_col = mf_cols_to_keep[4]  
-    market_values = pd.to_numeric(equity_mf[f'Unnamed: {mf_market_value_col}'], errors='coerce')
-    equity_mf_market_value = market_values.sum() if not market_values.isna().all() else 0
+    equity_mf_market_value = equity_mf.total(mf_market_value_col)
     equity_mf_total.append(equity_mf_market_value)
 
     
     mf_pnl_col = mf_cols_to_keep[5]  
-    pnl_values = pd.to_numeric(equity_mf[f'Unnamed: {mf_pnl_col}'], errors='coerce')
-    equity_mf_pnl = pnl_values.sum() if not pnl_values.isna().all() else 0
+    equity_mf_pnl = equity_mf.total(mf_pnl_col)
     equity_mf_total.append(equity_mf_pnl)
 
-    debt_mf = mf_data[mf_data['Unnamed: 0'] == 'Debt']
+    debt_mf = mf_data.take(mf_data.asset_is('Debt'))
 
     if not gilt_etf.empty:
-        gilt_for_debt = pd.DataFrame(columns=debt_mf.columns)
-
-        column_mapping = {
-            'Unnamed: 0': 'Unnamed: 1',  
-            'Unnamed: 1': 'Unnamed: 2',  
-            'Unnamed: 2': 'Unnamed: 3',  
-            'Unnamed: 4': 'Unnamed: 5',  
-            'Unnamed: 5': 'Unnamed: 6',  
-            'Unnamed: 10': 'Unnamed: 12' 
-        }
-    
-        for old_col, new_col in column_mapping.items():
-            if old_col in gilt_etf.columns and new_col in debt_mf.columns:
-                gilt_for_debt[new_col] = gilt_etf[old_col].values
-    
-        debt_mf = pd.concat([debt_mf, gilt_for_debt], ignore_index=True)
+        column_mapping = {1: 2, 2: 3, 4: 5, 5: 6, 10: 12}
+        gilt_for_debt = gilt_etf.remap(1, column_mapping, asset_col=0)
+        debt_mf = debt_mf.append(gilt_for_debt)
 
     
     debt_mf_total = ['Total:']
     
     debt_mf_total.extend([''] * 3)
-
-    
-    market_values = pd.to_numeric(debt_mf[f'Unnamed: {mf_market_value_col}'], errors='coerce')
-    debt_mf_market_value = market_values.sum() if not market_values.isna().all() else 0
+    debt_mf_market_value = debt_mf.total(mf_market_value_col)
     debt_mf_total.append(debt_mf_market_value)
-
-    
-    pnl_values = pd.to_numeric(debt_mf[f'Unnamed: {mf_pnl_col}'], errors='coerce')
-    debt_mf_pnl = pnl_values.sum() if not pnl_values.isna().all() else 0
+    debt_mf_pnl = debt_mf.total(mf_pnl_col)
     debt_mf_total.append(debt_mf_pnl)
 
     bond_cols_to_keep = [0, 1, 2, 4, 10, 5]  
@@ -208,14 +174,12 @@ def excel_generator(df, df2):
 
     
     bond_market_value_col = bond_cols_to_keep[4]  
-    market_values = pd.to_numeric(bond_data[f'Unnamed: {bond_market_value_col}'], errors='coerce')
-    bond_market_value = market_values.sum() if not market_values.isna().all() else 0
+    bond_market_value = bond_data.total(bond_market_value_col)
     bond_total.append(bond_market_value)
 
     
     bond_pnl_col = bond_cols_to_keep[5]  
-    pnl_values = pd.to_numeric(bond_data[f'Unnamed: {bond_pnl_col}'], errors='coerce')
-    bond_pnl = pnl_values.sum() if not pnl_values.isna().all() else 0
+    bond_pnl = bond_data.total(bond_pnl_col)
     bond_total.append(bond_pnl)
 
     market_value_total_rows = {}
@@ -228,56 +192,56 @@ def excel_generator(df, df2):
 
     row = 5
     equity_heading_row = row + 2
-    ws.cell(row=equity_heading_row, column=1, value="EQUITY").font = Font(bold=True)
+    ws.cell(row=equity_heading_row, column=1, value="EQUITY").font = BOLD
 
     ws.cell(row=equity_heading_row, column=7, value="% Alloc")
-    ws.cell(row=equity_heading_row, column=7).font = Font(bold=True)
-    ws.cell(row=equity_heading_row, column=7).alignment = Alignment(horizontal="center")
+    ws.cell(row=equity_heading_row, column=7).font = BOLD
+    ws.cell(row=equity_heading_row, column=7).alignment = CENTER
 
     row_portfolio = row - 1  
     row_cash = row_portfolio + 1
     row_total = row_cash + 1
     
     ws.merge_cells(f'A{row_portfolio}')
-    ws.cell(row=row_portfolio, column=1, value="Portfolio Value").font = Font(bold=True)
+    ws.cell(row=row_portfolio, column=1, value="Portfolio Value").font = BOLD
     ws.cell(row=row_portfolio, column=1).border = thin_border
-    ws.cell(row=row_portfolio, column=1).alignment = Alignment(horizontal="left")
+    ws.cell(row=row_portfolio, column=1).alignment = LEFT
 
     ws.merge_cells(f'B{row_portfolio}')
     ws.cell(row=row_portfolio, column=2, value=0)
     ws.cell(row=row_portfolio, column=2).border = thin_border
-    ws.cell(row=row_portfolio, column=2).alignment = Alignment(horizontal="center")
-    ws.cell(row=row_portfolio, column=2).font = Font(bold=True)
-    ws.cell(row=row_portfolio, column=2).number_format = '#,##,##0'
+    ws.cell(row=row_portfolio, column=2).alignment = CENTER
+    ws.cell(row=row_portfolio, column=2).font = BOLD
+    ws.cell(row=row_portfolio, column=2).number_format = NUM_FMT
     
     ws.merge_cells(f'A{row_cash}')
-    ws.cell(row=row_cash, column=1, value="Cash Data").font = Font(bold=True)
+    ws.cell(row=row_cash, column=1, value="Cash Data").font = BOLD
     ws.cell(row=row_cash, column=1).border = thin_border
-    ws.cell(row=row_cash, column=1).alignment = Alignment(horizontal="left")
+    ws.cell(row=row_cash, column=1).alignment = LEFT
     
     ws.merge_cells(f'B{row_cash}')
     ws.cell(row=row_cash, column=2, value=available_cash)  
     ws.cell(row=row_cash, column=2).border = thin_border
-    ws.cell(row=row_cash, column=2).alignment = Alignment(horizontal="center")
-    ws.cell(row=row_cash, column=2).number_format = '#,##,##0'
+    ws.cell(row=row_cash, column=2).alignment = CENTER
+    ws.cell(row=row_cash, column=2).number_format = NUM_FMT
     
     ws.merge_cells(f'A{row_total}')
-    ws.cell(row=row_total, column=1, value="Total Portfolio Value").font = Font(bold=True)
+    ws.cell(row=row_total, column=1, value="Total Portfolio Value").font = BOLD
     ws.cell(row=row_total, column=1).border = thin_border
-    ws.cell(row=row_total, column=1).alignment = Alignment(horizontal="left")
+    ws.cell(row=row_total, column=1).alignment = LEFT
     ws.cell(row=row_total, column=1).fill = portfolio_value_fill
     
     ws.merge_cells(f'B{row_total}')
     ws.cell(row=row_total, column=2).border = thin_border
-    ws.cell(row=row_total, column=2).alignment = Alignment(horizontal="center")
-    ws.cell(row=row_total, column=2).font = Font(bold=True)
-    ws.cell(row=row_total, column=2).number_format = '#,##,##0'
+    ws.cell(row=row_total, column=2).alignment = CENTER
+    ws.cell(row=row_total, column=2).font = BOLD
+    ws.cell(row=row_total, column=2).number_format = NUM_FMT
     ws.cell(row=row_total, column=2).fill = portfolio_value_fill
     
     ws.row_dimensions[row_cash].height = 12
     
     row += 3
-    ws.cell(row=row, column=1, value="Direct Equity").font = Font(bold=True)
+    ws.cell(row=row, column=1, value="Direct Equity").font = BOLD
     row += 1
 
     equity_col_map = {}
@@ -293,44 +257,44 @@ def excel_generator(df, df2):
         
         ws.cell(row=row, column=new_idx, value=header)
         ws.cell(row=row, column=new_idx).fill = header_fill
-        ws.cell(row=row, column=new_idx).alignment = Alignment(horizontal="center")
+        ws.cell(row=row, column=new_idx).alignment = CENTER
         ws.cell(row=row, column=new_idx).border = thin_border
         ws.column_dimensions[get_column_letter(new_idx)].width = 11
 
     alloc_col = len(equity_cols_to_keep) + 1
     ws.cell(row=row, column=alloc_col, value="% Alloc")
     ws.cell(row=row, column=alloc_col).fill = header_fill
-    ws.cell(row=row, column=alloc_col).alignment = Alignment(horizontal="center")
+    ws.cell(row=row, column=alloc_col).alignment = CENTER
     ws.cell(row=row, column=alloc_col).border = thin_border
     ws.column_dimensions[get_column_letter(alloc_col)].width = 8
 
     row += 1
 
-    for _, data_row in direct_equity.iterrows():
+    for data_row in direct_equity.rows():
         for old_idx in equity_cols_to_keep:
             new_idx = equity_col_map[old_idx]
             value = format_num(data_row[old_idx])
             if not pd.isna(value):
                 ws.cell(row=row, column=new_idx, value=value)
                 if old_idx == 0:
-                    ws.cell(row=row, column=new_idx).alignment = Alignment(horizontal="left")
+                    ws.cell(row=row, column=new_idx).alignment = LEFT
                 else:
-                    ws.cell(row=row, column=new_idx).alignment = Alignment(horizontal="center") 
+                    ws.cell(row=row, column=new_idx).alignment = CENTER 
                 ws.cell(row=row, column=new_idx).border = thin_border
         row += 1
     
     ws.cell(row=row, column=1, value="Total:")
-    ws.cell(row=row, column=1).font = Font(bold=True)
-    ws.cell(row=row, column=1).alignment = Alignment(horizontal="left")
+    ws.cell(row=row, column=1).font = BOLD
+    ws.cell(row=row, column=1).alignment = LEFT
     ws.cell(row=row, column=1).border = thin_border
-    ws.cell(row=row, column=1).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")  
+    ws.cell(row=row, column=1).fill = TOTAL_ROW_FILL  
 
     for col_idx in [2, 3, 4, 6]:
         ws.column_dimensions[get_column_letter(col_idx)].width = 11.5
         if col_idx == 6:
-            ws.cell(row=row, column=6).alignment = Alignment(horizontal="center")
+            ws.cell(row=row, column=6).alignment = CENTER
         ws.cell(row=row, column=col_idx).border = thin_border
-        ws.cell(row=row, column=col_idx).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
+        ws.cell(row=row, column=col_idx).fill = TOTAL_ROW_FILL
 
     market_value_col = 6
     market_value_col_letter = get_column_letter(market_value_col)
@@ -349,9 +313,9 @@ def excel_generator(df, df2):
 
     market_value_cell = ws.cell(row=row, column=market_value_col)
     market_value_cell.value = formula
-    market_value_cell.number_format = '#,##,##0'
+    market_value_cell.number_format = NUM_FMT
     market_value_cell.border = thin_border
-    market_value_cell.fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
+    market_value_cell.fill = TOTAL_ROW_FILL
 
     pnl_col = 5
     pnl_col_letter = get_column_letter(pnl_col)
@@ -373,25 +337,25 @@ def excel_generator(df, df2):
     
     pnl_cell = ws.cell(row=row, column=pnl_col)
     pnl_cell.value = formula
-    pnl_cell.number_format = '#,##,##0'
+    pnl_cell.number_format = NUM_FMT
     pnl_cell.border = thin_border
-    pnl_cell.fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
+    pnl_cell.fill = TOTAL_ROW_FILL
 
     total_portfolio_value_cell = "B4"  
     alloc_formula = f"={market_value_col_letter}{row}/{total_portfolio_value_cell}*100"
 
     alloc_cell = ws.cell(row=row, column=alloc_col)
     alloc_cell.value = alloc_formula
-    alloc_cell.alignment = Alignment(horizontal="center")
+    alloc_cell.alignment = CENTER
     alloc_cell.border = thin_border
-    alloc_cell.fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
+    alloc_cell.fill = TOTAL_ROW_FILL
     alloc_cell.number_format = "0.00\%"
 
     
     row += 1
 
     row += 1
-    ws.cell(row=row, column=1, value="Equity ETF").font = Font(bold=True)
+    ws.cell(row=row, column=1, value="Equity ETF").font = BOLD
     row += 1
 
     for old_idx in equity_cols_to_keep:
@@ -403,17 +367,17 @@ def excel_generator(df, df2):
         
         ws.cell(row=row, column=new_idx, value=header)
         ws.cell(row=row, column=new_idx).fill = header_fill
-        ws.cell(row=row, column=new_idx).alignment = Alignment(horizontal="center")
+        ws.cell(row=row, column=new_idx).alignment = CENTER
         ws.cell(row=row, column=new_idx).border = thin_border
 
     ws.cell(row=row, column=alloc_col, value="% Alloc")
     ws.cell(row=row, column=alloc_col).fill = header_fill
-    ws.cell(row=row, column=alloc_col).alignment = Alignment(horizontal="center")
+    ws.cell(row=row, column=alloc_col).alignment = CENTER
     ws.cell(row=row, column=alloc_col).border = thin_border
     
     row += 1
 
-    for _, data_row in etf_equity.iterrows():
+    for data_row in etf_equity.rows():
         for old_idx in equity_cols_to_keep:
             new_idx = equity_col_map[old_idx]
             value = data_row[old_idx]
@@ -421,21 +385,21 @@ def excel_generator(df, df2):
                 cell_value = format_num(value)
                 ws.cell(row=row, column=new_idx, value=cell_value)
                 if old_idx == 0:
-                    ws.cell(row=row, column=new_idx).alignment = Alignment(horizontal="left")
+                    ws.cell(row=row, column=new_idx).alignment = LEFT
                 else:
-                    ws.cell(row=row, column=new_idx).alignment = Alignment(horizontal="center")
+                    ws.cell(row=row, column=new_idx).alignment = CENTER
                 ws.cell(row=row, column=new_idx).border = thin_border
         row += 1
     
     ws.cell(row=row, column=1, value="Total:")
-    ws.cell(row=row, column=1).font = Font(bold=True)
-    ws.cell(row=row, column=1).alignment = Alignment(horizontal="left")
+    ws.cell(row=row, column=1).font = BOLD
+    ws.cell(row=row, column=1).alignment = LEFT
     ws.cell(row=row, column=1).border = thin_border
-    ws.cell(row=row, column=1).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
+    ws.cell(row=row, column=1).fill = TOTAL_ROW_FILL
 
     for col_idx in [2, 3, 4]:
         ws.cell(row=row, column=col_idx).border = thin_border
-        ws.cell(row=row, column=col_idx).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
+        ws.cell(row=row, column=col_idx).fill = TOTAL_ROW_FILL
 
     first_data_row = row - len(etf_equity)
     last_data_row = row - 1
@@ -448,10 +412,10 @@ def excel_generator(df, df2):
         formula = "=0"
 
     ws.cell(row=row, column=6, value=formula)
-    ws.cell(row=row, column=6).alignment = Alignment(horizontal="center")
+    ws.cell(row=row, column=6).alignment = CENTER
     ws.cell(row=row, column=6).border = thin_border
-    ws.cell(row=row, column=6).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
-    ws.cell(row=row, column=6).number_format = '#,##,##0'
+    ws.cell(row=row, column=6).fill = TOTAL_ROW_FILL
+    ws.cell(row=row, column=6).number_format = NUM_FMT
 
     pnl_col_letter = get_column_letter(5)
     if first_data_row <= last_data_row:
@@ -464,21 +428,21 @@ def excel_generator(df, df2):
     market_value_total_rows['etf_equity'] = (6, row)
     
     ws.cell(row=row, column=5, value=formula)
-    ws.cell(row=row, column=5).alignment = Alignment(horizontal="center")
+    ws.cell(row=row, column=5).alignment = CENTER
     ws.cell(row=row, column=5).border = thin_border
-    ws.cell(row=row, column=5).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
-    ws.cell(row=row, column=5).number_format = '#,##,##0'
+    ws.cell(row=row, column=5).fill = TOTAL_ROW_FILL
+    ws.cell(row=row, column=5).number_format = NUM_FMT
 
     ws.cell(row=row, column=alloc_col, value=f"={market_value_col_letter}{row}/B4*100")
-    ws.cell(row=row, column=alloc_col).alignment = Alignment(horizontal="center")
+    ws.cell(row=row, column=alloc_col).alignment = CENTER
     ws.cell(row=row, column=alloc_col).border = thin_border
-    ws.cell(row=row, column=alloc_col).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
+    ws.cell(row=row, column=alloc_col).fill = TOTAL_ROW_FILL
     ws.cell(row=row, column=alloc_col).number_format = "0.00\%"    
         
     row += 1
 
     row += 1
-    ws.cell(row=row, column=1, value="Equity Mutual Fund").font = Font(bold=True)
+    ws.cell(row=row, column=1, value="Equity Mutual Fund").font = BOLD
     row += 1
 
     mf_col_map = {}
@@ -494,17 +458,17 @@ def excel_generator(df, df2):
         
         ws.cell(row=row, column=new_idx, value=header)
         ws.cell(row=row, column=new_idx).fill = header_fill
-        ws.cell(row=row, column=new_idx).alignment = Alignment(horizontal="center")
+        ws.cell(row=row, column=new_idx).alignment = CENTER
         ws.cell(row=row, column=new_idx).border = thin_border
 
     ws.cell(row=row, column=alloc_col, value="% Alloc")
     ws.cell(row=row, column=alloc_col).fill = header_fill
-    ws.cell(row=row, column=alloc_col).alignment = Alignment(horizontal="center")
+    ws.cell(row=row, column=alloc_col).alignment = CENTER
     ws.cell(row=row, column=alloc_col).border = thin_border
 
     row += 1
 
-    for _, data_row in equity_mf.iterrows():
+    for data_row in equity_mf.rows():
         for old_idx in mf_cols_to_keep:
             new_idx = mf_col_map[old_idx]
             value = data_row[old_idx]
@@ -512,21 +476,21 @@ def excel_generator(df, df2):
                 cell_value = format_num(value)
                 ws.cell(row=row, column=new_idx, value=cell_value)
                 if old_idx == 1:
-                    ws.cell(row=row, column=new_idx).alignment = Alignment(horizontal="left")
+                    ws.cell(row=row, column=new_idx).alignment = LEFT
                 else:
-                    ws.cell(row=row, column=new_idx).alignment = Alignment(horizontal="center")
+                    ws.cell(row=row, column=new_idx).alignment = CENTER
                 ws.cell(row=row, column=new_idx).border = thin_border
         row += 1
     
     ws.cell(row=row, column=1, value="Total:")
-    ws.cell(row=row, column=1).font = Font(bold=True)
-    ws.cell(row=row, column=1).alignment = Alignment(horizontal="left")
+    ws.cell(row=row, column=1).font = BOLD
+    ws.cell(row=row, column=1).alignment = LEFT
     ws.cell(row=row, column=1).border = thin_border
-    ws.cell(row=row, column=1).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
+    ws.cell(row=row, column=1).fill = TOTAL_ROW_FILL
 
     for col_idx in [2, 3, 4]:
         ws.cell(row=row, column=col_idx).border = thin_border
-        ws.cell(row=row, column=col_idx).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
+        ws.cell(row=row, column=col_idx).fill = TOTAL_ROW_FILL
 
     mf_market_value_col_letter = get_column_letter(6)
     mf_pnl_col_letter = get_column_letter(5)
@@ -544,10 +508,10 @@ def excel_generator(df, df2):
     market_value_total_rows['equity_mf'] = (6, row)
     
     ws.cell(row=row, column=6, value=market_value_formula)
-    ws.cell(row=row, column=6).alignment = Alignment(horizontal="center")
+    ws.cell(row=row, column=6).alignment = CENTER
     ws.cell(row=row, column=6).border = thin_border
-    ws.cell(row=row, column=6).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
-    ws.cell(row=row, column=6).number_format = '#,##,##0'
+    ws.cell(row=row, column=6).fill = TOTAL_ROW_FILL
+    ws.cell(row=row, column=6).number_format = NUM_FMT
 
     if first_data_row <= last_data_row:
         pnl_cell_references = [f"{mf_pnl_col_letter}{r}" for r in range(first_data_row, last_data_row + 1)]
@@ -556,24 +520,24 @@ def excel_generator(df, df2):
         pnl_formula = "=0"
 
     ws.cell(row=row, column=5, value=pnl_formula)
-    ws.cell(row=row, column=5).alignment = Alignment(horizontal="center")
+    ws.cell(row=row, column=5).alignment = CENTER
     ws.cell(row=row, column=5).border = thin_border
-    ws.cell(row=row, column=5).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
-    ws.cell(row=row, column=5).number_format = '#,##,##0'
+    ws.cell(row=row, column=5).fill = TOTAL_ROW_FILL
+    ws.cell(row=row, column=5).number_format = NUM_FMT
 
     ws.cell(row=row, column=alloc_col, value=f"={mf_market_value_col_letter}{row}/B4*100")
-    ws.cell(row=row, column=alloc_col).alignment = Alignment(horizontal="center")
+    ws.cell(row=row, column=alloc_col).alignment = CENTER
     ws.cell(row=row, column=alloc_col).border = thin_border
-    ws.cell(row=row, column=alloc_col).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
+    ws.cell(row=row, column=alloc_col).fill = TOTAL_ROW_FILL
     ws.cell(row=row, column=alloc_col).number_format = "0.00\%"    
     
     row += 1
     
     col_offset = 9  
     row = 7
-    ws.cell(row=row, column=col_offset, value="DEBT").font = Font(bold=True)
+    ws.cell(row=row, column=col_offset, value="DEBT").font = BOLD
     row += 1
-    ws.cell(row=row, column=col_offset, value="Debt ETF").font = Font(bold=True)
+    ws.cell(row=row, column=col_offset, value="Debt ETF").font = BOLD
     row += 1
 
     for old_idx in equity_cols_to_keep:
@@ -585,7 +549,7 @@ def excel_generator(df, df2):
         
         ws.cell(row=row, column=new_idx + col_offset - 1, value=header)
         ws.cell(row=row, column=new_idx + col_offset - 1).fill = header_fill
-        ws.cell(row=row, column=new_idx + col_offset - 1).alignment = Alignment(horizontal="center")
+        ws.cell(row=row, column=new_idx + col_offset - 1).alignment = CENTER
         ws.cell(row=row, column=new_idx + col_offset - 1).border = thin_border
         if old_idx == 0:
             ws.column_dimensions[get_column_letter(new_idx + col_offset - 1)].width = 25
@@ -596,12 +560,12 @@ def excel_generator(df, df2):
     right_alloc_col = len(equity_cols_to_keep) + col_offset
     ws.cell(row=row, column=right_alloc_col, value="% Alloc") 
     ws.cell(row=row, column=right_alloc_col).fill = header_fill
-    ws.cell(row=row, column=right_alloc_col).alignment = Alignment(horizontal="center")
+    ws.cell(row=row, column=right_alloc_col).alignment = CENTER
     ws.cell(row=row, column=right_alloc_col).border = thin_border
 
     row += 1
 
-    for _, data_row in debt_etf.iterrows():
+    for data_row in debt_etf.rows():
         for old_idx in equity_cols_to_keep:
             new_idx = equity_col_map[old_idx]
             value = data_row[old_idx]
@@ -609,22 +573,22 @@ def excel_generator(df, df2):
                 cell_value = format_num(value)
                 ws.cell(row=row, column=new_idx + col_offset - 1, value=cell_value)
                 if old_idx == 0:  
-                    ws.cell(row=row, column=new_idx + col_offset - 1).alignment = Alignment(horizontal="left")
+                    ws.cell(row=row, column=new_idx + col_offset - 1).alignment = LEFT
                 else:
-                    ws.cell(row=row, column=new_idx + col_offset - 1).alignment = Alignment(horizontal="center")
+                    ws.cell(row=row, column=new_idx + col_offset - 1).alignment = CENTER
                 ws.cell(row=row, column=new_idx + col_offset - 1).border = thin_border
         row += 1
     
     ws.cell(row=row, column=col_offset, value="Total:")
-    ws.cell(row=row, column=col_offset).font = Font(bold=True)
-    ws.cell(row=row, column=col_offset).alignment = Alignment(horizontal="left")
+    ws.cell(row=row, column=col_offset).font = BOLD
+    ws.cell(row=row, column=col_offset).alignment = LEFT
     ws.cell(row=row, column=col_offset).border = thin_border
-    ws.cell(row=row, column=col_offset).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
+    ws.cell(row=row, column=col_offset).fill = TOTAL_ROW_FILL
 
     for col_idx in [col_offset + 1, col_offset + 2, col_offset + 3,  col_offset + 5]:
         ws.column_dimensions[get_column_letter(col_idx)].width = 12
         ws.cell(row=row, column=col_idx).border = thin_border
-        ws.cell(row=row, column=col_idx).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
+        ws.cell(row=row, column=col_idx).fill = TOTAL_ROW_FILL
 
     right_market_value_col = col_offset + 5
     right_pnl_col = col_offset + 4
@@ -641,10 +605,10 @@ def excel_generator(df, df2):
         market_value_formula = "=0"
 
     ws.cell(row=row, column=right_market_value_col, value=market_value_formula)
-    ws.cell(row=row, column=right_market_value_col).alignment = Alignment(horizontal="center")
+    ws.cell(row=row, column=right_market_value_col).alignment = CENTER
     ws.cell(row=row, column=right_market_value_col).border = thin_border
-    ws.cell(row=row, column=right_market_value_col).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
-    ws.cell(row=row, column=right_market_value_col).number_format = '#,##,##0'
+    ws.cell(row=row, column=right_market_value_col).fill = TOTAL_ROW_FILL
+    ws.cell(row=row, column=right_market_value_col).number_format = NUM_FMT
     
     debt_etf_total_row = row
     market_value_total_rows['debt_etf'] = (right_market_value_col, row)
@@ -656,21 +620,21 @@ def excel_generator(df, df2):
         pnl_formula = "=0"
 
     ws.cell(row=row, column=right_pnl_col, value=pnl_formula)
-    ws.cell(row=row, column=right_pnl_col).alignment = Alignment(horizontal="center")
+    ws.cell(row=row, column=right_pnl_col).alignment = CENTER
     ws.cell(row=row, column=right_pnl_col).border = thin_border
-    ws.cell(row=row, column=right_pnl_col).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
-    ws.cell(row=row, column=right_pnl_col).number_format = '#,##,##0'
+    ws.cell(row=row, column=right_pnl_col).fill = TOTAL_ROW_FILL
+    ws.cell(row=row, column=right_pnl_col).number_format = NUM_FMT
 
     ws.cell(row=row, column=col_offset + 6, value=f"={right_market_col_letter}{row}/B4*100")
-    ws.cell(row=row, column=col_offset + 6).alignment = Alignment(horizontal="center")
+    ws.cell(row=row, column=col_offset + 6).alignment = CENTER
     ws.cell(row=row, column=col_offset + 6).border = thin_border
-    ws.cell(row=row, column=col_offset + 6).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
+    ws.cell(row=row, column=col_offset + 6).fill = TOTAL_ROW_FILL
     ws.cell(row=row, column=col_offset + 6).number_format = "0.00\%"    
         
     row += 1
 
     row += 1
-    ws.cell(row=row, column=col_offset, value="Debt Mutual Fund").font = Font(bold=True)
+    ws.cell(row=row, column=col_offset, value="Debt Mutual Fund").font = BOLD
     row += 1
 
     for old_idx in mf_cols_to_keep:
@@ -682,17 +646,17 @@ def excel_generator(df, df2):
         
         ws.cell(row=row, column=new_idx + col_offset - 1, value=header)
         ws.cell(row=row, column=new_idx + col_offset - 1).fill = header_fill
-        ws.cell(row=row, column=new_idx + col_offset - 1).alignment = Alignment(horizontal="center")
+        ws.cell(row=row, column=new_idx + col_offset - 1).alignment = CENTER
         ws.cell(row=row, column=new_idx + col_offset - 1).border = thin_border
 
     ws.cell(row=row, column=right_alloc_col, value="% Alloc")
     ws.cell(row=row, column=right_alloc_col).fill = header_fill
-    ws.cell(row=row, column=right_alloc_col).alignment = Alignment(horizontal="center")
+    ws.cell(row=row, column=right_alloc_col).alignment = CENTER
     ws.cell(row=row, column=right_alloc_col).border = thin_border
 
     row += 1
 
-    for _, data_row in debt_mf.iterrows():
+    for data_row in debt_mf.rows():
         for old_idx in mf_cols_to_keep:
             new_idx = mf_col_map[old_idx]
             value = data_row[old_idx]
@@ -700,21 +664,21 @@ def excel_generator(df, df2):
                 cell_value = format_num(value)
                 ws.cell(row=row, column=new_idx + col_offset - 1, value=cell_value)
                 if old_idx == 1:  
-                    ws.cell(row=row, column=new_idx + col_offset - 1).alignment = Alignment(horizontal="left")
+                    ws.cell(row=row, column=new_idx + col_offset - 1).alignment = LEFT
                 else:
-                    ws.cell(row=row, column=new_idx + col_offset - 1).alignment = Alignment(horizontal="center")
+                    ws.cell(row=row, column=new_idx + col_offset - 1).alignment = CENTER
                 ws.cell(row=row, column=new_idx + col_offset - 1).border = thin_border
         row += 1
     
     ws.cell(row=row, column=col_offset, value="Total:")
-    ws.cell(row=row, column=col_offset).font = Font(bold=True)
-    ws.cell(row=row, column=col_offset).alignment = Alignment(horizontal="left")
+    ws.cell(row=row, column=col_offset).font = BOLD
+    ws.cell(row=row, column=col_offset).alignment = LEFT
     ws.cell(row=row, column=col_offset).border = thin_border
-    ws.cell(row=row, column=col_offset).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
+    ws.cell(row=row, column=col_offset).fill = TOTAL_ROW_FILL
 
     for col_idx in [col_offset + 1, col_offset + 2, col_offset + 3]:
         ws.cell(row=row, column=col_idx).border = thin_border
-        ws.cell(row=row, column=col_idx).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
+        ws.cell(row=row, column=col_idx).fill = TOTAL_ROW_FILL
 
     right_mf_market_col = col_offset + 5
     right_mf_pnl_col = col_offset + 4
@@ -739,27 +703,27 @@ def excel_generator(df, df2):
 
     
     ws.cell(row=row, column=right_mf_market_col, value=market_value_formula)
-    ws.cell(row=row, column=right_mf_market_col).alignment = Alignment(horizontal="center")
+    ws.cell(row=row, column=right_mf_market_col).alignment = CENTER
     ws.cell(row=row, column=right_mf_market_col).border = thin_border
-    ws.cell(row=row, column=right_mf_market_col).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
-    ws.cell(row=row, column=right_mf_market_col).number_format = '#,##,##0'
+    ws.cell(row=row, column=right_mf_market_col).fill = TOTAL_ROW_FILL
+    ws.cell(row=row, column=right_mf_market_col).number_format = NUM_FMT
 
     ws.cell(row=row, column=right_mf_pnl_col, value=pnl_formula)
-    ws.cell(row=row, column=right_mf_pnl_col).alignment = Alignment(horizontal="center")
+    ws.cell(row=row, column=right_mf_pnl_col).alignment = CENTER
     ws.cell(row=row, column=right_mf_pnl_col).border = thin_border
-    ws.cell(row=row, column=right_mf_pnl_col).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
-    ws.cell(row=row, column=right_mf_pnl_col).number_format = '#,##,##0'
+    ws.cell(row=row, column=right_mf_pnl_col).fill = TOTAL_ROW_FILL
+    ws.cell(row=row, column=right_mf_pnl_col).number_format = NUM_FMT
 
     ws.cell(row=row, column=col_offset + 6, value=f"={right_mf_market_letter}{row}/B4*100")
-    ws.cell(row=row, column=col_offset + 6).alignment = Alignment(horizontal="center")
+    ws.cell(row=row, column=col_offset + 6).alignment = CENTER
     ws.cell(row=row, column=col_offset + 6).border = thin_border
-    ws.cell(row=row, column=col_offset + 6).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
+    ws.cell(row=row, column=col_offset + 6).fill = TOTAL_ROW_FILL
     ws.cell(row=row, column=col_offset + 6).number_format = "0.00\%"
     
     row += 1
 
     row += 2
-    ws.cell(row=row, column=col_offset, value="BONDS").font = Font(bold=True)
+    ws.cell(row=row, column=col_offset, value="BONDS").font = BOLD
     row += 1
 
     for old_idx in bond_cols_to_keep:
@@ -771,36 +735,36 @@ def excel_generator(df, df2):
         
         ws.cell(row=row, column=new_idx + col_offset - 1, value=header)
         ws.cell(row=row, column=new_idx + col_offset - 1).fill = header_fill
-        ws.cell(row=row, column=new_idx + col_offset - 1).alignment = Alignment(horizontal="center")
+        ws.cell(row=row, column=new_idx + col_offset - 1).alignment = CENTER
         ws.cell(row=row, column=new_idx + col_offset - 1).border = thin_border
 
     ws.cell(row=row, column=right_alloc_col, value="% Alloc")
     ws.cell(row=row, column=right_alloc_col).fill = header_fill
-    ws.cell(row=row, column=right_alloc_col).alignment = Alignment(horizontal="center")
+    ws.cell(row=row, column=right_alloc_col).alignment = CENTER
     ws.cell(row=row, column=right_alloc_col).border = thin_border
 
     row += 1
 
-    for _, data_row in bond_data.iterrows():
+    for data_row in bond_data.rows():
         for old_idx in bond_cols_to_keep:
             new_idx = equity_col_map[old_idx]
             value = data_row[old_idx]
             if not pd.isna(value):
                 cell_value = format_num(value)
                 ws.cell(row=row, column=new_idx + col_offset - 1, value=cell_value)
-                ws.cell(row=row, column=new_idx + col_offset - 1).alignment = Alignment(horizontal="center")
+                ws.cell(row=row, column=new_idx + col_offset - 1).alignment = CENTER
                 ws.cell(row=row, column=new_idx + col_offset - 1).border = thin_border
         row += 1
     
     ws.cell(row=row, column=col_offset, value="Total:")
-    ws.cell(row=row, column=col_offset).font = Font(bold=True)
-    ws.cell(row=row, column=col_offset).alignment = Alignment(horizontal="left")
+    ws.cell(row=row, column=col_offset).font = BOLD
+    ws.cell(row=row, column=col_offset).alignment = LEFT
     ws.cell(row=row, column=col_offset).border = thin_border
-    ws.cell(row=row, column=col_offset).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
+    ws.cell(row=row, column=col_offset).fill = TOTAL_ROW_FILL
 
     for col_idx in [col_offset + 1, col_offset + 2, col_offset + 3]:
         ws.cell(row=row, column=col_idx).border = thin_border
-        ws.cell(row=row, column=col_idx).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
+        ws.cell(row=row, column=col_idx).fill = TOTAL_ROW_FILL
 
     bond_market_col = col_offset + 5
     bond_pnl_col = col_offset + 4
@@ -825,21 +789,21 @@ def excel_generator(df, df2):
 
     
     ws.cell(row=row, column=bond_market_col, value=market_value_formula)
-    ws.cell(row=row, column=bond_market_col).alignment = Alignment(horizontal="center")
+    ws.cell(row=row, column=bond_market_col).alignment = CENTER
     ws.cell(row=row, column=bond_market_col).border = thin_border
-    ws.cell(row=row, column=bond_market_col).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
-    ws.cell(row=row, column=bond_market_col).number_format = '#,##,##0'
+    ws.cell(row=row, column=bond_market_col).fill = TOTAL_ROW_FILL
+    ws.cell(row=row, column=bond_market_col).number_format = NUM_FMT
 
     ws.cell(row=row, column=bond_pnl_col, value=pnl_formula)
-    ws.cell(row=row, column=bond_pnl_col).alignment = Alignment(horizontal="center")
+    ws.cell(row=row, column=bond_pnl_col).alignment = CENTER
     ws.cell(row=row, column=bond_pnl_col).border = thin_border
-    ws.cell(row=row, column=bond_pnl_col).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
-    ws.cell(row=row, column=bond_pnl_col).number_format = '#,##,##0'
+    ws.cell(row=row, column=bond_pnl_col).fill = TOTAL_ROW_FILL
+    ws.cell(row=row, column=bond_pnl_col).number_format = NUM_FMT
 
     ws.cell(row=row, column=col_offset + 6, value=f"={bond_market_letter}{row}/B4*100")
-    ws.cell(row=row, column=col_offset + 6).alignment = Alignment(horizontal="center")
+    ws.cell(row=row, column=col_offset + 6).alignment = CENTER
     ws.cell(row=row, column=col_offset + 6).border = thin_border
-    ws.cell(row=row, column=col_offset + 6).fill = PatternFill(start_color="FFCC99", end_color="FFCC99", fill_type="solid")
+    ws.cell(row=row, column=col_offset + 6).fill = TOTAL_ROW_FILL
     ws.cell(row=row, column=col_offset + 6).number_format = "0.00\%"
         
     row += 2
@@ -868,8 +832,8 @@ def excel_generator(df, df2):
     
     equity_alloc_formula = "=" + "+".join(equity_alloc_formula_parts)
     ws.cell(row=7, column=6, value="% Alloc")
-    ws.cell(row=7, column=6).font = Font(bold=True)
-    ws.cell(row=7, column=6).alignment = Alignment(horizontal="center")
+    ws.cell(row=7, column=6).font = BOLD
+    ws.cell(row=7, column=6).alignment = CENTER
     ws.cell(row=equity_heading_row, column=7, value=equity_alloc_formula)
     ws.cell(row=equity_heading_row, column=7).number_format = "0.00\%"
     
@@ -880,8 +844,8 @@ def excel_generator(df, df2):
     
     debt_alloc_formula = "=" + "+".join(debt_alloc_formula_parts)
     ws.cell(row=7, column=col_offset + 5, value="% Alloc")
-    ws.cell(row=7, column=col_offset + 5).font = Font(bold=True)
-    ws.cell(row=7, column=col_offset + 5).alignment = Alignment(horizontal="center")
+    ws.cell(row=7, column=col_offset + 5).font = BOLD
+    ws.cell(row=7, column=col_offset + 5).alignment = CENTER
     ws.cell(row=7, column=col_offset + 6, value=debt_alloc_formula)
     ws.cell(row=7, column=col_offset + 6).number_format = "0.00\%"
     
@@ -1,5 +1,11 @@
 import io
+import os
+import sys
+import math
+import numpy as np
 import pandas as pd
+from functools import lru_cache
+from utils.utils import process_pool
 import locale
 try:
     locale.setlocale(locale.LC_ALL, 'en_IN.UTF-8')
@@ -8,19 +14,61 @@ except locale.Error:
         locale.setlocale(locale.LC_ALL, 'en_US.UTF-8')
     except locale.Error:
         locale.setlocale(locale.LC_ALL, '')
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
 from reportlab.lib import colors
 from reportlab.lib.units import inch
 from reportlab.lib.colors import HexColor, white
 from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import ImageReader
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.graphics.shapes import Drawing, Wedge, Circle, String
+from reportlab.graphics.charts.legends import Legend
 from reportlab.platypus import Paragraph, Spacer, Table, TableStyle, PageTemplate, Frame, Image, BaseDocTemplate, PageBreak, Flowable, KeepTogether
+from utils.cache import read_frame, load_source
+from utils.format import ist, ist_col
+from utils.holdings import HoldingsSheet, as_holdings, load_holdings
+
+LOGO_FILE = 'logo.png'
+LOGO_FORM = 'logo'
+
+def logo_path():
+    roots = []
+    if getattr(sys, 'frozen', False):
+        roots += [getattr(sys, '_MEIPASS', None), os.path.dirname(sys.executable)]
+    roots.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    
+    for root in roots:
+        if root and os.path.exists(os.path.join(root, LOGO_FILE)):
+            return os.path.join(root, LOGO_FILE)
+    return None
+
+@lru_cache(maxsize=1)
+def logo_image():
+    path = logo_path()
+    if path is None:
+        print(f"⚠️ {LOGO_FILE} not found, reports will have no logo")
+        return None
+    try:
+        return ImageReader(path)
+    except Exception as e:
+        print(f"⚠️ Could not load {path}: {e}")
+        return None
+
+def logo_form(canvas, width, height):
+    if getattr(canvas, '_logo_form', False):
+        return True
+    
+    img = logo_image()
+    if img is None:
+        return False
+    
+    canvas.beginForm(LOGO_FORM, 0, 0, width, height)
+    canvas.drawImage(img, 0, 0, width=width, height=height, preserveAspectRatio=True, mask='auto')
+    canvas.endForm()
+    canvas._logo_form = True
+    return True
 
 def background(canvas, doc):
-    logo_path = "/Users/sen/Desktop/reportiqv4/logo.png"
     logo_width = 1.5 * inch
     logo_height = 0.5 * inch
     x1 = doc.pagesize[0] - doc.rightMargin - logo_width + 0.9 * inch
@@ -30,43 +78,174 @@ def background(canvas, doc):
     canvas.setFillColor(white)  
     canvas.rect(0, 0, letter[0], letter[1], fill=1)
     canvas.restoreState()
-    canvas.drawImage(logo_path, x1, y1, width=logo_width, height=logo_height, preserveAspectRatio=True, mask='auto')
+    
+    if logo_form(canvas, logo_width, logo_height):
+        canvas.saveState()
+        canvas.translate(x1, y1)
+        canvas.doForm(LOGO_FORM)
+        canvas.restoreState()
+
+@lru_cache(maxsize=1)
+def report_styles():
+    base = getSampleStyleSheet()
+    
+    return {
+        'cover_title': ParagraphStyle(
+            'TitleStyle',
+            parent=base['Heading1'],
+            fontName='Helvetica-Bold',
+            fontSize=16,
+            alignment=TA_CENTER,
+            spaceAfter=12,
+            textColor=HexColor('#3C3EA8')
+        ),
+        'cover_name': ParagraphStyle(
+            'CenteredHeaderStyle',
+            parent=base['Heading2'],
+            fontName='Helvetica-Bold',
+            fontSize=16,
+            alignment=TA_CENTER,
+            spaceAfter=6
+        ),
+        'cover_code': ParagraphStyle(
+            'CenteredNormalStyle',
+            parent=base['Normal'],
+            fontName='Helvetica',
+            fontSize=14,
+            alignment=TA_CENTER
+        ),
+        'heading': ParagraphStyle(
+            'CenteredHeaderStyle',
+            parent=base['Heading2'],
+            fontName='Helvetica-Bold',
+            fontSize=18,
+            alignment=TA_LEFT,
+            spaceAfter=10,
+            textColor=white,
+            backColor=HexColor('#1e4388')
+        ),
+        'client': ParagraphStyle(
+            'ClientStyle',
+            parent=base['Heading2'],
+            fontName='Helvetica-Bold',
+            fontSize=18,
+            alignment=TA_CENTER,
+            spaceAfter=10,
+        ),
+        'header': ParagraphStyle(
+            'HeaderStyle',
+            parent=base['Normal'],
+            fontName='Helvetica-Bold',
+            fontSize=14,
+            alignment=TA_CENTER,
+            textColor=white,
+            backColor=HexColor('#4d7cc3')
+        ),
+        'error': ParagraphStyle('ErrorStyle', parent=base['Normal'], textColor=HexColor('#3C3EA8')),
+        'page_title': ParagraphStyle(
+            'PageTitleStyle',
+            parent=base['Heading2'],
+            fontName='Helvetica-Bold',
+            fontSize=16,
+            alignment=TA_CENTER,
+            spaceAfter=6,
+            textColor=HexColor('#3C3EA8')
+        ),
+        'section_title': ParagraphStyle(
+            'SectionTitleStyle',
+            parent=base['Heading2'],
+            fontName='Helvetica-Bold',
+            fontSize=16,
+            alignment=TA_LEFT,
+            spaceAfter=6,
+            leftIndent=-60,
+            textColor=HexColor('#3C3EA8')
+        ),
+        # deq/deb used to pass the result of styles.add() (None) here, so the
+        # headers have always rendered in reportlab's implicit default style
+        'table_header': ParagraphStyle('paragraphImplicitDefaultStyle'),
+    }
+
+@lru_cache(maxsize=1)
+def table_styles():
+    return {
+        'client': TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ]),
+        'composition': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), HexColor('#4d7cc3')),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 12),
+            ('GRID', (0, 0), (-1, -1), 1, HexColor('#d6e1e8')),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('LEFTPADDING', (0, 0), (0, -1), 0.2*inch),
+            ('RIGHTPADDING', (1, 0), (1, -1), 0.2*inch),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 0.1*inch),
+            ('TOPPADDING', (0, 0), (-1, -1), 0.1*inch),
+            ('LINEBELOW', (0, 0), (-1, -1), 0.5, HexColor('#d6e1e8')),
+        ]),
+        'cash': TableStyle([
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('LEFTPADDING', (0, 0), (0, -1), 0.2*inch),
+            ('RIGHTPADDING', (1, 0), (1, -1), 0.2*inch),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 0.1*inch),
+            ('TOPPADDING', (0, 0), (-1, -1), 0.1*inch),
+            ('FONTSIZE', (0, 0), (-1, -1), 12),
+            ('GRID', (0, 0), (-1, -1), 1, HexColor('#d6e1e8')),
+            ('LINEBELOW', (0, 0), (-1, -1), 0.5, HexColor('#d6e1e8')),
+        ]),
+        'pie_title': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), HexColor('#4d7cc3')),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 0.1*inch),
+            ('TOPPADDING', (0, 0), (-1, -1), 0.1*inch),
+        ]),
+        'chart': TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 0.1*inch),
+            ('TOPPADDING', (0, 0), (-1, -1), 0.1*inch),
+        ]),
+        'layout': TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 0.1*inch),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 0.1*inch),
+        ]),
+        'holdings': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), HexColor('#3C3EA8')),
+            ('BACKGROUND', (0, -1), (-1, -1), HexColor('#3C3EA8')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), white),
+            ('TEXTCOLOR', (0, -1), (-1, -1), white),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 5),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('ALIGN', (1, 1), (-1, -1), 'CENTER')
+        ]),
+    }
 
-def cover (code, name):
-    cover_page = f"{name}.pdf"
-    doc = BaseDocTemplate(cover_page, pagesize=letter)
+def report_doc(output_path):
+    doc = BaseDocTemplate(output_path, pagesize=letter)
     frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height + 0.8*inch)
     page = PageTemplate(id='FirstPage', frames=frame, onPage=background)
     doc.addPageTemplates([page])
-    
-    styles = getSampleStyleSheet()
-    
-    title_style = ParagraphStyle(
-        'TitleStyle',
-        parent=styles['Heading1'],
-        fontName='Helvetica-Bold',
-        fontSize=16,
-        alignment=TA_CENTER,
-        spaceAfter=12,
-        textColor=HexColor('#3C3EA8')
-    )
-    
-    header_style = ParagraphStyle(
-        'CenteredHeaderStyle',
-        parent=styles['Heading2'],
-        fontName='Helvetica-Bold',
-        fontSize=16,
-        alignment=TA_CENTER,
-        spaceAfter=6
-    )
-    
-    normal_style = ParagraphStyle(
-        'CenteredNormalStyle',
-        parent=styles['Normal'],
-        fontName='Helvetica',
-        fontSize=14,
-        alignment=TA_CENTER
-    )
+    return doc
+
+def cover(code, name):
+    styles = report_styles()
+    title_style = styles['cover_title']
+    header_style = styles['cover_name']
+    normal_style = styles['cover_code']
 
     content = []
     content.append(Paragraph("CUSTOMER STATEMENT", title_style))
@@ -76,7 +255,91 @@ def cover (code, name):
     content.append(Paragraph(f"{code}", normal_style))
     content.append(Spacer(1, 2*inch))
     
-    return doc, content
+    return content
+
+CHART_CACHE = 256
+CHART_DPI = 300
+CHART_HOLE = '#D6E1E8'
+
+_chart_fig = None
+
+def chart_mode():
+    return os.environ.get('PORTFOLIO_REVIEW_CHART', 'vector').lower()
+
+def chart_key(labels, sizes, fills):
+    total = float(sum(sizes))
+    pcts = tuple(round(float(s) / total * 100, 1) for s in sizes)
+    return tuple(labels), pcts, tuple(fills)
+
+@lru_cache(maxsize=CHART_CACHE)
+def donut_drawing(labels, pcts, fills):
+    width, height = 6*inch, 4*inch
+    cx, cy, r = 2.2*inch, 2*inch, 1.8*inch
+    
+    d = Drawing(width, height)
+    total = sum(pcts)
+    angle = 90.0
+    for pct, fill in zip(pcts, fills):
+        sweep = 360.0 * pct / total
+        d.add(Wedge(cx, cy, r, angle, angle + sweep, radius1=0.3*r,
+                    fillColor=HexColor(fill), strokeColor=white, strokeWidth=1.5))
+        angle += sweep
+    d.add(Circle(cx, cy, 0.35*r, fillColor=HexColor(CHART_HOLE), strokeColor=None))
+    
+    angle = 90.0
+    for pct in pcts:
+        sweep = 360.0 * pct / total
+        mid = math.radians(angle + sweep / 2)
+        d.add(String(cx + 0.65*r*math.cos(mid), cy + 0.65*r*math.sin(mid) - 4, f"{pct:.0f}%",
+                     fontName='Helvetica', fontSize=11, textAnchor='middle'))
+        angle += sweep
+    
+    legend = Legend()
+    legend.x = cx + r + 0.4*inch
+    legend.y = cy
+    legend.boxAnchor = 'w'
+    legend.alignment = 'right'
+    legend.fontName = 'Helvetica'
+    legend.fontSize = 10
+    legend.deltay = 16
+    legend.colorNamePairs = [(HexColor(fill), label) for label, fill in zip(labels, fills)]
+    d.add(legend)
+    return d
+
+def chart_figure():
+    global _chart_fig
+    if _chart_fig is None:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        _chart_fig = Figure(figsize=(7, 6), facecolor='none')
+        FigureCanvasAgg(_chart_fig)
+        _chart_fig.add_subplot()
+    return _chart_fig
+
+@lru_cache(maxsize=CHART_CACHE)
+def donut_png(labels, pcts, fills, dpi=CHART_DPI):
+    from matplotlib.patches import Circle as Disc
+    
+    fig = chart_figure()
+    ax = fig.axes[0]
+    ax.clear()
+    
+    ax.pie(pcts, labels=None, colors=fills, 
+           autopct='%1.0f%%', startangle=90,
+           wedgeprops=dict(width=0.7, edgecolor='w'))
+    ax.add_patch(Disc((0, 0), 0.35, fc=CHART_HOLE))
+    ax.legend(labels, loc="center right", bbox_to_anchor=(1.2, 0.5))
+    ax.axis('equal')
+    
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=dpi, bbox_inches='tight', transparent=True)
+    return buf.getvalue()
+
+def donut_chart(labels, sizes, fills, mode=None):
+    key = chart_key(labels, sizes, fills)
+    if (mode or chart_mode()) == 'png':
+        return Image(io.BytesIO(donut_png(*key)), width=6*inch, height=4*inch)
+    return donut_drawing(*key).copy()
 
 def overview(direct_equity_market_value, etf_equity_market_value, debt_etf_market_value, 
              equity_mf_market_value, debt_mf_market_value, bond_market_value, df2, xirr_value=None):
@@ -124,35 +387,10 @@ def overview(direct_equity_market_value, etf_equity_market_value, debt_etf_marke
     cash_equivalent_percent = (cash_equivalent / total_portfolio_value * 100) if total_portfolio_value > 0 else 0
     equity_allocation_percent = (equity_total / total_portfolio_value * 100) if total_portfolio_value > 0 else 0
 
-    styles = getSampleStyleSheet()
-    
-    heading = ParagraphStyle(
-        'CenteredHeaderStyle',
-        parent=styles['Heading2'],
-        fontName='Helvetica-Bold',
-        fontSize=18,
-        alignment=TA_LEFT,
-        spaceAfter=10,
-        textColor=white,
-        backColor=HexColor('#1e4388')
-    )
-    
-    client_style = ParagraphStyle(
-        'ClientStyle',
-        parent=styles['Heading2'],
-        fontName='Helvetica-Bold',
-        fontSize=18,
-        alignment=TA_CENTER,
-        spaceAfter=10,
-    )
-    
-    title_style = ParagraphStyle(
-        'TitleStyle',
-        parent=styles['Normal'],
-        fontName='Helvetica-Bold',
-        fontSize=12,
-        alignment=TA_CENTER
-    )
+    styles = report_styles()
+    tstyles = table_styles()
+    heading = styles['heading']
+    client_style = styles['client']
     
     content = []
     content.append(PageBreak()) 
@@ -168,35 +406,14 @@ def overview(direct_equity_market_value, etf_equity_market_value, debt_etf_marke
             self.canv.setLineWidth(self.height)
             self.canv.line(5, 0, self.width, 0)
     
-    header_style = ParagraphStyle(
-        'HeaderStyle',
-        parent=styles['Normal'],
-        fontName='Helvetica-Bold',
-        fontSize=14,
-        alignment=TA_CENTER,
-        textColor=white,
-        backColor=HexColor('#4d7cc3')
-    )
-    
-    subheader_style = ParagraphStyle(
-        'SubHeaderStyle',
-        parent=styles['Normal'],
-        fontName='Helvetica-Bold',
-        fontSize=12,
-        alignment=TA_LEFT,
-        textColor=white,
-        backColor=HexColor('#5f92d2')
-    )
+    header_style = styles['header']
     
     if client_name and client_code:
         client_name_paragraph = Paragraph(f"{client_name}", client_style)
         client_code_paragraph = Paragraph(f"{client_code}", client_style)
         client_info = [[client_name_paragraph], [client_code_paragraph]]
         client_table = Table(client_info, colWidths=[8*inch]) 
-        client_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
+        client_table.setStyle(tstyles['client'])
         content.append(client_table)
     else:
         content.append(Paragraph("Holding Summary & Performance", heading))
@@ -220,20 +437,7 @@ def overview(direct_equity_market_value, etf_equity_market_value, debt_etf_marke
         composition_data.append(["Available Cash", ist(available_cash)])
     
     composition_table = Table(composition_data, colWidths=[1.9*inch, 1.9*inch])
-    composition_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), HexColor('#4d7cc3')),
-        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-        ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 12),
-        ('GRID', (0, 0), (-1, -1), 1, HexColor('#d6e1e8')),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('LEFTPADDING', (0, 0), (0, -1), 0.2*inch),
-        ('RIGHTPADDING', (1, 0), (1, -1), 0.2*inch),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 0.1*inch),
-        ('TOPPADDING', (0, 0), (-1, -1), 0.1*inch),
-        ('LINEBELOW', (0, 0), (-1, -1), 0.5, HexColor('#d6e1e8')),
-    ]))
+    composition_table.setStyle(tstyles['composition'])
     
     cash_data = [
         ["Cash Equivalent:", ist(cash_equivalent)],
@@ -245,30 +449,12 @@ def overview(direct_equity_market_value, etf_equity_market_value, debt_etf_marke
         cash_data.append(["XIRR:", f"{xirr_value:.0f}%"])
     
     cash_table = Table(cash_data, colWidths=[1.9*inch, 1.9*inch])
-    cash_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('LEFTPADDING', (0, 0), (0, -1), 0.2*inch),
-        ('RIGHTPADDING', (1, 0), (1, -1), 0.2*inch),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 0.1*inch),
-        ('TOPPADDING', (0, 0), (-1, -1), 0.1*inch),
-        ('FONTSIZE', (0, 0), (-1, -1), 12),
-        ('GRID', (0, 0), (-1, -1), 1, HexColor('#d6e1e8')),
-        ('LINEBELOW', (0, 0), (-1, -1), 0.5, HexColor('#d6e1e8')),
-    ]))
+    cash_table.setStyle(tstyles['cash'])
     
     pie_title = Paragraph("Portfolio Composition", header_style)
     
     pie_title_table = Table([[pie_title]], colWidths=[8*inch])
-    pie_title_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), HexColor('#4d7cc3')),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 0.1*inch),
-        ('TOPPADDING', (0, 0), (-1, -1), 0.1*inch),
-    ]))
+    pie_title_table.setStyle(tstyles['pie_title'])
     
     content.append(pie_title_table)
     
@@ -305,102 +491,68 @@ def overview(direct_equity_market_value, etf_equity_market_value, debt_etf_marke
             color_index += 1
         
         if sizes:  
-            plt.figure(figsize=(7, 6), facecolor='none')
-            
-            plt.pie(sizes, labels=None, colors=colors, 
-                   autopct='%1.0f%%', startangle=90,
-                   wedgeprops=dict(width=0.7, edgecolor='w'))
-            
-            center_circle = plt.Circle((0,0), 0.35, fc='#D6E1E8')
-            plt.gca().add_patch(center_circle)
-            
-            legend = plt.legend(labels, loc="center right", bbox_to_anchor=(1.2, 0.5))
-            
-            plt.axis('equal')
-            
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', dpi=300, bbox_inches='tight', transparent=True)
-            buf.seek(0)
-            
-            img = Image(buf, width=6*inch, height=4*inch)
+            img = donut_chart(labels, sizes, colors)
             chart_table = Table([[img]], colWidths=[8*inch])
-            chart_table.setStyle(TableStyle([
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 0.1*inch),
-                ('TOPPADDING', (0, 0), (-1, -1), 0.1*inch),
-            ]))
+            chart_table.setStyle(tstyles['chart'])
             content.append(chart_table)
-            plt.close()
             
     except Exception as e:
-        error_style = ParagraphStyle('ErrorStyle', parent=styles['Normal'], textColor=HexColor('#3C3EA8'))
-        content.append(Paragraph(f"Unable to generate pie chart: {str(e)}", error_style))
+        content.append(Paragraph(f"Unable to generate pie chart: {str(e)}", styles['error']))
     
     content.append(Spacer(1, 0.3*inch))
 
     tables_data = [[composition_table, cash_table]]
     tables_layout = Table(tables_data, colWidths=[4*inch, 4*inch])
-    tables_layout.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 0.1*inch),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 0.1*inch),
-    ]))
+    tables_layout.setStyle(tstyles['layout'])
     
     content.append(tables_layout)
     
     return content
 
+ETF_PREFIX = "NIPPON LIFE INDIA AM LTD#"
+EQUITY_TABLE_COLS = [1, 2, 4, 10, 5]
+MF_TABLE_COLS = [2, 3, 5, 12, 6]
+HOLDINGS_WIDTHS = [2.2*inch, 1*inch, 1.2*inch, 1.2*inch, 1.2*inch, 1.2*inch]
+ROW_LEADING = 12
+ROW_PADDING = 6
+
+def trim_words(name, max_words, prefix=None):
+    if not isinstance(name, str):
+        return str(name)
+    if prefix:
+        name = name.replace(prefix, "").strip()
+    words = name.split()
+    if len(words) <= max_words:
+        return name
+    return ' '.join(words[:max_words]) + '...'
+
+def trim_names(names, max_words, prefix=None):
+    cats = [trim_words(c, max_words, prefix) for c in names.categories.tolist()]
+    cats.append('nan')
+    return np.asarray(cats, dtype=object)[names.codes].tolist()
+
+def holding_rows(data, cols, max_words, prefix=None):
+    names = trim_names(data.names, max_words, prefix)
+    values = [ist_col(data.col(c), 0) for c in cols]
+    return [[name, *cells] for name, cells in zip(names, zip(*values))]
+
+def row_height(row):
+    lines = max(str(cell).count('\n') + 1 for cell in row)
+    return ROW_LEADING * lines + ROW_PADDING
+
+def holdings_table(title_text, column_headers, rows, total_row):
+    styles = report_styles()
+    title = Paragraph(title_text, styles['section_title'])
+    headers = [Paragraph(header, styles['table_header']) for header in column_headers]
+    
+    body = rows + [total_row]
+    heights = [None] + [row_height(row) for row in body]
+    table = Table([headers] + body, colWidths=HOLDINGS_WIDTHS, rowHeights=heights)
+    table.setStyle(table_styles()['holdings'])
+    return title, table
+
 def deq(direct_equity, direct_equity_total, etf_equity, etf_equity_total, equity_mf, equity_mf_total):
-    styles = getSampleStyleSheet()
-    
-    page_title_style = ParagraphStyle(
-        'PageTitleStyle',
-        parent=styles['Heading2'],
-        fontName='Helvetica-Bold',
-        fontSize=16,
-        alignment=TA_CENTER,
-        spaceAfter=6,
-        textColor=HexColor('#3C3EA8')
-    )
-    
-    section_title_style = ParagraphStyle(
-        'SectionTitleStyle',
-        parent=styles['Heading2'],
-        fontName='Helvetica-Bold',
-        fontSize=16,
-        alignment=TA_LEFT,
-        spaceAfter=6,
-        leftIndent=-60,
-        textColor=HexColor('#3C3EA8')
-    )
-    
-    table_header_style = styles.add(ParagraphStyle(
-        'TableHeader',
-        parent=styles['Normal'],
-        fontName='Helvetica-Bold',
-        fontSize=9,
-        alignment=TA_CENTER,
-        textColor=white
-    ))
-    
-    def trim_etf_name(name, max_words=2):
-        if not isinstance(name, str):
-            return str(name)
-        name = name.replace("NIPPON LIFE INDIA AM LTD#", "").strip()
-        words = name.split()
-        if len(words) <= max_words:
-            return name
-        return ' '.join(words[:max_words]) + '...'
-    
-    def trim_mf_name(name, max_words=3):
-        if not isinstance(name, str):
-            return str(name)
-        words = name.split()
-        if len(words) <= max_words:
-            return name
-        return ' '.join(words[:max_words]) + '...'
+    page_title_style = report_styles()['page_title']
     
     def create_table(data, total_data, title_text, column_headers, is_mf=False):
         column_headers = [
@@ -411,62 +563,14 @@ def deq(direct_equity, direct_equity_total, etf_equity, etf_equity_total, equity
             'P&L',  
             'Market Value'
         ]
-        title = Paragraph(title_text, section_title_style)
-        
-        headers = [Paragraph(header, table_header_style) for header in column_headers]
-        
-        table_data = [headers]
         
-        for _, row in data.iterrows():
-            if is_mf:
-                scheme_name = trim_mf_name(row['Unnamed: 1'])
-                table_data.append([
-                    scheme_name,  
-                    ist(float(row['Unnamed: 2']), 0) if row['Unnamed: 2'] else '',
-                    ist(float(row['Unnamed: 3']), 0).lstrip(',') if row['Unnamed: 3'] else '',
-                    ist(float(row['Unnamed: 5']), 0).lstrip(',') if row['Unnamed: 5'] else '',
-                    ist(float(row['Unnamed: 12']), 0).lstrip(',') if row['Unnamed: 12'] else '',
-                    ist(float(row['Unnamed: 6']), 0) if row['Unnamed: 6'] else ''
-                ])
-            else:
-                instrument_name = trim_etf_name(row['Unnamed: 0'])
-                table_data.append([
-                    instrument_name,  
-                    ist(float(row['Unnamed: 1']), 0) if row['Unnamed: 1'] else '',
-                    ist(float(row['Unnamed: 2']), 0).lstrip(',') if row['Unnamed: 2'] else '',
-                    ist(float(row['Unnamed: 4']), 0).lstrip(',') if row['Unnamed: 4'] else '',
-                    ist(float(row['Unnamed: 10']), 0).lstrip(',') if row['Unnamed: 10'] else '',
-                    ist(float(row['Unnamed: 5']), 0) if row['Unnamed: 5'] else ''
-                ])
+        if is_mf:
+            rows = holding_rows(data, MF_TABLE_COLS, 3)
+        else:
+            rows = holding_rows(data, EQUITY_TABLE_COLS, 2, ETF_PREFIX)
         
         total_row = ['Total:'] + [ist(float(val), 0) if i > 0 and isinstance(val, (int, float)) else val for i, val in enumerate(total_data[1:])]
-        table_data.append(total_row)
-        
-        table_style = TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), HexColor('#3C3EA8')),
-            ('BACKGROUND', (0, -1), (-1, -1), HexColor('#3C3EA8')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), white),
-            ('TEXTCOLOR', (0, -1), (-1, -1), white),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),  
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 5),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('ALIGN', (1, 1), (-1, -1), 'CENTER')  
-        ])
-        
-        column_widths = [
-            2.2 * inch,  
-            1 * inch,    
-            1.2 * inch,  
-            1.2 * inch,  
-            1.2 * inch,  
-            1.2 * inch   
-        ]
-        
-        table = Table(table_data, colWidths=column_widths)
-        table.setStyle(table_style)
+        title, table = holdings_table(title_text, column_headers, rows, total_row)
         
         spacer = Spacer(1, 5)
         
@@ -500,113 +604,13 @@ def deq(direct_equity, direct_equity_total, etf_equity, etf_equity_total, equity
     return page_elements
 
 def deb(debt_etf, debt_etf_total, debt_mf, debt_mf_total, bond_data, bond_total):
-    styles = getSampleStyleSheet()
-    
-    page_title_style = ParagraphStyle(
-        'PageTitleStyle',
-        parent=styles['Heading2'],
-        fontName='Helvetica-Bold',
-        fontSize=16,
-        alignment=TA_CENTER,
-        spaceAfter=6,
-        textColor=HexColor('#3C3EA8')
-    )
-    
-    section_title_style = ParagraphStyle(
-        'SectionTitleStyle',
-        parent=styles['Heading2'],
-        fontName='Helvetica-Bold',
-        fontSize=16,
-        alignment=TA_LEFT,
-        spaceAfter=6,
-        leftIndent=-60,
-        textColor=HexColor('#3C3EA8')
-    )
-    
-    table_header_style = styles.add(ParagraphStyle(
-        'TableHeader',
-        parent=styles['Normal'],
-        fontName='Helvetica-Bold',
-        fontSize=9,
-        alignment=TA_CENTER,
-        textColor=white
-    ))
-    
-    def trim_name(name, max_words=3):
-        if not isinstance(name, str):
-            return str(name)
-        words = name.split()
-        if len(words) <= max_words:
-            return name
-        return ' '.join(words[:max_words]) + '...'
+    page_title_style = report_styles()['page_title']
     
     def create_table(data, total_data, title_text, column_headers, is_mf=False, is_bond=False):
-        title = Paragraph(title_text, section_title_style)
-        
-        headers = [Paragraph(header, table_header_style) for header in column_headers]
-        
-        table_data = [headers]
-        
-        for _, row in data.iterrows():
-            if is_mf:
-                scheme_name = trim_name(row['Unnamed: 1'])
-                table_data.append([
-                    scheme_name,  
-                    ist(float(row['Unnamed: 2']), 0) if row['Unnamed: 2'] else '',
-                    ist(float(row['Unnamed: 3']), 0).lstrip(',') if row['Unnamed: 3'] else '',
-                    ist(float(row['Unnamed: 5']), 0).lstrip(',') if row['Unnamed: 5'] else '',
-                    ist(float(row['Unnamed: 12']), 0).lstrip(',') if row['Unnamed: 12'] else '',
-                    ist(float(row['Unnamed: 6']), 0) if row['Unnamed: 6'] else ''
-                ])
-            elif is_bond:
-                bond_name = trim_name(row['Unnamed: 0'])
-                table_data.append([
-                    bond_name,  
-                    ist(float(row['Unnamed: 1']), 0).lstrip(',') if row['Unnamed: 1'] else '',
-                    ist(float(row['Unnamed: 2']), 0).lstrip(',') if row['Unnamed: 2'] else '',
-                    ist(float(row['Unnamed: 4']), 0).lstrip(',') if row['Unnamed: 4'] else '',
-                    ist(float(row['Unnamed: 10']), 0).lstrip(',') if row['Unnamed: 10'] else '',
-                    ist(float(row['Unnamed: 5']), 0) if row['Unnamed: 5'] else ''
-                ])
-            else:
-                instrument_name = trim_name(row['Unnamed: 0'])
-                table_data.append([
-                    instrument_name,  
-                    ist(float(row['Unnamed: 1']), 0) if row['Unnamed: 1'] else '',
-                    ist(float(row['Unnamed: 2']), 0).lstrip(',') if row['Unnamed: 2'] else '',
-                    ist(float(row['Unnamed: 4']), 0).lstrip(',') if row['Unnamed: 4'] else '',
-                    ist(float(row['Unnamed: 10']), 0).lstrip(',') if row['Unnamed: 10'] else '',
-                    ist(float(row['Unnamed: 5']), 0) if row['Unnamed: 5'] else ''
-                ])
+        rows = holding_rows(data, MF_TABLE_COLS if is_mf else EQUITY_TABLE_COLS, 3)
         
         total_row = ['Total:'] + [ist(float(val), 0).lstrip(',') if i > 0 and isinstance(val, (int, float)) else val for i, val in enumerate(total_data[1:])]
-        table_data.append(total_row)
-        
-        table_style = TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), HexColor('#3C3EA8')),
-            ('BACKGROUND', (0, -1), (-1, -1), HexColor('#3C3EA8')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), white),
-            ('TEXTCOLOR', (0, -1), (-1, -1), white),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 5),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('ALIGN', (1, 1), (-1, -1), 'CENTER')  
-        ])
-        
-        column_widths = [
-            2.2 * inch,  
-            1 * inch,    
-            1.2 * inch,  
-            1.2 * inch,  
-            1.2 * inch,  
-            1.2 * inch   
-        ]
-        
-        table = Table(table_data, colWidths=column_widths)
-        table.setStyle(table_style)
+        title, table = holdings_table(title_text, column_headers, rows, total_row)
         
         spacer = Spacer(1, 10)
         
@@ -640,102 +644,37 @@ def deb(debt_etf, debt_etf_total, debt_mf, debt_mf_total, bond_data, bond_total)
     
     return page_elements
 
-def ist(number, decimal_places=0):
-    try:
-        num = float(number)
-        num = round(num, decimal_places)
-        
-        negative = num < 0
-        num = abs(num)
-        
-        if decimal_places == 0:
-            num = int(num)
-        
-        int_part = str(int(num))
-        
-        result = ""
-        if len(int_part) <= 3:
-            result = int_part
-        else:
-            result = int_part[-3:]
-            remaining = int_part[:-3]
-            i = len(remaining)
-            while i > 0:
-                if i >= 2:
-                    result = remaining[i-2:i] + "," + result
-                else:
-                    result = remaining[i-1:i] + "," + result
-                i -= 2
-        
-        if decimal_places > 0:
-            decimal_part = f"{num % 1:.{decimal_places}f}"[2:]
-            result = result + "." + decimal_part
-        
-        if negative:
-            result = "-" + result
-            
-        return result
-    
-    except Exception as e:
-        return str(number)
-
-def report_gen(df1, df2, df3=None, output_path=None):
-    info_row = df1[df1['Unnamed: 0'] == 'Client Equity Code/UCID/Name'].index[0]
-    c_info = str(df1.iloc[info_row, 1]).strip()
-    parts = c_info.split('/')
-    c_code = parts[0].strip()  
-    c_name = parts[-1].strip()
-    
-    equity_row = df1[df1['Unnamed: 0'] == 'Equity:-'].index[0]
-    mf_row = df1[df1['Unnamed: 0'] == 'Mutual Fund:-'].index[0]
-    fno_row = df1[df1['Unnamed: 0'] == 'FnO:-'].index[0]
-    bond_row = df1[df1['Unnamed: 0'] == 'Bond:-'].index[0]
+def report_gen(df1, df2, df3=None, output_path=None, sheet=None):
+    holdings = as_holdings(df1, sheet)
     
-    equity_header = df1.iloc[equity_row + 1].tolist()
-    mf_header = df1.iloc[mf_row + 1].tolist()
-    bond_header = df1.iloc[bond_row + 1].tolist()
+    c_code = holdings.header.code
+    c_name = holdings.header.name
     
-    equity_end = mf_row - 4  
-    mf_end = fno_row - 4
+    equity_data = holdings.equity
+    mf_data = holdings.mf
+    bond_data = holdings.bond
     
-    bond_end = len(df1)
-    for i in range(bond_row + 2, len(df1)):
-        if i >= len(df1) or pd.isna(df1.iloc[i, 0]) or df1.iloc[i, 0] == '':
-            bond_end = i
-            break
+    equity_header = equity_data.header
+    mf_header = mf_data.header
+    bond_header = bond_data.header
     
-    equity_data = df1.iloc[equity_row + 2:equity_end].copy()
-    mf_data = df1.iloc[mf_row + 2:mf_end].copy()
-    bond_data = df1.iloc[bond_row + 2:bond_end].copy()
+    is_etf = equity_data.contains('ETF')
+    is_liquid = equity_data.contains('Nifty 1D Rate Liquid BeES')
     
-    equity_data = equity_data[equity_data['Unnamed: 0'] != 'Total:']
-    mf_data = mf_data[mf_data['Unnamed: 0'] != 'Total:']
-    bond_data = bond_data[bond_data['Unnamed: 0'] != 'Total:']
+    direct_equity = equity_data.take(~is_etf & ~is_liquid)
+    etf_equity = equity_data.take(is_etf & ~is_liquid)
+    debt_etf = equity_data.take(is_liquid)
     
-    direct_equity = equity_data[~equity_data['Unnamed: 0'].str.contains('ETF', na=False)]
-    direct_equity = direct_equity[~direct_equity['Unnamed: 0'].str.contains('Nifty 1D Rate Liquid BeES', na=False)]
-    
-    etf_equity = equity_data[equity_data['Unnamed: 0'].str.contains('ETF', na=False)]
-    etf_equity = etf_equity[~etf_equity['Unnamed: 0'].str.contains('Nifty 1D Rate Liquid BeES', na=False)]
-    
-    debt_etf = equity_data[equity_data['Unnamed: 0'].str.contains('Nifty 1D Rate Liquid BeES', na=False)]
-    
-    equity_mf = mf_data[mf_data['Unnamed: 0'] == 'Equity']
-    debt_mf = mf_data[mf_data['Unnamed: 0'] == 'Debt']
+    equity_mf = mf_data.take(mf_data.asset_is('Equity'))
+    debt_mf = mf_data.take(mf_data.asset_is('Debt'))
     
     def calculate_totals(data, cols_to_keep):
         totals = ['Total:']
         for col_idx, col in enumerate(cols_to_keep[1:], 1):  
             try:
-                values = data[f'Unnamed: {col}']
-                values = pd.to_numeric(values, errors='coerce')
-                
-                if not values.isna().all():
-                    total = round(values.sum(), 2)
-                    totals.append(total)
-                else:
-                    totals.append('')
-            except (ValueError, TypeError):
+                total = data.total(col, default=None)
+                totals.append('' if total is None else round(total, 2))
+            except (KeyError, ValueError, TypeError):
                 totals.append('')
         return totals
     
@@ -774,18 +713,89 @@ def report_gen(df1, df2, df3=None, output_path=None):
     if output_path is None:
         output_path = f"{c_name}.pdf"
     
-    doc, cover_page = cover(c_code, c_name)
+    cover_page = cover(c_code, c_name)
     overview_page = overview(direct_equity_market_value, etf_equity_market_value, debt_etf_market_value, 
                             equity_mf_market_value, debt_mf_market_value, bond_market_value, df2, xirr_value)
     direct_equity_page = deq(direct_equity, direct_equity_total, etf_equity, etf_equity_total, equity_mf, equity_mf_total)
     debt_page = deb(debt_etf, debt_etf_total, debt_mf, debt_mf_total, bond_data, bond_total)
     pdf_content = cover_page + overview_page + direct_equity_page + debt_page
     
-    doc = BaseDocTemplate(output_path, pagesize=letter)
-    frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height + 0.8*inch)
-    page = PageTemplate(id='FirstPage', frames=frame, onPage=background)
-    doc.addPageTemplates([page])
-    
+    doc = report_doc(output_path)
     doc.build(pdf_content)
     
-    return output_path
\ No newline at end of file
+    return output_path
+
+def xirr_file(folder, code):
+    try:
+        for name in os.listdir(folder):
+            if name.endswith(('.csv', '.xlsx', '.xls')) and code in name:
+                return os.path.join(folder, name)
+    except OSError:
+        pass
+    return None
+
+def load_xirr(path):
+    if path.endswith('.csv'):
+        return read_frame(path)
+    try:
+        return read_frame(path)
+    except Exception:
+        try:
+            return read_frame(path, engine='openpyxl')
+        except Exception:
+            return read_frame(path, engine='xlrd')
+
+def render_report(holding_path, ledger_path, output_path, xirr_dir=None):
+    try:
+        holding_df = load_holdings(holding_path)
+        ledger_df = load_source(ledger_path)
+        sheet = HoldingsSheet(holding_df)
+        
+        xirr_df = None
+        if xirr_dir:
+            try:
+                path = xirr_file(xirr_dir, sheet.client_code)
+                if path:
+                    xirr_df = load_xirr(path)
+            except Exception as e:
+                print(f"Error loading XIRR for {os.path.basename(holding_path)}: {str(e)}")
+        
+        pdf_path = os.path.abspath(report_gen(holding_df, ledger_df, xirr_df, output_path=output_path, sheet=sheet))
+        if os.path.exists(pdf_path) and os.path.getsize(pdf_path) > 0:
+            return holding_path, pdf_path, None
+        return holding_path, None, f"file is empty or missing. Expected at: {pdf_path}"
+    except Exception as e:
+        return holding_path, None, str(e)
+
+def render_chunk(tasks):
+    return [render_report(*task) for task in tasks]
+
+def report_pool(tasks, workers=None, chunk=None, cb=None, stop=None):
+    if not workers:
+        workers = os.cpu_count() or 1
+    if not chunk:
+        chunk = max(1, -(-len(tasks) // (workers * 4)))
+    
+    chunks = [tasks[i:i + chunk] for i in range(0, len(tasks), chunk)]
+    results = []
+    
+    with process_pool(workers) as pool:
+        futs = [pool.submit(render_chunk, ch) for ch in chunks]
+        
+        for ch, fut in zip(chunks, futs):
+            if stop is not None and stop.is_set():
+                for f in futs:
+                    f.cancel()
+                break
+            
+            try:
+                res = fut.result()
+            except Exception as e:
+                res = [(task[0], None, str(e)) for task in ch]
+            
+            for r in res:
+                results.append(r)
+                if cb:
+                    cb(*r)
+    
+    return results
@@ -1,11 +1,14 @@
 import os
 import sys
+import re
 import glob
 import pandas as pd
 from datetime import datetime
 import numpy as np
 import warnings
 from scipy import optimize
+from utils.utils import process_pool
+from utils.cache import read_frame, load_source
 warnings.filterwarnings('ignore')
 
 def mk_dir(path):
@@ -21,23 +24,30 @@ def conv(file, op=None):
         if op is None:
             op = os.path.splitext(file)[0] + '.csv'
         
-        df = pd.read_excel(file)
+        df = read_frame(file)
         df.to_csv(op, index=False)
         return op
     except Exception:
         return None
     
-def get_files(code):
-    desktop = os.path.join(os.path.expanduser("~"), "Desktop")
-    
-    ldg_dir = os.path.join(desktop, 'Ledger')
-    mf_dir = os.path.join(desktop, 'MF Transactions')
+LDG_EXTS = ('.xlsx', '.xls', '.csv')
+
+def ldg_glob(ldg_dir, pat):
+    files = []
+    for ext in LDG_EXTS:
+        files += glob.glob(os.path.join(ldg_dir, pat + ext))
+    return files
+
+def desk(*parts):
+    return os.path.join(os.path.expanduser("~"), "Desktop", *parts)
+
+def get_files(code, ldg_dir=None, mf_dir=None):
+    ldg_dir = ldg_dir or desk('Ledger')
+    mf_dir = mf_dir or desk('MF Transactions')
     
-    ldg_pat_lower = os.path.join(ldg_dir, f"*{code}_ledger*.csv")
-    ldg_pat_upper = os.path.join(ldg_dir, f"*{code}_Ledger*.csv")
     mf_pat = os.path.join(mf_dir, f"*{code}_MFTrans*.xlsx")
     
-    ldg_fs = glob.glob(ldg_pat_lower) + glob.glob(ldg_pat_upper)
+    ldg_fs = ldg_glob(ldg_dir, f"*{code}_ledger*") + ldg_glob(ldg_dir, f"*{code}_Ledger*")
     mf_fs = glob.glob(mf_pat)
     
     ldg_f = sorted(ldg_fs)[-1] if ldg_fs else None
@@ -45,16 +55,13 @@ def get_files(code):
     
     return ldg_f, mf_f
 
-def get_all_codes():
-    desktop = os.path.join(os.path.expanduser("~"), "Desktop")
-    ldg_dir = os.path.join(desktop, 'Ledger')
+def get_all_codes(ldg_dir=None):
+    ldg_dir = ldg_dir or desk('Ledger')
     
     if not os.path.exists(ldg_dir):
         return []
     
-    ldg_files_lower = glob.glob(os.path.join(ldg_dir, "*_ledger*.csv"))
-    ldg_files_upper = glob.glob(os.path.join(ldg_dir, "*_Ledger*.csv"))
-    ldg_files = ldg_files_lower + ldg_files_upper
+    ldg_files = ldg_glob(ldg_dir, "*_ledger*") + ldg_glob(ldg_dir, "*_Ledger*")
     
     codes = set()
     for f in ldg_files:
@@ -65,53 +72,82 @@ def get_all_codes():
     
     return list(codes)
 
+_AMT = r'(?i)rs\.|[^\d.\-]'
+_NEG = r'^\s*(?i:rs\.?|inr|\u20b9)?\s*\(.*\)\s*$'
+_amt_re = re.compile(_AMT)
+_neg_re = re.compile(_NEG)
+
 def parse_float(value):
+    if isinstance(value, float):
+        return 0.0 if value != value else value
+    if isinstance(value, int):
+        return float(value)
     try:
         if pd.isna(value) or value == '':
             return 0.0
-        if isinstance(value, (int, float)):
-            return float(value)
-        cleaned = ''.join(c for c in str(value) 
-                        if c.isdigit() or c in {'.', '-'})
-        return float(cleaned) if cleaned else 0.0
+        text = str(value)
+        cleaned = _amt_re.sub('', text)
+        num = float(cleaned) if cleaned else 0.0
+        if '(' in text and _neg_re.match(text):
+            num = -abs(num)
+        return num
     except Exception:
         return 0.0
 
+def parse_amounts(col):
+    col = pd.Series(col)
+    if pd.api.types.is_numeric_dtype(col):
+        return pd.to_numeric(col, errors='coerce').fillna(0.0).astype(float)
+    
+    if isinstance(col.dtype, pd.StringDtype):
+        is_str = col.notna()
+        out = pd.Series(np.nan, index=col.index)
+    else:
+        is_str = col.map(type) == str
+        out = pd.to_numeric(col.where(~is_str), errors='coerce')
+    
+    if is_str.any():
+        text = col[is_str]
+        num = pd.to_numeric(text.str.replace(_AMT, '', regex=True), errors='coerce')
+        paren = text.str.contains('(', regex=False)
+        if paren.any():
+            neg = paren & text.str.match(_NEG)
+            num = num.where(~neg, -num.abs())
+        out[is_str.to_numpy()] = num.to_numpy()
+    
+    return out.fillna(0.0).astype(float)
+
+def xirr_arrays(values, dates):
+    vals = np.asarray(values, dtype=float)
+    dts = np.asarray(dates)
+    if not np.issubdtype(dts.dtype, np.datetime64):
+        dts = pd.to_datetime(pd.Index(dates)).to_numpy()
+    days = (dts - dts[0]) // np.timedelta64(1, 'D')
+    
+    if len(np.unique(days)) < len(days):
+        days, inv = np.unique(days, return_inverse=True)
+        vals = np.bincount(inv, weights=vals)
+    
+    return vals, days / 365.0
+
 def calc_xirr(values, dates, guess=0.1):
     if len(values) < 2:
         return None
-        
-    if not (any(v > 0 for v in values) and any(v < 0 for v in values)):
+    
+    vals = np.asarray(values, dtype=float)
+    if not ((vals > 0).any() and (vals < 0).any()):
         return None
     
     try:
-        dates = [pd.to_datetime(d) for d in dates]
-        days = [(d - dates[0]).days for d in dates]
-        
-        if len(set(days)) < len(days):
-            day_value_map = {}
-            
-            for i, day in enumerate(days):
-                if day in day_value_map:
-                    day_value_map[day] += values[i]
-                else:
-                    day_value_map[day] = values[i]
-            
-            days = sorted(day_value_map.keys())
-            values = [day_value_map[day] for day in days]
+        vals, yrs = xirr_arrays(vals, dates)
         
         def xnpv(rate):
-            result = 0
-            for i in range(len(values)):
-                result += values[i] / (1 + rate) ** (days[i] / 365.0)
-            return result
+            with np.errstate(all='ignore'):
+                return np.sum(vals / (1 + rate) ** yrs)
             
         def xnpv_derivative(rate):
-            result = 0
-            for i in range(len(values)):
-                d = days[i] / 365.0
-                result -= d * values[i] / ((1 + rate) ** (d + 1))
-            return result
+            with np.errstate(all='ignore'):
+                return -np.sum(yrs * vals / (1 + rate) ** (yrs + 1))
         
         try:
             left, right = -0.999, 9.0  
@@ -162,8 +198,95 @@ def calc_xirr(values, dates, guess=0.1):
     except Exception:
         return None
 
-def process_ldg(ldg, start_date, today_date):
-    ldg_trans = []
+XIRR_CHUNK = 256
+XIRR_WIDTH = 512
+
+def xirr_block(series, guess, tol, maxiter):
+    n = len(series)
+    width = max(len(v) for v, _ in series)
+    vals = np.zeros((n, width))
+    yrs = np.zeros((n, width))
+    mask = np.zeros((n, width), dtype=bool)
+    for j, (v, y) in enumerate(series):
+        vals[j, :len(v)] = v
+        yrs[j, :len(y)] = y
+        mask[j, :len(v)] = True
+    
+    def xnpv(rate, sel):
+        with np.errstate(all='ignore'):
+            disc = (1 + rate[:, None]) ** -yrs[sel]
+            return np.where(mask[sel], vals[sel] * disc, 0.0).sum(axis=1)
+    
+    def xnpv_derivative(rate, sel):
+        with np.errstate(all='ignore'):
+            disc = (1 + rate[:, None]) ** -(yrs[sel] + 1)
+            return -np.where(mask[sel], yrs[sel] * vals[sel] * disc, 0.0).sum(axis=1)
+    
+    rate = np.full(n, float(guess))
+    done = np.zeros(n, dtype=bool)
+    active = np.ones(n, dtype=bool)
+    
+    for _ in range(maxiter):
+        sel = np.flatnonzero(active)
+        if not len(sel):
+            break
+        
+        r0 = rate[sel]
+        with np.errstate(all='ignore'):
+            r1 = r0 - xnpv(r0, sel) / xnpv_derivative(r0, sel)
+        r1 = np.where(r1 <= -1, (r0 - 1) / 2, r1)
+        rate[sel] = r1
+        
+        ok = np.isfinite(r1)
+        conv = ok & (np.abs(r1 - r0) < tol)
+        done[sel[conv]] = True
+        active[sel[conv | ~ok]] = False
+    
+    # calc_xirr prefers Brent whenever [-0.999, 9] brackets a root, so a
+    # Newton root that escaped the bracket is re-solved the scalar way.
+    every = np.arange(n)
+    left = xnpv(np.full(n, -0.999), every)
+    right = xnpv(np.full(n, 9.0), every)
+    bracketed = left * right <= 0
+    inside = (rate > -0.999) & (rate < 9.0)
+    done &= ~bracketed | inside
+    
+    return rate, done
+
+def calc_xirr_batch(flows, guess=0.1, tol=1.48e-08, maxiter=100, chunk=XIRR_CHUNK, width=XIRR_WIDTH):
+    res = [None] * len(flows)
+    
+    rows = []
+    series = []
+    for i, (values, dates) in enumerate(flows):
+        vals = np.asarray(values, dtype=float)
+        if len(vals) < 2 or not ((vals > 0).any() and (vals < 0).any()):
+            continue
+        if len(vals) > width:
+            # one long ledger would pad every other client to its length
+            res[i] = calc_xirr(values, dates, guess=guess)
+            continue
+        try:
+            series.append(xirr_arrays(vals, dates))
+            rows.append(i)
+        except Exception:
+            pass
+    
+    # similar lengths share a block so padding stays small
+    order = sorted(range(len(rows)), key=lambda j: len(series[j][0]))
+    for k in range(0, len(order), chunk):
+        part = order[k:k + chunk]
+        rate, done = xirr_block([series[j] for j in part], guess, tol, maxiter)
+        for r, ok, j in zip(rate, done, part):
+            i = rows[j]
+            res[i] = float(r) if ok else calc_xirr(*flows[i], guess=guess)
+    
+    return res
+
+def str_col(col):
+    return pd.Series(np.asarray(col, dtype=str), index=col.index, dtype=object)
+
+def ldg_flows(ldg, today_date):
     credit_col = None
     debit_col = None
     
@@ -174,44 +297,17 @@ def process_ldg(ldg, start_date, today_date):
         elif 'debit' in col_low:
             debit_col = col
     
-    if credit_col is None or debit_col is None:
-        bal_col = None
-        for col in ldg.columns:
-            if 'balance' in str(col).lower():
-                bal_col = col
-                break
-        
-        if bal_col is None:
-            for col in ldg.columns:
-                if pd.api.types.is_numeric_dtype(ldg[col]):
-                    bal_col = col
-                    break
-        
-        if bal_col is None:
-            first_bal = 0
-        else:
-            try:
-                first_bal = ldg[bal_col].iloc[0]
-                if pd.isna(first_bal):
-                    first_bal = 0
-            except Exception:
-                first_bal = 0
-    else:
-        bal_col = None
+    bal_col = None
+    for col in ldg.columns:
+        if 'balance' in str(col).lower():
+            bal_col = col
+            break
+    
+    if bal_col is None and (credit_col is None or debit_col is None):
         for col in ldg.columns:
-            if 'balance' in str(col).lower():
+            if pd.api.types.is_numeric_dtype(ldg[col]):
                 bal_col = col
                 break
-        
-        if bal_col is None:
-            first_bal = 0
-        else:
-            try:
-                first_bal = ldg[bal_col].iloc[0]
-                if pd.isna(first_bal):
-                    first_bal = 0
-            except:
-                first_bal = 0
     
     vch_type_col = None
     eff_date_col = None
@@ -235,199 +331,201 @@ def process_ldg(ldg, start_date, today_date):
                 eff_date_col = col
                 break
     
-    if vch_type_col is not None and eff_date_col is not None:
+    if vch_type_col is None or eff_date_col is None:
+        return cf_block([]), bal_col
+    
+    try:
+        is_pay = str_col(ldg[vch_type_col]).str.lower().str.contains('pay', regex=False)
+        pay_df = ldg[is_pay] if is_pay.any() else ldg.copy()
+        
         try:
-            vch_vals = ldg[vch_type_col].unique()
-            pay_vals = [v for v in vch_vals if 'pay' in str(v).lower()]
-            
-            if pay_vals:
-                pay_df = ldg[ldg[vch_type_col].isin(pay_vals)]
-            else:
-                pay_df = ldg.copy()
-            
-            if eff_date_col in pay_df.columns:
-                try:
-                    pay_df[eff_date_col] = pd.to_datetime(pay_df[eff_date_col], errors='coerce')
-                    pay_df = pay_df.sort_values(by=eff_date_col, ascending=True)
-                except Exception:
-                    pass
-            
-            for _, row in pay_df.iterrows():
-                try:
-                    vch_type = str(row[vch_type_col])
-                    
-                    eff_date = row[eff_date_col]
-                    if isinstance(eff_date, str):
-                        try:
-                            eff_date = pd.to_datetime(eff_date).date()
-                        except:
-                            eff_date = today_date
-                    
-                    is_payin = 'payin' in vch_type.lower() or 'pay in' in vch_type.lower()
-                    is_payout = 'payout' in vch_type.lower() or 'pay out' in vch_type.lower()
-                    
-                    if is_payin:
-                        vch_type = "Ledger Buy"
-                        
-                        if credit_col and not pd.isna(row[credit_col]):
-                            value = parse_float(row[credit_col])
-                            value = -abs(value)
-                        else:
-                            value = parse_float(row[bal_col]) if bal_col else 0
-                            value = -abs(value)  
-                    elif is_payout:
-                        vch_type = "Ledger Sell"
-                        
-                        if debit_col and not pd.isna(row[debit_col]):
-                            value = parse_float(row[debit_col])
-                            value = abs(value)
-                        else:
-                            value = parse_float(row[bal_col]) if bal_col else 0
-                            value = abs(value)  
-                    else:
-                        if bal_col:
-                            value = parse_float(row[bal_col])
-                        else:
-                            value = 0
-                    
-                    ldg_trans.append([eff_date, value, vch_type])
-                except Exception:
-                    pass
+            pay_df = pay_df.copy()
+            pay_df[eff_date_col] = pd.to_datetime(pay_df[eff_date_col], errors='coerce')
+            pay_df = pay_df.sort_values(by=eff_date_col, ascending=True)
         except Exception:
             pass
+        
+        vch_type = str_col(pay_df[vch_type_col])
+        vch_low = vch_type.str.lower()
+        is_payin = vch_low.str.contains('payin|pay in')
+        is_payout = ~is_payin & vch_low.str.contains('payout|pay out')
+        
+        if bal_col:
+            bal = parse_amounts(pay_df[bal_col])
+        else:
+            bal = pd.Series(0.0, index=pay_df.index)
+        
+        payin_val = bal
+        if credit_col:
+            has_credit = pay_df[credit_col].notna()
+            payin_val = parse_amounts(pay_df[credit_col]).where(has_credit, bal)
+        
+        payout_val = bal
+        if debit_col:
+            has_debit = pay_df[debit_col].notna()
+            payout_val = parse_amounts(pay_df[debit_col]).where(has_debit, bal)
+        
+        value = np.where(is_payin, -payin_val.abs(), np.where(is_payout, payout_val.abs(), bal))
+        remark = np.where(is_payin, "Ledger Buy", np.where(is_payout, "Ledger Sell", vch_type))
+        
+        flows = pd.DataFrame({
+            'Date': pd.to_datetime(pay_df[eff_date_col], errors='coerce').to_numpy(),
+            'Fund': value.astype(float),
+            'Remarks': remark.astype(object),
+        })
+    except Exception:
+        return cf_block([]), bal_col
     
-    return ldg_trans, bal_col
+    return flows, bal_col
 
-def process_mf(mft, today_date):
-    mf_trans = []
+def process_ldg(ldg, start_date, today_date):
+    flows, bal_col = ldg_flows(ldg, today_date)
+    return flows.values.tolist(), bal_col
+
+def date_col(col):
+    codes, uniq = pd.factorize(col.astype(object))
     
-    if 'Transaction Date' in mft.columns:
-        try:
-            for _, row in mft.iterrows():
-                try:
-                    if pd.isna(row['Transaction Date']) or 'Total' in str(row['Transaction Date']):
-                        continue
-                    
-                    tr_date = pd.to_datetime(row['Transaction Date'], errors='coerce').date()
-                    tr_value = parse_float(row['Transaction Value'])
-                    tr_type = str(row['Transaction Type']).lower() if 'Transaction Type' in row else ''
-                    
-                    if 'buy' in tr_type:
-                        mf_trans.append([tr_date, -abs(tr_value), 'MF BUY'])
-                    elif 'sell' in tr_type:
-                        mf_trans.append([tr_date, abs(tr_value), 'MF SELL'])
-                        
-                except Exception:
-                    pass
-        except Exception:
-            pass
-    elif 'Unnamed: 3' in mft.columns and 'Unnamed: 6' in mft.columns:
-        try:
-            date_col = 'Unnamed: 0'
-                
-            for _, row in mft.iterrows():
-                try:
-                    if pd.isna(row['Unnamed: 3']):
-                        continue
-                    
-                    tr_type = str(row['Unnamed: 3']).lower()
-                    
-                    if 'buy' not in tr_type and 'sell' not in tr_type:
-                        continue
-                    
-                    tr_value = parse_float(row['Unnamed: 6'])
-                    
-                    if date_col:
-                        try:
-                            tr_date = pd.to_datetime(row[date_col], errors='coerce').date()
-                            if pd.isna(tr_date):
-                                tr_date = today_date
-                        except:
-                            tr_date = today_date
-                    else:
-                        tr_date = today_date
-                    
-                    if 'buy' in tr_type:
-                        mf_trans.append([tr_date, -abs(tr_value), 'MF BUY'])
-                    elif 'sell' in tr_type:
-                        mf_trans.append([tr_date, abs(tr_value), 'MF SELL'])
-                        
-                except Exception:
-                    pass
-                    
-        except Exception:
-            pass
+    if int(pd.__version__.split('.')[0]) >= 2:
+        parsed = pd.to_datetime(pd.Series(uniq, dtype=object), errors='coerce', format='mixed')
     else:
-        col_map = {
-            'type': ['transaction type', 'tr type', 'type'],
-            'date': ['date', 'tr date', 'effective date'],
-            'value': ['amount', 'value', 'nav']
-        }
-        
-        cols = {}
-        for col_type, keywords in col_map.items():
-            for col in mft.columns:
-                if any(kw in str(col).lower() for kw in keywords):
-                    cols[col_type] = col
-                    break
-
-        if not all(cols.get(k) for k in ['type', 'date', 'value']):
-            return mf_trans
+        parsed = pd.to_datetime(pd.Series(uniq, dtype=object), errors='coerce')
+    
+    parsed = np.append(parsed.to_numpy(), np.datetime64('NaT'))
+    return pd.Series(parsed[codes], index=col.index)
 
-        try:
-            mft = mft.rename(columns={
-                cols['type']: 'TransactionType',
-                cols['date']: 'Date',
-                cols['value']: 'Value'
-            })
-            
-            for _, row in mft.iterrows():
-                try:
-                    tr_date = pd.to_datetime(row['Date'], errors='coerce').date()
-                    tr_value = parse_float(row['Value'])
-                    tr_type = str(row['TransactionType']).lower()
-                    
-                    if 'buy' in tr_type:
-                        mf_trans.append([tr_date, -abs(tr_value), 'MF BUY'])
-                    elif 'sell' in tr_type:
-                        mf_trans.append([tr_date, abs(tr_value), 'MF SELL'])
-                        
-                except Exception:
-                    pass
+def mf_frame(mft, today_date):
+    if 'Transaction Date' in mft.columns:
+        if 'Transaction Value' not in mft.columns:
+            return None
+        
+        raw = mft['Transaction Date']
+        sub = mft[raw.notna() & ~str_col(raw).str.contains('Total', regex=False)]
+        
+        if 'Transaction Type' in sub.columns:
+            tr_type = str_col(sub['Transaction Type'])
+        else:
+            tr_type = pd.Series('', index=sub.index, dtype=object)
+        
+        return pd.DataFrame({
+            'Date': date_col(sub['Transaction Date']),
+            'Type': tr_type,
+            'Value': sub['Transaction Value'],
+        })
+    
+    if 'Unnamed: 3' in mft.columns and 'Unnamed: 6' in mft.columns:
+        sub = mft[mft['Unnamed: 3'].notna()]
+        
+        if 'Unnamed: 0' in sub.columns:
+            tr_date = date_col(sub['Unnamed: 0']).fillna(pd.Timestamp(today_date))
+        else:
+            tr_date = pd.Series(pd.Timestamp(today_date), index=sub.index)
+        
+        return pd.DataFrame({
+            'Date': tr_date,
+            'Type': str_col(sub['Unnamed: 3']),
+            'Value': sub['Unnamed: 6'],
+        })
+    
+    col_map = {
+        'type': ['transaction type', 'tr type', 'type'],
+        'date': ['date', 'tr date', 'effective date'],
+        'value': ['amount', 'value', 'nav']
+    }
+    
+    cols = {}
+    for col_type, keywords in col_map.items():
+        for col in mft.columns:
+            if any(kw in str(col).lower() for kw in keywords):
+                cols[col_type] = col
+                break
+    
+    if not all(cols.get(k) for k in ['type', 'date', 'value']):
+        return None
+    
+    return pd.DataFrame({
+        'Date': date_col(mft[cols['date']]),
+        'Type': str_col(mft[cols['type']]),
+        'Value': mft[cols['value']],
+    })
 
-        except Exception:
-            pass
+def mf_flows(mft, today_date):
+    try:
+        mf_df = mf_frame(mft, today_date)
+    except Exception:
+        mf_df = None
+    
+    if mf_df is None or mf_df.empty:
+        return cf_block([])
     
-    return mf_trans
+    tr_type = mf_df['Type'].str.lower()
+    is_buy = tr_type.str.contains('buy', regex=False)
+    is_sell = ~is_buy & tr_type.str.contains('sell', regex=False)
+    
+    keep = is_buy | is_sell
+    is_buy = is_buy[keep].to_numpy()
+    tr_value = parse_amounts(mf_df['Value'][keep]).abs().to_numpy()
+    
+    return pd.DataFrame({
+        'Date': mf_df['Date'][keep].dt.normalize().to_numpy(),
+        'Fund': np.where(is_buy, -tr_value, tr_value),
+        'Remarks': np.where(is_buy, 'MF BUY', 'MF SELL').astype(object),
+    })
+
+def process_mf(mft, today_date):
+    return mf_flows(mft, today_date).values.tolist()
+
+_hdng_idx = {}
+
+def norm_code(code):
+    return str(code).strip().upper()
 
-def get_curr_val(code, ldg):
-    desktop = os.path.join(os.path.expanduser("~"), "Desktop")
-    cons_path = os.path.join(desktop, "Holding", "Consolidated_Holdings.xlsx")
+def load_hdng_idx(cons_path=None):
+    if cons_path is None:
+        cons_path = desk("Holding", "Consolidated_Holdings.xlsx")
     
-    holdings_val = None
+    try:
+        st = os.stat(cons_path)
+    except OSError:
+        _hdng_idx.pop(cons_path, None)
+        return {}
     
-    if os.path.exists(cons_path):
-        try:
-            cons_df = pd.read_excel(cons_path)
-            
-            code_col = None
-            for col in cons_df.columns:
-                if 'client' in str(col).lower() or 'code' in str(col).lower():
-                    code_col = col
-                    break
-            
-            val_col = None
-            for col in cons_df.columns:
-                if 'portfolio value' in str(col).lower() or 'port val' in str(col).lower():
-                    val_col = col
-                    break
-            
-            if code_col and val_col:
-                code_rows = cons_df[cons_df[code_col].astype(str).str.strip() == str(code).strip()]
-                if not code_rows.empty:
-                    holdings_val = parse_float(code_rows.iloc[0][val_col])
-        except Exception:
-            pass
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _hdng_idx.get(cons_path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    
+    idx = {}
+    try:
+        cons_df = read_frame(cons_path)
+        
+        code_col = None
+        for col in cons_df.columns:
+            if 'client' in str(col).lower() or 'code' in str(col).lower():
+                code_col = col
+                break
+        
+        val_col = None
+        for col in cons_df.columns:
+            if 'portfolio value' in str(col).lower() or 'port val' in str(col).lower():
+                val_col = col
+                break
+        
+        if code_col and val_col:
+            codes = cons_df[code_col].astype(str).str.strip().str.upper()
+            first = ~codes.duplicated()
+            vals = parse_amounts(cons_df.loc[first, val_col])
+            idx = dict(zip(codes[first], vals.tolist()))
+    except Exception:
+        pass
+    
+    _hdng_idx[cons_path] = (stamp, idx)
+    return idx
+
+def get_curr_val(code, ldg, hdng_idx=None):
+    if hdng_idx is None:
+        hdng_idx = load_hdng_idx()
+    
+    holdings_val = hdng_idx.get(norm_code(code))
     
     bal_col = None
     ledger_bal = 0
@@ -450,7 +548,16 @@ def get_curr_val(code, ldg):
     
     return final_val
 
-def run_xirr(ldg, mft, init_val, curr_val, out_dir=None, code=None, start_date=None):
+def cf_block(rows):
+    dates, funds, remarks = zip(*rows) if rows else ((), (), ())
+    
+    return pd.DataFrame({
+        'Date': pd.to_datetime(pd.Series(dates, dtype=object), errors='coerce'),
+        'Fund': pd.to_numeric(pd.Series(funds, dtype=object), errors='coerce').astype(float),
+        'Remarks': pd.Series(remarks, dtype=object),
+    })
+
+def build_cf(ldg, mft, init_val, curr_val, start_date=None):
     if start_date is None:
         today = datetime.now()
         start_date = datetime(today.year - 1, today.month, today.day).date()
@@ -458,50 +565,40 @@ def run_xirr(ldg, mft, init_val, curr_val, out_dir=None, code=None, start_date=N
     initial_date = start_date
     today_date = datetime.now().date()
     
-    res_df = pd.DataFrame(columns=['Date', 'Fund', 'Remarks'])
-    
-    res_df.loc[0] = [initial_date, -abs(init_val), 'Initial Value']
-    
-    ldg_trans, _ = process_ldg(ldg, start_date, today_date)
-    
-    mf_trans = process_mf(mft, today_date)
+    ldg_block, _ = ldg_flows(ldg, today_date)
     
-    for date, value, remark in ldg_trans:
-        new_idx = len(res_df)
-        res_df.loc[new_idx] = [date, value, remark]
+    mf_block = mf_flows(mft, today_date)
     
-    for date, value, remark in mf_trans:
-        new_idx = len(res_df)
-        res_df.loc[new_idx] = [date, value, remark]
-    
-    new_idx = len(res_df)
-    res_df.loc[new_idx] = [today_date, abs(curr_val), 'Current Value']
-    
-    res_df_xl = res_df.copy()
-    res_df_xl['Date'] = pd.to_datetime(res_df_xl['Date'], errors='coerce')
-    res_df_xl['Fund'] = pd.to_numeric(res_df_xl['Fund'], errors='coerce')
-    
-    res_df_xl = res_df_xl.dropna(subset=['Date', 'Fund'])
+    res_df_xl = pd.concat([
+        cf_block([[initial_date, -abs(init_val), 'Initial Value']]),
+        ldg_block,
+        mf_block,
+        cf_block([[today_date, abs(curr_val), 'Current Value']]),
+    ], ignore_index=True)
     
+    return res_df_xl.dropna(subset=['Date', 'Fund'])
+
+def cf_series(res_df_xl):
     res_df_xl_sorted = res_df_xl.sort_values(by='Date', ascending=True)
-    
-    has_positive = (res_df_xl_sorted['Fund'] > 0).any()
-    has_negative = (res_df_xl_sorted['Fund'] < 0).any()
+    return res_df_xl_sorted['Fund'].to_numpy(), res_df_xl_sorted['Date'].to_numpy()
+
+def run_xirr(ldg, mft, init_val, curr_val, out_dir=None, code=None, start_date=None):
+    res_df_xl = build_cf(ldg, mft, init_val, curr_val, start_date)
     
     python_xirr = None
     try:
-        values = res_df_xl_sorted['Fund'].tolist()
-        dates = res_df_xl_sorted['Date'].tolist()
-        python_xirr = calc_xirr(values, dates)
+        python_xirr = calc_xirr(*cf_series(res_df_xl))
     except Exception:
         pass
     
+    return save_xirr(res_df_xl, python_xirr, code=code, out_dir=out_dir)
+
+def save_xirr(res_df_xl, python_xirr, code=None, out_dir=None):
+    reports_dir = out_dir or desk("xirr_reports")
     try:
         try:
             import xlsxwriter
         except ImportError:
-            desktop = os.path.join(os.path.expanduser("~"), "Desktop")
-            reports_dir = os.path.join(desktop, "xirr_reports")
             mk_dir(reports_dir)
             
             if code:
@@ -520,8 +617,6 @@ def run_xirr(ldg, mft, init_val, curr_val, out_dir=None, code=None, start_date=N
                 
             return out_file
             
-        desktop = os.path.join(os.path.expanduser("~"), "Desktop")
-        reports_dir = os.path.join(desktop, "xirr_reports")
         mk_dir(reports_dir)  
         
         if code:
@@ -558,33 +653,32 @@ def run_xirr(ldg, mft, init_val, curr_val, out_dir=None, code=None, start_date=N
     except Exception:
         return "Error saving results"
 
-def proc_dir(mf_dir, init_val, start_date=None):
-    desktop = os.path.join(os.path.expanduser("~"), "Desktop")
-    ledger_dir = os.path.join(desktop, 'Ledger')
+def proc_dir(mf_dir, init_val, start_date=None, ldg_dir=None, out_dir=None, cons_path=None):
+    ledger_dir = ldg_dir or desk('Ledger')
     results = []
+    hdng_idx = load_hdng_idx(cons_path)
     
-    for mf_file in glob.glob(os.path.join(mf_dir, "*.xlsx")) + glob.glob(os.path.join(mf_dir, "*.xls")):
-        csv_file = conv(mf_file)
-        if csv_file:
-            pass
+    mf_files = glob.glob(os.path.join(mf_dir, "*.xlsx")) + glob.glob(os.path.join(mf_dir, "*.xls"))
+    stems = {os.path.splitext(f)[0] for f in mf_files}
+    mf_files += [f for f in glob.glob(os.path.join(mf_dir, "*.csv")) if os.path.splitext(f)[0] not in stems]
     
-    for mf_file in glob.glob(os.path.join(mf_dir, "*.csv")):
+    for mf_file in sorted(mf_files):
         try:
             code = os.path.basename(mf_file).split('_')[0]
-            ledger_files = glob.glob(os.path.join(ledger_dir, f"{code}_Ledger*"))
+            ledger_files = sorted(ldg_glob(ledger_dir, f"{code}_Ledger*"))
             
             if not ledger_files:
                 continue
                 
-            ldg_df = pd.read_csv(ledger_files[0])
-            mf_df = pd.read_csv(mf_file)
+            ldg_df = load_source(ledger_files[-1])
+            mf_df = load_source(mf_file)
             
-            curr_val = get_curr_val(code, ldg_df)
+            curr_val = get_curr_val(code, ldg_df, hdng_idx)
             
             if curr_val is None:
                 curr_val = init_val
             
-            out_file = run_xirr(ldg_df, mf_df, init_val, curr_val, 
+            out_file = run_xirr(ldg_df, mf_df, init_val, curr_val, out_dir=out_dir,
                            code=code, start_date=start_date)
             results.append(out_file)
         except Exception:
@@ -592,60 +686,106 @@ def proc_dir(mf_dir, init_val, start_date=None):
     
     return results
 
-def proc(code=None, init_val=100000, start_date=None, input_dir=None):
+def proc_codes(codes, init_val=100000, start_date=None, ldg_dir=None, mf_dir=None, out_dir=None, cons_path=None):
+    results = []
+    cfs = []
+    hdng_idx = load_hdng_idx(cons_path)
+    
+    for code in codes:
+        ldg_f, mf_f = get_files(code, ldg_dir, mf_dir)
+        
+        if not all([ldg_f, mf_f]):
+            results.append((code, None, "Missing ledger or MF transactions file"))
+            continue
+        
+        try:
+            ldg_df = load_source(ldg_f)
+            mf_df = load_source(mf_f)
+            
+            curr_val = get_curr_val(code, ldg_df, hdng_idx)
+            
+            if curr_val is None:
+                curr_val = init_val
+            
+            cfs.append((len(results), code, build_cf(ldg_df, mf_df, init_val, curr_val, start_date)))
+            results.append((code, None, None))
+        except Exception as e:
+            results.append((code, None, str(e)))
+    
+    rates = calc_xirr_batch([cf_series(cf) for _, _, cf in cfs])
+    
+    for (i, code, cf), python_xirr in zip(cfs, rates):
+        results[i] = (code, save_xirr(cf, python_xirr, code=code, out_dir=out_dir), None)
+    
+    return results
+
+def proc_pool(codes, init_val=100000, start_date=None, workers=None, chunk=None, cb=None, **dirs):
+    if not workers:
+        workers = os.cpu_count() or 1
+    if not chunk:
+        chunk = max(1, -(-len(codes) // (workers * 4)))
+    
+    chunks = [codes[i:i + chunk] for i in range(0, len(codes), chunk)]
+    results = []
+    
+    with process_pool(workers) as pool:
+        futs = [pool.submit(proc_codes, ch, init_val, start_date, **dirs) for ch in chunks]
+        
+        for ch, fut in zip(chunks, futs):
+            try:
+                res = fut.result()
+            except Exception as e:
+                res = [(code, None, str(e)) for code in ch]
+            
+            for r in res:
+                results.append(r)
+                if cb:
+                    cb(*r)
+    
+    return results
+
+def proc(code=None, init_val=100000, start_date=None, input_dir=None, workers=None, cb=None,
+         ldg_dir=None, mf_dir=None, out_dir=None, cons_path=None, codes=None, curr_val=None):
     if input_dir: 
-        return proc_dir(input_dir, init_val, start_date)
+        return proc_dir(input_dir, init_val, start_date, ldg_dir=ldg_dir, out_dir=out_dir, cons_path=cons_path)
     
     if code:
-        ldg_f, mf_f = get_files(code)
+        ldg_f, mf_f = get_files(code, ldg_dir, mf_dir)
         
         if not all([ldg_f, mf_f]):
             return None
         
-        mf_csv = conv(mf_f)
-        
-        ldg_df = pd.read_csv(ldg_f)
-        mf_df = pd.read_csv(mf_csv)
+        ldg_df = load_source(ldg_f)
+        mf_df = load_source(mf_f)
         
-        curr_val = get_curr_val(code, ldg_df)
+        if curr_val is None:
+            curr_val = get_curr_val(code, ldg_df, load_hdng_idx(cons_path))
         
         if curr_val is None:
             curr_val = init_val
         
-        out_file = run_xirr(ldg_df, mf_df, init_val, curr_val, code=code, start_date=start_date)
+        out_file = run_xirr(ldg_df, mf_df, init_val, curr_val, out_dir=out_dir, code=code, start_date=start_date)
         
         return out_file
     else:
-        codes = get_all_codes()
-        out_files = []
+        all_codes = sorted(get_all_codes(ldg_dir))
+        if codes is not None:
+            wanted = {norm_code(c) for c in codes}
+            all_codes = [c for c in all_codes if norm_code(c) in wanted]
+        codes = all_codes
         
-        desktop = os.path.join(os.path.expanduser("~"), "Desktop")
-        reports_dir = os.path.join(desktop, "xirr_reports")
-        mk_dir(reports_dir)  
+        mk_dir(out_dir or desk("xirr_reports"))  
         
-        for code in codes:
-            ldg_f, mf_f = get_files(code)
-            
-            if not all([ldg_f, mf_f]):
-                continue
-            
-            mf_csv = conv(mf_f)
-            
-            try:
-                ldg_df = pd.read_csv(ldg_f)
-                mf_df = pd.read_csv(mf_csv)
-                
-                curr_val = get_curr_val(code, ldg_df)
-                
-                if curr_val is None:
-                    curr_val = init_val
-                
-                out_file = run_xirr(ldg_df, mf_df, init_val, curr_val, code=code, start_date=start_date)
-                out_files.append(out_file)
-            except Exception:
-                pass
+        dirs = dict(ldg_dir=ldg_dir, mf_dir=mf_dir, out_dir=out_dir, cons_path=cons_path)
+        if workers and workers > 1 and len(codes) > 1:
+            results = proc_pool(codes, init_val, start_date, workers=workers, cb=cb, **dirs)
+        else:
+            results = proc_codes(codes, init_val, start_date, **dirs)
+            if cb:
+                for r in results:
+                    cb(*r)
         
-        return out_files
+        return [out_file for _, out_file, err in results if err is None]
     
 if __name__ == "__main__":    
     modules_to_check = ['pandas', 'numpy', 'scipy', 'xlsxwriter']
@@ -678,11 +818,13 @@ if __name__ == "__main__":
         except:
             print(f"Invalid date format. Use DD/MM/YYYY format. Using one year ago date: {default_start_date.strftime('%d/%m/%Y')}")
     
+    workers = int(sys.argv[4]) if len(sys.argv) > 4 else None
+    
     if code:
         print(f"Processing data for client: {code}")
         out_file = proc(code, init_val, start_date)
         print(f"Output saved to: {out_file}")
     else:
         print("Processing data for all clients")
-        out_files = proc(init_val=init_val, start_date=start_date)
+        out_files = proc(init_val=init_val, start_date=start_date, workers=workers)
         print(f"Outputs saved to: {out_files}")
\ No newline at end of file
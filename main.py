@@ -1,13 +1,21 @@
 import sys
-from ui.ui import Main
-from PyQt5.QtWidgets import QApplication
+import multiprocessing
 
 
 def main():
+    multiprocessing.freeze_support()
+    
+    if len(sys.argv) > 1 and sys.argv[1] == 'batch':
+        from batch import run
+        sys.exit(run(sys.argv[2:]))
+
+    from ui.ui import Main
+    from PyQt5.QtWidgets import QApplication
+
     app = QApplication(sys.argv)
     window = Main()
     window.show()
     sys.exit(app.exec())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from utils.format import ist, ist_col
+
+def test_ist_grouping():
+    assert ist(0) == '0'
+    assert ist(999) == '999'
+    assert ist(1234567) == '12,34,567'
+    assert ist(-1234567.891, 2) == '-12,34,567.89'
+
+@pytest.mark.parametrize("values", [
+    np.array([1.0, np.nan, 0.0, 1234567.0]),
+    np.array([1.0, np.nan, 0.0, 1234567.0], dtype=object),
+    np.array([1, None, 0, 1234567], dtype=object),
+])
+def test_ist_col_blanks_nan_and_zero(values):
+    assert ist_col(values) == ['1', '', '', '12,34,567']
+
+def test_ist_col_keeps_zero():
+    assert ist_col(np.array([0.0, np.nan, 2.5]), 1, blank_zero=False) == ['0.0', '', '2.5']
+    assert ist_col(np.array([0, 3]), blank_zero=False) == ['0', '3']
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils.processor as processor
+from utils.processor import Processor
+
+# Golden allocation buckets, checked against the original row-by-row
+# categorize(). Market values are powers of two so every bucket sum
+# identifies exactly which rows landed in it.
+EQUITY = pd.DataFrame({
+    "Instrument Name": ["NIPPON INDIA ETF GILT BEES", "SBI 5 YR BENCHMARK GSEC ETF", "BHARAT BOND ETF APRIL 2030",
+                        "Nippon India Liquid BeES", "Gold BeES", "HDFC Bank", "Nifty BeES", np.nan,
+                        "LTGILTBEES", "Reliance Industries"],
+    "Market Value": [1, 2, 4, 8, 16, 32, 64, 128, 256, "n/a"],
+})
+
+BOND = pd.DataFrame({
+    "Instrument Name": ["SGB 2028 Series", "Sovereign Gold Bond", "GOI 7.26% 2033", "NHAI Tax Free 2030",
+                        "Some NCD 2027", "Corporate Bond XYZ", "goi floater"],
+    "Market Value": [1, 2, 4, 8, 16, 32, 64],
+})
+
+MF = pd.DataFrame({
+    "Asset Type": ["Balanced", "Cash", "Equity", "Debt", "Debt", "Hybrid", "equity", np.nan],
+    "Scheme Name": ["HDFC Balanced Advantage", "ICICI Liquid Fund", "Parag Parikh Flexi Cap", "SBI Magnum Gilt Fund",
+                    "HDFC Short Term Debt", "Some Hybrid Fund", "Axis Bluechip Fund", "Unknown"],
+    "Market Value": [1, 2, 4, 8, 16, 32, 64, 128],
+})
+
+GOLDEN = [
+    (EQUITY, dict(section="Equity", instr_col="Instrument Name"), (32 + 64 + 128, 1 + 2 + 4 + 8 + 256, 16, 1 + 2 + 8 + 256)),
+    (BOND, dict(section="Bond", instr_col="Instrument Name"), (0, 4 + 8 + 16 + 64, 1 + 2, 1 + 2 + 4 + 64)),
+    (MF, dict(section="Mutual Fund", asset_col="Asset Type", scheme_col="Scheme Name"), (1 + 4 + 64, 2 + 8 + 16, 0, 2 + 8)),
+    (EQUITY.iloc[:0], dict(section="Equity", instr_col="Instrument Name"), (0, 0, 0, 0)),
+    (EQUITY, dict(section="FnO", instr_col="Instrument Name"), (0, 0, 0, 0)),
+]
+
+@pytest.mark.parametrize("frame, kw, expected", GOLDEN)
+def test_categorize_golden(frame, kw, expected):
+    got = Processor(".").categorize(frame.copy(), **kw)
+    assert tuple(float(v) for v in got) == tuple(float(v) for v in expected)
+
+def test_categorize_float_values():
+    frame = BOND.assign(**{"Market Value": [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7]})
+    got = Processor(".").categorize(frame, section="Bond", instr_col="Instrument Name")
+    assert got == (0, 0.3 + 0.4 + 0.5 + 0.7, 0.1 + 0.2, 0.1 + 0.2 + 0.3 + 0.7)
+
+def holdings_frame(names, values):
+    width = 14
+    def line(*cells):
+        row = [np.nan] * width
+        row[:len(cells)] = cells
+        return row
+    header = line("Instrument Name")
+    header[10] = "Market Value"
+    rows = [line("Equity:-"), header]
+    for name, value in zip(names, values):
+        row = line(name)
+        row[10] = value
+        rows.append(row)
+    total = line("Total:")
+    total[10] = sum(values)
+    rows += [total, line()]
+    return pd.DataFrame(rows)
+
+def test_rule_change_invalidates_manifest(tmp_path, monkeypatch):
+    path = str(tmp_path / "C001.xlsx")
+    with open(path, "wb") as f:
+        f.write(b"holdings")
+    frames = {path: holdings_frame(["HDFC Bank", "Gold BeES"], [100, 50])}
+    
+    proc = Processor(str(tmp_path))
+    assert proc.process_holdings(frames=frames)
+    row = proc.load_manifest()["C001.xlsx"]["row"]
+    assert row[1:] == [150.0, 100.0, 0.0, 50.0, 0.0]
+    
+    calls = []
+    orig = Processor.process_holdings_file
+    def spy(self, path, frame=None):
+        calls.append(path)
+        return orig(self, path, frame)
+    monkeypatch.setattr(Processor, "process_holdings_file", spy)
+    
+    proc.process_holdings(frames=frames)
+    assert calls == []
+    
+    rules = [(("HDFC",), ("debt",))] + processor.EQUITY_RULES
+    monkeypatch.setattr(processor, "EQUITY_RULES", rules)
+    monkeypatch.setitem(processor.SECTION_RULES, "Equity",
+                        [(processor.kw_re(keys), buckets) for keys, buckets in rules])
+    
+    proc.process_holdings(frames=frames)
+    assert calls == [path]
+    row = proc.load_manifest()["C001.xlsx"]["row"]
+    assert row[1:] == [150.0, 0.0, 100.0, 50.0, 0.0]
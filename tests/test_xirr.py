@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import generator.xirr as xirr
+from generator.xirr import parse_float, parse_amounts, calc_xirr, calc_xirr_batch
+
+def legacy_parse_float(value):
+    try:
+        if pd.isna(value) or value == '':
+            return 0.0
+        if isinstance(value, (int, float)):
+            return float(value)
+        cleaned = ''.join(c for c in str(value) 
+                        if c.isdigit() or c in {'.', '-'})
+        return float(cleaned) if cleaned else 0.0
+    except Exception:
+        return 0.0
+
+CASES = [
+    (np.nan, 0.0),
+    (None, 0.0),
+    ('', 0.0),
+    (0, 0.0),
+    (42, 42.0),
+    (-7, -7.0),
+    (3.5, 3.5),
+    (-0.25, -0.25),
+    ('1200', 1200.0),
+    ('1,200', 1200.0),
+    ('12,34,567', 1234567.0),
+    ('12,34,567.89', 1234567.89),
+    ('-1,500', -1500.0),
+    ('  75 ', 75.0),
+    ('Rs. 1,200', 1200.0),
+    ('Rs.1,200', 1200.0),
+    ('RS. 500', 500.0),
+    ('Rs 1,200', 1200.0),
+    ('INR 2,500', 2500.0),
+    ('inr 2,500', 2500.0),
+    ('₹3,000', 3000.0),
+    ('₹ 3,000.50', 3000.5),
+    ('(1,500)', -1500.0),
+    ('Rs. (1,500)', -1500.0),
+    ('₹(250)', -250.0),
+    ('abc', 0.0),
+    ('N/A', 0.0),
+    ('-', 0.0),
+    ('1.2.3', 0.0),
+]
+
+# Intentional differences from the old digit-filter parser: the dot of a
+# 'Rs.' prefix used to be kept as a decimal point, and parenthesised
+# (accounting style) amounts used to come out positive.
+CHANGED = {
+    'Rs. 1,200': 0.12,
+    'Rs.1,200': 0.12,
+    'RS. 500': 0.5,
+    '(1,500)': 1500.0,
+    'Rs. (1,500)': 0.15,
+    '₹(250)': 250.0,
+}
+
+@pytest.mark.parametrize("value, expected", CASES)
+def test_parse_float(value, expected):
+    assert parse_float(value) == expected
+
+def test_parse_amounts_matches_parse_float():
+    values = [v for v, _ in CASES]
+    out = parse_amounts(pd.Series(values, dtype=object))
+    assert out.tolist() == [parse_float(v) for v in values]
+
+@pytest.mark.parametrize("dtype", ['int64', 'float64'])
+def test_parse_amounts_numeric(dtype):
+    col = pd.Series([1, 0, -3], dtype=dtype)
+    assert parse_amounts(col).tolist() == [1.0, 0.0, -3.0]
+
+@pytest.mark.parametrize("value, expected", CASES)
+def test_parity_with_legacy(value, expected):
+    if isinstance(value, str) and value in CHANGED:
+        assert legacy_parse_float(value) == CHANGED[value]
+    else:
+        assert legacy_parse_float(value) == expected
+
+def flow(n, seed):
+    rnd = np.random.default_rng(seed)
+    dates = pd.Timestamp('2020-01-01') + pd.to_timedelta(np.sort(rnd.integers(0, 1500, n)), unit='D')
+    values = -rnd.uniform(1000, 50000, n)
+    values[-1] = -values[:-1].sum() * rnd.uniform(1.05, 1.4)
+    return list(values), list(dates)
+
+def test_batch_long_series_among_short(monkeypatch):
+    flows = [flow(4 + i % 20, i) for i in range(600)]
+    flows.insert(300, flow(5000, 999))
+    
+    widths = []
+    block = xirr.xirr_block
+    def spy(series, *args):
+        widths.append(max(len(v) for v, _ in series))
+        return block(series, *args)
+    monkeypatch.setattr(xirr, 'xirr_block', spy)
+    
+    res = calc_xirr_batch(flows)
+    
+    assert max(widths) < 24
+    for got, (values, dates) in zip(res, flows):
+        assert got == pytest.approx(calc_xirr(values, dates), abs=1e-6)
@@ -0,0 +1,356 @@
+import os
+import glob
+import time
+import shutil
+
+def desktop_dir():
+    return os.path.join(os.path.expanduser('~'), 'Desktop')
+
+def export_mf(job, mf_folder):
+    from generator.xirr import conv
+    from utils.cache import csv_debug
+    
+    if not csv_debug():
+        return
+    try:
+        job.log("Exporting MF transaction files to CSV...")
+        mf_files = [f for f in os.listdir(mf_folder) if f.endswith((".xlsx", ".xls")) and "MFTrans" in f]
+        converted = 0
+        for file in mf_files:
+            try:
+                if conv(os.path.join(mf_folder, file)):
+                    converted += 1
+            except Exception as e:
+                job.log(f"Error converting {file}: {str(e)}")
+        job.log(f"Exported {converted} out of {len(mf_files)} MF transaction files to CSV")
+    except Exception as e:
+        job.log(f"Error in batch conversion: {str(e)}")
+
+def check_ledgers(job):
+    from utils.cache import load_source, csv_debug
+    
+    ledger_dir = os.path.join(desktop_dir(), 'Ledger')
+    if not os.path.exists(ledger_dir):
+        job.log("⚠️ Ledger directory not found!")
+        return False
+
+    ledger_files = [f for f in os.listdir(ledger_dir) if f.lower().endswith(('.xlsx', '.xls', '.csv'))]
+    if not ledger_files:
+        job.log("⚠️ No ledger files found (neither Excel nor CSV)")
+        return False
+
+    if csv_debug():
+        for fname in ledger_files:
+            if fname.lower().endswith(('.xlsx', '.xls')):
+                try:
+                    load_source(os.path.join(ledger_dir, fname))
+                    job.log(f"Exported ledger: {fname}")
+                except Exception as e:
+                    job.log(f"🚨 Ledger export failed for {fname}: {str(e)}")
+
+    job.log(f"✓ Found {len(ledger_files)} ledger files")
+    return True
+
+def login(job, dl_folder, mf_folder, url, user, pwd):
+    from web.web import Scraper
+    scraper = Scraper(dl_folder, mf_folder)
+    return scraper, scraper.login(url, user, pwd)
+
+def download_holdings(job, scraper, codes):
+    job.log(f"Downloading holdings for {len(codes)} clients...")
+    return scraper.process_all_clients(codes, job.downloaded, cancel=job.stop)
+
+def process_holdings(job, folder, single_client=None, ledger=None, workers=None):
+    import pandas as pd
+    from utils.processor import Processor
+    from utils.holdings import holdings_files, load_holdings
+    
+    job.log(f"Processing holdings from: {folder}")
+    excel_files = holdings_files(folder)
+    if not excel_files:
+        return {'files': 0}
+
+    if single_client:
+        excel_files = [f for f in excel_files if single_client in os.path.basename(f)]
+        job.log(f"Filtered to {len(excel_files)} files for client {single_client}")
+
+    frames = {}
+    if single_client:
+        for excel_file in excel_files:
+            try:
+                frames[excel_file] = load_holdings(excel_file)
+            except Exception as e:
+                print(f"Error loading {excel_file}: {str(e)}")
+
+    job.log(f"Processing {len(excel_files)} holdings files from {folder}")
+
+    processor = Processor(folder)
+    if ledger is not None and hasattr(processor, 'set_required_files'):
+        processor.set_required_files(ledger=ledger, mf_transactions=None, sip=None)
+
+    job.check()
+    out_file = processor.process_holdings(frames=frames, workers=workers)
+    count = pd.read_excel(out_file).shape[0] if out_file else None
+
+    return {'files': len(excel_files), 'count': count, 'out_file': out_file,
+            'frames': frames, 'processor': processor}
+
+def pick_clients(paths, clients):
+    if clients is None:
+        return paths
+    wanted = {str(c).strip().upper() for c in clients}
+    return [p for p in paths if os.path.splitext(os.path.basename(p))[0].upper() in wanted]
+
+def generate_excel(job, folder, single_client=None, frames=None, ledger_folder=None, out_dir=None, clients=None,
+                   engine=None):
+    from generator.excel import excel_generator
+    from utils.cache import load_source
+    from utils.holdings import holdings_files, load_holdings
+    
+    job.log("Generating Excel files from holdings files...")
+    ledger_folder = ledger_folder or os.path.join(os.path.dirname(folder), "Ledger")
+
+    desktop = desktop_dir()
+    excel_reports_folder = out_dir or os.path.join(desktop, "excel_reports")
+    if not os.path.exists(excel_reports_folder):
+        os.makedirs(excel_reports_folder)
+
+    if frames is None:
+        frames = {}
+
+    hdng_files = pick_clients(holdings_files(folder), clients)
+
+    if single_client:
+        hdng_files = [f for f in hdng_files if single_client in os.path.basename(f)]
+        job.log(f"Filtered to {len(hdng_files)} holdings files for client {single_client}")
+
+    if not hdng_files:
+        job.log("No matching Excel files found in Holdings folder.")
+        return {'total': 0}
+
+    ledger_files = {}
+    if os.path.exists(ledger_folder):
+        for f in sorted(os.listdir(ledger_folder), key=lambda f: f.endswith('.csv')):
+            for ext in ('.xlsx', '.xls', '.csv'):
+                if f.endswith('_Ledger' + ext):
+                    client_code = f[:-len('_Ledger' + ext)]
+                    if (not single_client or single_client == client_code) and client_code not in ledger_files:
+                        ledger_files[client_code] = os.path.join(ledger_folder, f)
+
+        if single_client and single_client not in ledger_files:
+            job.log(f"Warning: No ledger file found for client {single_client}")
+    else:
+        job.log("Ledger folder not found. Only Holdings data will be processed.")
+
+    processed_count = 0
+    for i, holdings_file in enumerate(hdng_files):
+        if job.cancelled:
+            break
+        try:
+            base_filename = os.path.splitext(os.path.basename(holdings_file))[0]
+            client_code = base_filename
+            job.step(i, len(hdng_files), f"Internal review sheet: {client_code}")
+
+            df_holdings = frames.get(holdings_file)
+            if df_holdings is None:
+                df_holdings = load_holdings(holdings_file)
+            if df_holdings.empty:
+                print(f"Skipping empty holdings file: {holdings_file}")
+                continue
+
+            df_ledger = None
+            if client_code in ledger_files:
+                ledger_file = ledger_files[client_code]
+                try:
+                    df_ledger = load_source(ledger_file)
+                    print(f"Found matching ledger file for {client_code}: {ledger_file}")
+                except Exception as le:
+                    print(f"Error reading ledger file {ledger_file}: {str(le)}")
+            else:
+                print(f"No matching ledger file found for client code: {client_code}")
+
+            output_file = excel_generator(df_holdings, df_ledger, engine=engine)
+
+            if output_file:
+                if os.path.exists(output_file):
+                    dest_file = os.path.join(excel_reports_folder, f"{base_filename}_report.xlsx")
+                    shutil.move(output_file, dest_file)
+                    processed_count += 1
+                else:
+                    print(f"Output file not found: {output_file}")
+            else:
+                try:
+                    potential_dirs = [os.getcwd(), os.path.dirname(holdings_file), desktop]
+                    newest_file = None
+                    newest_time = 0
+                    for check_dir in potential_dirs:
+                        excel_files = glob.glob(os.path.join(check_dir, "*.xlsx"))
+                        for file in excel_files:
+                            file_time = os.path.getmtime(file)
+
+                            if time.time() - file_time < 10 and file_time > newest_time:
+                                newest_file = file
+                                newest_time = file_time
+
+                    if newest_file:
+                        dest_file = os.path.join(excel_reports_folder, f"{base_filename}_report.xlsx")
+                        shutil.copy2(newest_file, dest_file)
+                        processed_count += 1
+                        print(f"Processed: {holdings_file} → {dest_file} (found recent file)")
+                    else:
+                        print(f"Could not locate output file for {holdings_file}")
+                except Exception as inner_e:
+                    print(f"Error locating output for {holdings_file}: {str(inner_e)}")
+
+        except Exception as e:
+            print(f"Error processing {holdings_file}: {str(e)}")
+
+    job.step(len(hdng_files), len(hdng_files))
+    return {'processed': processed_count, 'total': len(hdng_files), 'folder': excel_reports_folder}
+
+def find_ledger(ledger_folder, base_filename):
+    ledger_file = os.path.join(ledger_folder, f"{base_filename}_Ledger.xlsx")
+    if os.path.exists(ledger_file):
+        return ledger_file
+
+    for ext in ['.xls', '.csv']:
+        potential_file = os.path.join(ledger_folder, f"{base_filename}_Ledger{ext}")
+        if os.path.exists(potential_file):
+            return potential_file
+
+    for ext in ['.xlsx', '.xls', '.csv']:
+        potential_file = os.path.join(ledger_folder, base_filename + ext)
+        if os.path.exists(potential_file):
+            return potential_file
+    return None
+
+def generate_reports(job, holding_folder=None, ledger_folder=None, out_dir=None, xirr_dir=None, clients=None,
+                     workers=None):
+    from generator.report import render_report, report_pool
+    from utils.holdings import holdings_files
+
+    job.log("Generating report...")
+
+    desktop = desktop_dir()
+    holding_folder = holding_folder or os.path.join(desktop, "Holding")
+    ledger_folder = ledger_folder or os.path.join(desktop, "Ledger")
+    client_reports_folder = out_dir or os.path.join(desktop, "client_reports")
+    client_xirr_folder = xirr_dir or os.path.join(desktop, "xirr_reports")
+
+    for folder in [holding_folder, ledger_folder, client_reports_folder, client_xirr_folder]:
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+    holding_paths = pick_clients(holdings_files(holding_folder), clients)
+    if not holding_paths:
+        return None
+
+    skipped_count = 0
+    tasks = []
+    for holding_path in holding_paths:
+        holding_file = os.path.basename(holding_path)
+        base_filename = os.path.splitext(holding_file)[0]
+
+        ledger_file = find_ledger(ledger_folder, base_filename)
+        if ledger_file is None:
+            job.log(f"Skipped {holding_file}: No matching file in Ledger folder")
+            skipped_count += 1
+            continue
+
+        output_file = os.path.join(client_reports_folder, f"{base_filename}_report.pdf")
+        tasks.append((holding_path, ledger_file, output_file, client_xirr_folder))
+
+    state = {'done': 0, 'processed': 0}
+
+    def collect(holding_path, pdf_path, err):
+        holding_file = os.path.basename(holding_path)
+        state['done'] += 1
+        if pdf_path:
+            state['processed'] += 1
+            job.log(f"Generated report for {os.path.splitext(holding_file)[0]} at {pdf_path}")
+        else:
+            job.log(f"Error in report_gen for {holding_file}: {err}")
+        job.step(state['done'] - 1, len(tasks), f"Client report: {holding_file}")
+
+    if workers and workers > 1 and len(tasks) > 1:
+        job.log(f"Rendering {len(tasks)} reports on {workers} processes...")
+        report_pool(tasks, workers, cb=collect, stop=job.stop)
+    else:
+        for task in tasks:
+            if job.cancelled:
+                break
+            collect(*render_report(*task))
+
+    skipped_count += state['done'] - state['processed']
+    job.step(len(tasks), len(tasks))
+    return {'processed': state['processed'], 'skipped': skipped_count, 'folder': client_reports_folder}
+
+def manual_xirr(job, scraper, mf_folder, code, init_val, curr_val, start_date,
+                download=False, from_date=None, to_date=None):
+    from generator.xirr import proc
+    
+    downloaded = None
+    if download:
+        job.log(f"Downloading MF transactions for {code}...")
+        downloaded = scraper.search_client_mf_trans(code, from_date, to_date)
+
+        if downloaded:
+            job.log(f"✅ Successfully downloaded MF transactions for {code}")
+            export_mf(job, mf_folder)
+        else:
+            job.log(f"❌ Failed to download MF transactions for {code}")
+
+    job.check()
+    job.log(f"Generating XIRR for {code}...")
+    out_file = proc(code=code, init_val=init_val, curr_val=curr_val, start_date=start_date)
+
+    if out_file:
+        job.log(f"✅ Successfully generated XIRR report for {code}")
+    else:
+        job.log(f"❌ Failed to generate XIRR report for {code}")
+    return {'downloaded': downloaded, 'out_file': out_file}
+
+def batch_xirr(job, scraper, mf_folder, codes, client_data, default_init_val, default_start_date,
+               from_date=None, to_date=None):
+    from generator.xirr import proc
+    
+    job.log(f"Downloading MF transactions for {len(codes)} clients...")
+    success, fails = scraper.process_all_clients_mf_trans(codes, job.downloaded, from_date, to_date,
+                                                           cancel=job.stop)
+    job.log(f"Download complete: {success} succeeded, {len(fails)} failed")
+
+    if fails:
+        job.log(f"Failed clients: {', '.join(fails)}")
+
+    export_mf(job, mf_folder)
+    job.check()
+
+    job.log("Generating XIRR reports...")
+    out_files = []
+    for i, code in enumerate(codes):
+        if job.cancelled:
+            break
+        job.step(i, len(codes), f"XIRR: {code}")
+
+        if code in fails:
+            job.log(f"Skipping failed client: {code}")
+            continue
+
+        client = client_data[code]
+        init_val = client['init_val'] if client['init_val'] is not None else default_init_val
+        start_date = client['start_date'] if client['start_date'] is not None else default_start_date
+
+        job.log(f"Processing XIRR for {code}: init_val={init_val}, start_date={start_date}")
+
+        try:
+            report_file = proc(code=code, init_val=init_val, start_date=start_date)
+            if report_file:
+                out_files.append(report_file)
+                job.log(f"Generated XIRR report for {code}: {report_file}")
+            else:
+                job.log(f"Failed to generate XIRR report for {code}")
+        except Exception as client_error:
+            job.log(f"Error processing XIRR for {code}: {str(client_error)}")
+
+    job.step(len(codes), len(codes))
+    return {'fails': fails, 'out_files': out_files}
@@ -1,18 +1,9 @@
 import os
-import glob
-import time
-from datetime import date
-import pandas as pd
-import traceback
-import shutil
-from generator.excel import excel_generator
-from generator.report import report_gen
-from generator.xirr import conv, parse_float, proc
-from web.web import Scraper
-from PyQt5.QtCore import Qt, QDate
-from utils.processor import Processor
+from PyQt5.QtCore import Qt, QDate, QThreadPool
+from ui import jobs
+from ui.workers import Worker
 from PyQt5.QtWidgets import (
-    QMainWindow, QPushButton, QVBoxLayout, QWidget,
+    QMainWindow, QPushButton, QVBoxLayout, QWidget, QProgressBar,
     QFileDialog, QMessageBox, QLabel, QLineEdit, QHBoxLayout, QDateEdit, QCheckBox, QScrollArea
 )
 
@@ -22,6 +13,9 @@ class Main(QMainWindow):
         self.scraper = None
         self.file_path = None
         self.processor = None
+        self.worker = None
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(1)
         self.dl_folder = self._get_dl_path()
         self.mf_folder = self._get_mf_path()
         
@@ -47,86 +41,64 @@ class Main(QMainWindow):
             os.makedirs(path)
         return path
     
-    def _convert_mf_transactions(self):
-        try:
-            self.log("Converting all MF transaction files to CSV...")
-            mf_files = [f for f in os.listdir(self.mf_folder) if f.endswith((".xlsx", ".xls")) and "MFTrans" in f]
-            converted = 0
-            for file in mf_files:
-                try:
-                    self._convert_mf_transaction_file(file)
-                    converted += 1
-                except Exception as e:
-                    self.log(f"Error converting {file}: {str(e)}")
-            self.log(f"Converted {converted} out of {len(mf_files)} MF transaction files to CSV")
-        except Exception as e:
-            self.log(f"Error in batch conversion: {str(e)}")
+    def log(self, msg):
+        print(msg)
+        self.status_lbl.setText(msg)
     
-    def _convert_ledger_files(self):
-        ledger_dir = os.path.join(os.path.expanduser('~'), 'Desktop', 'Ledger')
-        if not os.path.exists(ledger_dir):
-            self.log("⚠️ Ledger directory not found!")
-            return False
-
-        conversion_needed = False
-        conversion_done = False
+    def run_job(self, fn, *args, done=None, fail="Error", **kwargs):
+        if self.worker is not None:
+            QMessageBox.warning(self, "Busy", "Another task is still running. Cancel it or wait for it to finish.")
+            return None
+        
+        worker = Worker(fn, *args, **kwargs)
+        worker.signals.message.connect(self.log)
+        worker.signals.progress.connect(self.on_progress)
+        worker.signals.downloaded.connect(self.update_sum)
+        worker.signals.result.connect(lambda res, w=worker: self.on_result(w, res, done))
+        worker.signals.error.connect(lambda err, w=worker: self.on_error(w, err, fail))
+        worker.signals.finished.connect(lambda cancelled, w=worker: self.on_finished(w, cancelled))
+        
+        self.worker = worker
+        self.cancel_btn.setEnabled(True)
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.show()
+        self.pool.start(worker)
+        return worker
     
-        for fname in os.listdir(ledger_dir):
-            if fname.lower().endswith(('.xlsx', '.xls')):
-                conversion_needed = True
-                try:
-                    full_path = os.path.join(ledger_dir, fname)
-                    csv_path = os.path.join(ledger_dir, fname.rsplit('.', 1)[0] + '.csv')
-                
-                    if not os.path.exists(csv_path):
-                        df = pd.read_excel(full_path)
-                        df.to_csv(csv_path, index=False)
-                        self.log(f"Converted ledger: {fname} → {csv_path}")
-                        conversion_done = True
-                    else:
-                        self.log(f"CSV already exists for: {fname}")
-                except Exception as e:
-                    self.log(f"🚨 Ledger conversion failed for {fname}: {str(e)}")
-                    return False
-
-        if conversion_needed:
-            return conversion_done  
-        else:
-            if any(fname.endswith('.csv') for fname in os.listdir(ledger_dir)):
-                self.log("✓ Ledger files already in CSV format")
-                return True
-            self.log("⚠️ No ledger files found (neither Excel nor CSV)")
-            return False
+    def release(self, worker):
+        if self.worker is worker:
+            self.worker = None
+            self.cancel_btn.setEnabled(False)
+            self.progress_bar.hide()
     
-    def _get_client_codes(self):
-        manual_code = self.xirr_code_input.text().strip()
-        if manual_code:
-            return [manual_code], None
-            
-        file_path, _ = QFileDialog.getOpenFileName(self, "Select Client Codes File", 
-                                                 "", "Excel Files (*.xlsx *.xls)")
-        if not file_path:
-            return None, "No file selected"
-
-        try:
-            df = pd.read_excel(file_path)
-            column_names = [col.lower().strip() for col in df.columns]
-            client_code_variations = ['client code', 'clientcode', 'client_code', 
-                                    'code', 'client id', 'clientid', 'client_id']
-            code_column = None
-            for variant in client_code_variations:
-                if variant in column_names:
-                    code_column = df.columns[column_names.index(variant)]
-                    break
-            if not code_column:
-                return None, "No client code column found"
-            return df[code_column].dropna().astype(str).str.strip().tolist(), None
-        except Exception as e:
-            return None, f"Error reading Excel: {str(e)}"
+    def on_progress(self, done, total, msg):
+        if total > 0:
+            self.progress_bar.setRange(0, total)
+            self.progress_bar.setValue(done)
+        if msg:
+            self.log(f"{msg} ({done + 1}/{total})" if total > 0 else msg)
     
-    def log(self, msg):
-        print(msg)
-        self.status_lbl.setText(msg)
+    def on_result(self, worker, res, done):
+        self.release(worker)
+        if done is not None and not worker.cancelled:
+            done(res)
+    
+    def on_error(self, worker, err, fail):
+        self.release(worker)
+        self.log(f"{fail}: {err}")
+        QMessageBox.critical(self, "Error", f"{fail}: {err}")
+    
+    def on_finished(self, worker, cancelled):
+        self.release(worker)
+        if cancelled:
+            self.log("⏹ Cancelled")
+            self.sum_lbl.setText("Task cancelled.")
+    
+    def cancel_job(self):
+        if self.worker is not None:
+            self.log("Cancelling... finishing the current client first")
+            self.cancel_btn.setEnabled(False)
+            self.worker.cancel()
     
     def fetch_manual_code(self):
         code = self.manual_code_input.text().strip()
@@ -148,9 +120,13 @@ class Main(QMainWindow):
         )
     
         if reply == QMessageBox.StandardButton.Yes:
-            holdings_success, holdings_fails = self.scraper.process_all_clients([code], self.update_sum)
-            if holdings_success > 0:
-                self.process_hdng(auto_continue=True, single_client=code)
+            def downloaded(res):
+                holdings_success, holdings_fails = res
+                if holdings_success > 0:
+                    self.process_hdng(auto_continue=True, single_client=code)
+            
+            self.run_job(jobs.download_holdings, self.scraper, [code], done=downloaded,
+                         fail="Error downloading holdings")
         else:
             self.generate_excel(auto_mode=True, single_client=code)
 
@@ -390,6 +366,23 @@ class Main(QMainWindow):
         """)
         layout.addWidget(self.sum_lbl)
         
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setTextVisible(True)
+        self.progress_bar.hide()
+        layout.addWidget(self.progress_bar)
+        
+        self.cancel_btn = QPushButton("CANCEL")
+        self.cancel_btn.setStyleSheet("""
+            background-color: #8b0000;
+            color: white;
+            font-weight: bold;
+            padding: 3px 10px;
+            border-radius: 5px;
+        """)
+        self.cancel_btn.clicked.connect(self.cancel_job)
+        self.cancel_btn.setEnabled(False)
+        layout.addWidget(self.cancel_btn)
+        
         container = QWidget()
         container.setLayout(layout)
 
@@ -400,6 +393,7 @@ class Main(QMainWindow):
         self.setCentralWidget(scroll_area)
     
     def categorize_file(self, file_path):
+        import pandas as pd
         filename = os.path.basename(file_path).lower()
         
         if "ledger" in filename:
@@ -483,19 +477,21 @@ class Main(QMainWindow):
             QMessageBox.warning(self, "Error", "Please fill in all fields")
             return
 
-        try:
-            self.scraper = Scraper(self.dl_folder, self.mf_folder)
-            if self.scraper.login(url, user, pwd):
+        def logged_in(res):
+            self.scraper, ok = res
+            if ok:
                 self.status_lbl.setText("Login successful")
                 self.excel_btn.setEnabled(True)
             else:
                 self.status_lbl.setText("Login failed")
                 QMessageBox.critical(self, "Login Error", "Failed to log in")
-        except Exception as e:
-            self.status_lbl.setText("Login failed")
-            QMessageBox.critical(self, "Login Error", f"Failed to log in: {e}")
+
+        self.status_lbl.setText("Logging in...")
+        self.run_job(jobs.login, self.dl_folder, self.mf_folder, url, user, pwd,
+                     done=logged_in, fail="Failed to log in")
 
     def open_excel(self):
+        import pandas as pd
         reply = QMessageBox.question(
             self,
             "Download Holdings",
@@ -532,15 +528,20 @@ class Main(QMainWindow):
                     return
 
                 self.status_lbl.setText(f"Downloading holdings for {len(codes)} clients...")
-                holdings_success, holdings_fails = self.scraper.process_all_clients(codes, self.update_sum)
 
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Error processing file: {str(e)}")
+                return
+
+            def downloaded(res):
+                holdings_success, holdings_fails = res
                 if holdings_success > 0:
                     self.process_hdng(auto_continue=True)
                 else:
                     QMessageBox.critical(self, "Error", "Failed to download any holdings!")
 
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Error processing file: {str(e)}")
+            self.run_job(jobs.download_holdings, self.scraper, codes, done=downloaded,
+                         fail="Error processing file")
         else:
             self.generate_excel(auto_mode=False)
     
@@ -552,71 +553,32 @@ class Main(QMainWindow):
         )
     
     def process_hdng(self, auto_continue=False, single_client=None):
-        folder = self.dl_folder
-        self.log(f"Processing holdings from: {folder}")
-        try:
-            excel_files = [os.path.join(folder, f) for f in os.listdir(folder)
-                          if f.endswith(('.xlsx', '.xls'))]
+        ledger = self.required_files.get("Ledger")
         
-            if not excel_files:
+        def processed(res):
+            if not res['files']:
                 self.sum_lbl.setText("No Excel files found in Holdings folder.")
                 QMessageBox.warning(self, "Error", "No Excel files found in Holdings folder.")
                 return
             
-            if single_client:
-                excel_files = [f for f in excel_files if single_client in os.path.basename(f)]
-                self.log(f"Filtered to {len(excel_files)} files for client {single_client}")
-            
-            converted_count = 0
-            for excel_file in excel_files:
-                try:
-                    try:
-                        df = pd.read_excel(excel_file)
-                    except Exception as e1:
-                        try:
-                            df = pd.read_excel(excel_file, engine='openpyxl')
-                        except Exception as e2:
-                            df = pd.read_excel(excel_file, engine='xlrd')
-                    csv_file = os.path.splitext(excel_file)[0] + '.csv'
-                    df.to_csv(csv_file, index=False)
-                    converted_count += 1
-                except Exception as e:
-                    print(f"Error converting {excel_file}: {str(e)}")
-                
-            self.sum_lbl.setText(
-                f"Converted {converted_count}/{len(excel_files)} Excel files to CSV in {folder}"
-            )
-        
-            self.processor = Processor(folder)
-            if hasattr(self.processor, 'set_required_files') and "Ledger" in self.required_files and self.required_files["Ledger"] is not None:
-                self.processor.set_required_files(
-                    ledger=self.required_files["Ledger"],
-                    mf_transactions=None,
-                    sip=None
-                )
-            
-            out_file = self.processor.process_holdings()
-            if out_file:
-                df = pd.read_excel(out_file)
-                count = df.shape[0]
+            self.processor = res['processor']
+            if res['out_file']:
                 self.sum_lbl.setText(
-                    f"Converted {converted_count} files to CSV.\n"
-                    f"Extracted holdings for {count} clients.\n"
-                    f"Report saved: {out_file}"
+                    f"Processed {res['files']} holdings files.\n"
+                    f"Extracted holdings for {res['count']} clients.\n"
+                    f"Report saved: {res['out_file']}"
                 )
             
             if auto_continue:
                 self.status_lbl.setText("Generating internal review sheets...")
-                self.generate_excel(auto_mode=True, single_client=single_client)
-            
-        except Exception as e:
-            error_details = traceback.format_exc()
-            print(f"Processing error: {error_details}")
-            err_msg = f"Error: {str(e)}"
-            self.log(err_msg)
-            QMessageBox.critical(self, "Critical Error", err_msg)
+                self.generate_excel(auto_mode=True, single_client=single_client, frames=res['frames'])
+        
+        self.run_job(jobs.process_holdings, self.dl_folder, single_client=single_client,
+                     ledger=ledger, workers=os.cpu_count(), done=processed, fail="Error")
     
     def process_mf_trans(self):
+        import pandas as pd
+        from utils.processor import Processor
         missing_files = []
     
         if "MF Transactions" not in self.required_files or self.required_files["MF Transactions"] is None:
@@ -681,128 +643,14 @@ class Main(QMainWindow):
             QMessageBox.critical(self, "Critical Error", err_msg)
     
     def generate_report(self):
-        try:
-            self.log("Generating report...")
-
-            desktop = os.path.join(os.path.expanduser('~'), 'Desktop')
-            holding_folder = os.path.join(desktop, "Holding")
-            ledger_folder = os.path.join(desktop, "Ledger")
-            client_reports_folder = os.path.join(desktop, "client_reports")
-            client_xirr_folder = os.path.join(desktop, "xirr_reports")
-
-            for folder in [holding_folder, ledger_folder, client_reports_folder, client_xirr_folder]:
-                if not os.path.exists(folder):
-                    os.makedirs(folder)
-
-            holding_csv_files = [f for f in os.listdir(holding_folder) if f.endswith('.csv')]
-
-            if not holding_csv_files:
-                QMessageBox.warning(self, "Error", "No CSV files found in Holding folder.")
+        def generated(res):
+            if res is None:
+                QMessageBox.warning(self, "Error", "No Excel files found in Holding folder.")
                 return
 
-            processed_count = 0
-            skipped_count = 0
-
-            for holding_csv in holding_csv_files:
-                try:
-                    base_filename = os.path.splitext(holding_csv)[0]
-
-                    ledger_file = os.path.join(ledger_folder, f"{base_filename}_Ledger.csv")
-    
-                    if not os.path.exists(ledger_file):
-                        for ext in ['.csv', '.xlsx', '.xls']:
-                            potential_file = os.path.join(ledger_folder, f"{base_filename}_Ledger{ext}")
-                            if os.path.exists(potential_file):
-                                ledger_file = potential_file
-                                break
-        
-                        if not os.path.exists(ledger_file):
-                            for ext in ['.csv', '.xlsx', '.xls']:
-                                potential_file = os.path.join(ledger_folder, base_filename + ext)
-                                if os.path.exists(potential_file):
-                                    ledger_file = potential_file
-                                    break
-
-                    if not os.path.exists(ledger_file):
-                        self.log(f"Skipped {holding_csv}: No matching file in Ledger folder")
-                        skipped_count += 1
-                        continue
-
-                    if not ledger_file.endswith('.csv'):
-                        try:
-                            try:
-                                ledger_df = pd.read_excel(ledger_file)
-                            except Exception as e1:
-                                try:
-                                    ledger_df = pd.read_excel(ledger_file, engine='openpyxl')
-                                except Exception as e2:
-                                    ledger_df = pd.read_excel(ledger_file, engine='xlrd')
-        
-                            ledger_csv_file = os.path.join(ledger_folder, f"{base_filename}_Ledger.csv")
-                            ledger_df.to_csv(ledger_csv_file, index=False)
-                            ledger_file = ledger_csv_file
-        
-                        except Exception as e:
-                            self.log(f"Failed to convert {ledger_file} to CSV: {str(e)}")
-                            skipped_count += 1
-                            continue
-
-                    holding_df = pd.read_csv(os.path.join(holding_folder, holding_csv))
-                    ledger_df = pd.read_csv(ledger_file)
-        
-                    xirr_df = None
-                    try:
-                        info_row = holding_df[holding_df['Unnamed: 0'] == 'Client Equity Code/UCID/Name'].index[0]
-                        c_info = str(holding_df.iloc[info_row, 1]).strip()
-                        client_code = c_info.split('/')[0].strip()
-            
-                        xirr_files = [f for f in os.listdir(client_xirr_folder) if f.endswith(('.csv', '.xlsx', '.xls'))]
-                        xirr_file = None
-            
-                        for file in xirr_files:
-                            if client_code in file:
-                                xirr_file = os.path.join(client_xirr_folder, file)
-                                break
-            
-                        if xirr_file:
-                            if xirr_file.endswith('.csv'):
-                                xirr_df = pd.read_csv(xirr_file)
-                            else:
-                                try:
-                                    xirr_df = pd.read_excel(xirr_file)
-                                except Exception as e1:
-                                    try:
-                                        xirr_df = pd.read_excel(xirr_file, engine='openpyxl')
-                                    except Exception as e2:
-                                        xirr_df = pd.read_excel(xirr_file, engine='xlrd')
-                
-                            self.log(f"Found XIRR file for {client_code}: {os.path.basename(xirr_file)}")
-                        else:
-                            self.log(f"No XIRR file found for client code: {client_code}")
-                
-                    except Exception as e:
-                        self.log(f"Error processing XIRR for {holding_csv}: {str(e)}")
-
-                    output_file = os.path.join(client_reports_folder, f"{base_filename}_report.pdf")
-                
-                    try:
-                        pdf_path = report_gen(holding_df, ledger_df, xirr_df, output_path=output_file)
-                    
-                        generated_path = os.path.abspath(pdf_path)
-                    
-                        if os.path.exists(generated_path) and os.path.getsize(generated_path) > 0:
-                            processed_count += 1
-                            self.log(f"Generated report for {base_filename} at {generated_path}")
-                        else:
-                            self.log(f"Failed to generate report for {base_filename} or file is empty. Expected at: {generated_path}")
-                            skipped_count += 1
-                    except Exception as e:
-                        self.log(f"Error in report_gen for {base_filename}: {str(e)}")
-                        skipped_count += 1
-
-                except Exception as e:
-                    self.log(f"Error processing {holding_csv}: {str(e)}")
-                    skipped_count += 1
+            processed_count = res['processed']
+            skipped_count = res['skipped']
+            client_reports_folder = res['folder']
 
             if processed_count > 0:
                 self.sum_lbl.setText(
@@ -819,115 +667,27 @@ class Main(QMainWindow):
                 self.log("Failed to generate any client reports")
                 QMessageBox.warning(self, "Error", "Failed to generate any client reports")
 
-        except Exception as e:
-            error_details = traceback.format_exc()
-            print(f"Report generation error: {error_details}")
-            self.log(f"Report generation error: {str(e)}")
-            QMessageBox.critical(self, "Error", f"Failed to generate reports: {str(e)}")
-
-    def generate_excel(self, auto_mode=False, single_client=None):
-        try:
-            self.log("Generating Excel files from CSV files...")
-            folder = self.dl_folder  
-            ledger_folder = os.path.join(os.path.dirname(folder), "Ledger")  
-
-            desktop = os.path.join(os.path.expanduser('~'), 'Desktop')
-            excel_reports_folder = os.path.join(desktop, "excel_reports")
-            if not os.path.exists(excel_reports_folder):
-                os.makedirs(excel_reports_folder)
-
-            holdings_files = [os.path.join(folder, f) for f in os.listdir(folder) 
-                        if f.endswith('.csv')]
-
-            if single_client:
-                holdings_files = [f for f in holdings_files if single_client in os.path.basename(f)]
-                self.log(f"Filtered to {len(holdings_files)} holdings files for client {single_client}")
+        self.run_job(jobs.generate_reports, workers=os.cpu_count(), done=generated, fail="Failed to generate reports")
 
-            if not holdings_files:
-                self.log("No matching CSV files found in Holdings folder.")
-                QMessageBox.warning(self, "Error", "No matching CSV files found in Holdings folder.")
+    def generate_excel(self, auto_mode=False, single_client=None, frames=None):
+        def generated(res):
+            if not res['total']:
+                QMessageBox.warning(self, "Error", "No matching Excel files found in Holdings folder.")
                 return
-        
-            ledger_files = {}
-            if os.path.exists(ledger_folder):
-                for f in os.listdir(ledger_folder):
-                    if f.endswith('_Ledger.csv'):
-                        client_code = f.replace('_Ledger.csv', '')
-                        if not single_client or single_client == client_code:
-                            ledger_files[client_code] = os.path.join(ledger_folder, f)
-                
-                if single_client and single_client not in ledger_files:
-                    self.log(f"Warning: No ledger file found for client {single_client}")
-            else:
-                self.log("Ledger folder not found. Only Holdings data will be processed.")
 
-            processed_count = 0
-            for holdings_csv in holdings_files:
-                try:
-                    base_filename = os.path.splitext(os.path.basename(holdings_csv))[0]
-                    client_code = base_filename  
-            
-                    df_holdings = pd.read_csv(holdings_csv)
-                    if df_holdings.empty:
-                        print(f"Skipping empty holdings file: {holdings_csv}")
-                        continue
-            
-                    df_ledger = None
-                    if client_code in ledger_files:
-                        ledger_csv = ledger_files[client_code]
-                        try:
-                            df_ledger = pd.read_csv(ledger_csv)
-                            print(f"Found matching ledger file for {client_code}: {ledger_csv}")
-                        except Exception as le:
-                            print(f"Error reading ledger file {ledger_csv}: {str(le)}")
-                    else:
-                        print(f"No matching ledger file found for client code: {client_code}")
-            
-                    output_file = excel_generator(df_holdings, df_ledger)  
-        
-                    if output_file:
-                        if os.path.exists(output_file):
-                            dest_file = os.path.join(excel_reports_folder, f"{base_filename}_report.xlsx")
-                            shutil.move(output_file, dest_file)
-                            processed_count += 1
-                        else:
-                            print(f"Output file not found: {output_file}")
-                    else:
-                        try:
-                            potential_dirs = [os.getcwd(), os.path.dirname(holdings_csv), desktop]
-                            newest_file = None
-                            newest_time = 0
-                            for check_dir in potential_dirs:
-                                excel_files = glob.glob(os.path.join(check_dir, "*.xlsx"))
-                                for file in excel_files:
-                                    file_time = os.path.getmtime(file)
-                        
-                                    if time.time() - file_time < 10 and file_time > newest_time:  
-                                        newest_file = file
-                                        newest_time = file_time
-                
-                            if newest_file:
-                                dest_file = os.path.join(excel_reports_folder, f"{base_filename}_report.xlsx")
-                                shutil.copy2(newest_file, dest_file)
-                                processed_count += 1
-                                print(f"Processed: {holdings_csv} → {dest_file} (found recent file)")
-                            else:
-                                print(f"Could not locate output file for {holdings_csv}")
-                        except Exception as inner_e:
-                            print(f"Error locating output for {holdings_csv}: {str(inner_e)}")
-            
-                except Exception as e:
-                    print(f"Error processing {holdings_csv}: {str(e)}")
+            processed_count = res['processed']
+            total = res['total']
+            excel_reports_folder = res['folder']
 
             if processed_count > 0:
-                self.log(f"Generated {processed_count}/{len(holdings_files)} Excel reports in {excel_reports_folder}")
+                self.log(f"Generated {processed_count}/{total} Excel reports in {excel_reports_folder}")
             
                 if single_client:
                     success_message = (f"Internal Report generated for client {single_client}!\n\n"
                                 f"Report location: {excel_reports_folder}")
                 else:
                     success_message = (f"Complete workflow executed successfully!\n\n"
-                                f"Files processed: {processed_count}/{len(holdings_files)}\n"
+                                f"Files processed: {processed_count}/{total}\n"
                                 f"Reports location: {excel_reports_folder}")
             
                 if auto_mode:
@@ -946,56 +706,11 @@ class Main(QMainWindow):
                     self.log("Failed to generate any Excel reports")
                     QMessageBox.warning(self, "Error", "Failed to generate any Excel reports")
 
-        except Exception as e:
-            error_details = traceback.format_exc()
-            print(f"Excel generation error: {error_details}")
-            QMessageBox.critical(self, "Error", f"Failed to generate Excel files: {str(e)}")
-
-    def xirr_workflow(self):
-        from_date = self.from_date.date().toString("dd/MM/yyyy") if self.use_date_range.isChecked() else None
-        to_date = self.to_date.date().toString("dd/MM/yyyy") if self.use_date_range.isChecked() else None
-
-        codes, error = self._get_client_codes()
-        if error:
-            QMessageBox.critical(self, "Error", error)
-            return
-
-        self.log(f"Downloading MF transactions for {len(codes)} clients...")
-        success, fails = self.scraper.process_all_clients_mf_trans(codes, self.update_sum, 
-                                                                 from_date=from_date, to_date=to_date)
-    
-        if success == 0:
-            QMessageBox.warning(self, "Warning", "No MF transactions downloaded")
-            return
-
-        mf_folder = self.mf_folder
-        for fname in os.listdir(mf_folder):
-            if fname.endswith(('.xlsx', '.xls')):
-                csv_path = conv(os.path.join(mf_folder, fname))
-                if csv_path:
-                    print(f"Converted {fname} to CSV")
-    
-        try:
-            init_val = float(self.init_portfolio_val_input.text().replace('₹','').replace(',',''))
-            curr_val = float(self.cur_portfolio_val_input.text().replace('₹','').replace(',',''))
-        except:
-            QMessageBox.warning(self, "Error", "Invalid portfolio values")
-            return
-
-        try:
-            results = proc(input_dir=mf_folder, 
-                          init_val=init_val,
-                          curr_val=curr_val)
-        
-            if results:
-                QMessageBox.information(self, "Success", 
-                    f"XIRR reports generated:\n{'\n'.join(results)}")
-            else:
-                QMessageBox.warning(self, "Warning", "XIRR calculation completed with no results")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"XIRR failed: {str(e)}")
+        self.run_job(jobs.generate_excel, self.dl_folder, single_client=single_client, frames=frames,
+                     done=generated, fail="Failed to generate Excel files")
 
     def gen_xirr(self):
+        import pandas as pd
         try:
             manual_code = self.xirr_code_input.text().strip()
             
@@ -1021,8 +736,8 @@ class Main(QMainWindow):
                 try:
                     curr_val = float(self.cur_portfolio_val_input.text().replace('₹','').replace(',',''))
                 except:
-                    curr_val = init_val 
-                    self.log(f"Using initial value as current value: {curr_val}")
+                    curr_val = None
+                    self.log("Using current value from consolidated holdings")
             
                 reply = QMessageBox.question(
                     self,
@@ -1032,35 +747,28 @@ class Main(QMainWindow):
                     QMessageBox.StandardButton.Yes
                 )
             
-                if reply == QMessageBox.StandardButton.Yes:
-                    self.status_lbl.setText(f"Downloading MF transactions for {manual_code}...")
-                    success = self.scraper.search_client_mf_trans(manual_code, from_date, to_date)
-                
-                    if success:
-                        self.log(f"✅ Successfully downloaded MF transactions for {manual_code}")
-                        self._convert_mf_transaction_file(f"{manual_code}_MFTrans.xlsx")
-                    else:
-                        self.log(f"❌ Failed to download MF transactions for {manual_code}")
+                def generated(res):
+                    if res['downloaded'] is False:
                         QMessageBox.warning(self, "Warning", f"Failed to download MF transactions for {manual_code}")
                 
-                self.status_lbl.setText(f"Generating XIRR for {manual_code}...")
-                out_file = proc(code=manual_code, init_val=init_val, curr_val=curr_val, start_date=start_date)
+                    out_file = res['out_file']
+                    if out_file:
+                        self.status_lbl.setText(f"XIRR report generated for {manual_code}")
+                        QMessageBox.information(
+                            self, 
+                            "XIRR Report Generated", 
+                            f"XIRR report has been generated for {manual_code}.\n\nSaved to: {out_file}"
+                        )
+                    else:
+                        QMessageBox.warning(
+                            self, 
+                            "Warning", 
+                            f"Failed to generate XIRR report for {manual_code}. Check if required files exist."
+                        )
                 
-                if out_file:
-                    self.log(f"✅ Successfully generated XIRR report for {manual_code}")
-                    self.status_lbl.setText(f"XIRR report generated for {manual_code}")
-                    QMessageBox.information(
-                        self, 
-                        "XIRR Report Generated", 
-                        f"XIRR report has been generated for {manual_code}.\n\nSaved to: {out_file}"
-                    )
-                else:
-                    self.log(f"❌ Failed to generate XIRR report for {manual_code}")
-                    QMessageBox.warning(
-                        self, 
-                        "Warning", 
-                        f"Failed to generate XIRR report for {manual_code}. Check if required files exist."
-                    )
+                self.run_job(jobs.manual_xirr, self.scraper, self.mf_folder, manual_code, init_val, curr_val, start_date,
+                             download=reply == QMessageBox.StandardButton.Yes, from_date=from_date, to_date=to_date,
+                             done=generated, fail="XIRR generation failed")
                 return
 
 
@@ -1154,49 +862,20 @@ class Main(QMainWindow):
             )
 
             if reply == QMessageBox.StandardButton.Yes:
-                self.status_lbl.setText(f"Downloading MF transactions for {len(codes)} clients...")
-                success, fails = self.scraper.process_all_clients_mf_trans(codes, self.update_sum, from_date, to_date)
-                self.log(f"Download complete: {success} succeeded, {len(fails)} failed")
-            
-                if fails:
-                    self.log(f"Failed clients: {', '.join(fails)}")
-                    QMessageBox.warning(self, "Warning", f"Failed to download MF transactions for {len(fails)} clients")
-            
-                self._convert_mf_transactions()
+                default_init_val = None
+                try:
+                    default_init_val = float(self.init_portfolio_val_input.text().replace('₹','').replace(',',''))
+                except:
+                    default_init_val = 100000
             
-                self.status_lbl.setText("Generating XIRR reports...")
+                default_start_date = self.start_date.date().toPyDate()
             
-                try:
-                    out_files = []
-                
-                    default_init_val = None
-                    try:
-                        default_init_val = float(self.init_portfolio_val_input.text().replace('₹','').replace(',',''))
-                    except:
-                        default_init_val = 100000
-                
-                    default_start_date = self.start_date.date().toPyDate()
+                def generated(res):
+                    fails = res['fails']
+                    out_files = res['out_files']
                 
-                    for code in codes:
-                        if code in fails:
-                            self.log(f"Skipping failed client: {code}")
-                            continue
-                        
-                        client = client_data[code]
-                        init_val = client['init_val'] if client['init_val'] is not None else default_init_val
-                        start_date = client['start_date'] if client['start_date'] is not None else default_start_date
-                    
-                        self.log(f"Processing XIRR for {code}: init_val={init_val}, start_date={start_date}")
-                    
-                        try:
-                            report_file = proc(code=code, init_val=init_val, start_date=start_date)
-                            if report_file:
-                                out_files.append(report_file)
-                                self.log(f"Generated XIRR report for {code}: {report_file}")
-                            else:
-                                self.log(f"Failed to generate XIRR report for {code}")
-                        except Exception as client_error:
-                            self.log(f"Error processing XIRR for {code}: {str(client_error)}")
+                    if fails:
+                        QMessageBox.warning(self, "Warning", f"Failed to download MF transactions for {len(fails)} clients")
                 
                     if out_files and len(out_files) > 0:
                         self.log(f"✅ Successfully generated {len(out_files)} XIRR reports")
@@ -1218,13 +897,11 @@ class Main(QMainWindow):
                             "Warning", 
                             "No XIRR reports were generated. Please check if required files exist."
                         )
-                except Exception as e:
-                    self.log(f"❌ Error generating XIRR reports: {str(e)}")
-                    QMessageBox.critical(
-                        self, 
-                        "Error", 
-                        f"Failed to generate XIRR reports: {str(e)}"
-                    )
+            
+                self.status_lbl.setText(f"Downloading MF transactions for {len(codes)} clients...")
+                self.run_job(jobs.batch_xirr, self.scraper, self.mf_folder, codes, client_data,
+                             default_init_val, default_start_date, from_date=from_date, to_date=to_date,
+                             done=generated, fail="Failed to generate XIRR reports")
             
         except Exception as e:
             self.log(f"Error in gen_xirr: {str(e)}")
@@ -1238,52 +915,10 @@ class Main(QMainWindow):
                 f"3. Verify date formats"
             )
      
-    def process_single_xirr(self, client_code):
-        try:
-            file_path, _ = QFileDialog.getOpenFileName(self, "Select Client Data File", 
-                                                       "", "Excel Files (*.xlsx *.xls)")
-            if not file_path:
-                return
-
-            df = pd.read_excel(file_path)
-            code_col = next(col for col in df.columns if 'client' in col.lower() or 'code' in col.lower())
-            init_val_col = next(col for col in df.columns if 'initial' in col.lower() and 'value' in col.lower())
-            start_date_col = next(col for col in df.columns if 'start date' in col.lower())
-            
-            client_data = df[df[code_col] == client_code].iloc[0]
-            init_val = client_data[init_val_col]
-            start_date = pd.to_datetime(client_data[start_date_col]).date()
-            
-            consolidated_path = os.path.join(self.dl_folder, "Consolidated_Holdings.xlsx")
-            if not os.path.exists(consolidated_path):
-                QMessageBox.critical(self, "Error", "Consolidated_Holdings.xlsx not found!")
-                return
-                
-            consolidated_df = pd.read_excel(consolidated_path)
-            curr_val_col = next(col for col in consolidated_df.columns if 'portfolio value' in col.lower())
-            curr_val = consolidated_df.loc[consolidated_df[code_col] == client_code, curr_val_col].values[0]
-            
-            reply = QMessageBox.question(
-                self,
-                "Download MF Transactions",
-                f"Do you want to download MF transactions for {client_code}?",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                QMessageBox.StandardButton.Yes
-            )
-            
-            if reply == QMessageBox.StandardButton.Yes:
-                self.status_lbl.setText(f"Downloading MF transactions for {client_code}...")
-                success, _ = self.scraper.process_all_clients_mf_trans([client_code], self.update_sum)
-                self._convert_mf_excel_to_csv()
-                self._convert_ledger_files()
-            
-            result = proc(cl_code=client_code, init_val=init_val, curr_val=curr_val, start_date=start_date)
-            QMessageBox.information(self, "Success", f"XIRR report generated:\n{result}")
-
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Single client XIRR failed: {str(e)}") 
-     
     def closeEvent(self, event):
+        if self.worker is not None:
+            self.worker.cancel()
+        self.pool.waitForDone()
         if self.scraper:
             self.scraper.quit()
         event.accept()
\ No newline at end of file
@@ -0,0 +1,57 @@
+import threading
+import traceback
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+class Cancelled(Exception):
+    pass
+
+class WorkerSignals(QObject):
+    message = pyqtSignal(str)
+    progress = pyqtSignal(int, int, str)
+    downloaded = pyqtSignal(int, int, list)
+    result = pyqtSignal(object)
+    error = pyqtSignal(str)
+    finished = pyqtSignal(bool)
+
+class Worker(QRunnable):
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.stop = threading.Event()
+        self.signals = WorkerSignals()
+        self.setAutoDelete(False)
+
+    @property
+    def cancelled(self):
+        return self.stop.is_set()
+
+    def cancel(self):
+        self.stop.set()
+
+    def check(self):
+        if self.stop.is_set():
+            raise Cancelled()
+
+    def log(self, msg):
+        self.signals.message.emit(str(msg))
+
+    def step(self, done, total, msg=''):
+        self.signals.progress.emit(done, total, msg)
+
+    def downloaded(self, success, total, fails):
+        self.signals.downloaded.emit(success, total, list(fails))
+
+    def run(self):
+        try:
+            res = self.fn(self, *self.args, **self.kwargs)
+        except Cancelled:
+            pass
+        except Exception as e:
+            print(f"Worker error: {traceback.format_exc()}")
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.result.emit(res)
+        finally:
+            self.signals.finished.emit(self.stop.is_set())
@@ -0,0 +1,126 @@
+import os
+import hashlib
+import pickle
+import pandas as pd
+
+VERSION = 1
+
+def cache_dir():
+    path = os.environ.get('PORTFOLIO_REVIEW_CACHE')
+    if not path:
+        path = os.path.join(os.path.expanduser('~'), '.portfolio_review', 'cache')
+    return path
+
+def cache_cap():
+    try:
+        return int(float(os.environ.get('PORTFOLIO_REVIEW_CACHE_MB', 512)) * 1024 * 1024)
+    except ValueError:
+        return 512 * 1024 * 1024
+
+def enabled():
+    return os.environ.get('PORTFOLIO_REVIEW_CACHE', '').lower() not in ('0', 'off', 'false', 'no')
+
+def cache_key(path, kw):
+    st = os.stat(path)
+    raw = repr((VERSION, pd.__version__, os.path.abspath(path), st.st_size, st.st_mtime_ns,
+                sorted(kw.items())))
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+def parse_file(path, **kw):
+    if path.lower().endswith('.csv'):
+        return pd.read_csv(path, **kw)
+    return pd.read_excel(path, **kw)
+
+def evict(folder, cap=None):
+    cap = cache_cap() if cap is None else cap
+    entries = []
+    total = 0
+    try:
+        for e in os.scandir(folder):
+            if e.name.endswith('.pkl'):
+                st = e.stat()
+                entries.append((st.st_mtime, st.st_size, e.path))
+                total += st.st_size
+    except OSError:
+        return
+
+    entries.sort()
+    for _, size, path in entries:
+        if total <= cap:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= size
+
+def read_frame(path, **kw):
+    if not enabled():
+        return parse_file(path, **kw)
+
+    try:
+        folder = cache_dir()
+        entry = os.path.join(folder, cache_key(path, kw) + '.pkl')
+    except OSError:
+        return parse_file(path, **kw)
+
+    try:
+        with open(entry, 'rb') as f:
+            df = pickle.load(f)
+        os.utime(entry)
+        return df
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"dropping unreadable cache entry {entry}: {e}")
+        try:
+            os.remove(entry)
+        except OSError:
+            pass
+
+    df = parse_file(path, **kw)
+
+    try:
+        os.makedirs(folder, exist_ok=True)
+        tmp = f"{entry}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, entry)
+        evict(folder)
+    except Exception as e:
+        print(f"could not cache {path}: {e}")
+
+    return df
+
+def clear():
+    folder = cache_dir()
+    if not os.path.isdir(folder):
+        return 0
+
+    n = 0
+    for name in os.listdir(folder):
+        if name.endswith(('.pkl', '.tmp')):
+            try:
+                os.remove(os.path.join(folder, name))
+                n += 1
+            except OSError:
+                pass
+    return n
+
+def csv_debug():
+    return os.environ.get('PORTFOLIO_REVIEW_CSV', '').lower() not in ('', '0', 'off', 'false', 'no')
+
+def export_csv(df, path):
+    op = os.path.splitext(path)[0] + '.csv'
+    try:
+        df.to_csv(op, index=False)
+        return op
+    except Exception as e:
+        print(f"error exporting {op}: {e}")
+        return None
+
+def load_source(path, **kw):
+    df = read_frame(path, **kw)
+    if csv_debug() and not path.lower().endswith('.csv'):
+        export_csv(df, path)
+    return df
@@ -1,6 +1,60 @@
 import numpy as np
+from functools import lru_cache
+
+NUM_FMT = '#,##,##0'
+IST_CACHE = 4096
 
 def format_num(val):
     if isinstance(val, (int, float)) and not np.isnan(val):
         return round(val, 1)
-    return val
\ No newline at end of file
+    return val
+
+def group_in(digits):
+    if len(digits) <= 3:
+        return digits
+    
+    head, tail = digits[:-3], digits[-3:]
+    lead = len(head) % 2
+    parts = [head[:lead]] if lead else []
+    parts += [head[i:i + 2] for i in range(lead, len(head), 2)]
+    return ','.join(parts) + ',' + tail
+
+@lru_cache(maxsize=IST_CACHE)
+def fmt_in(number, decimal_places=0):
+    try:
+        num = round(float(number), decimal_places)
+        
+        negative = num < 0
+        num = abs(num)
+        
+        result = group_in(str(int(num)))
+        
+        if decimal_places > 0:
+            result = result + "." + f"{num % 1:.{decimal_places}f}"[2:]
+        
+        if negative:
+            result = "-" + result
+        
+        return result
+    
+    except Exception:
+        return str(number)
+
+def ist(number, decimal_places=0):
+    try:
+        return fmt_in(number, decimal_places)
+    except TypeError:
+        return str(number)
+
+def ist_col(values, decimal_places=0, blank_zero=True):
+    v = np.asarray(values)
+    if v.dtype.kind not in 'iuf':
+        return ['' if x != x or (blank_zero and not x) else ist(x, decimal_places) for x in v.tolist()]
+    
+    uniq, inv = np.unique(v, return_inverse=True)
+    out = np.array([ist(u, decimal_places) for u in uniq.tolist()] + [''], dtype=object)
+    v, inv = v.reshape(-1), inv.reshape(-1)
+    blank = np.isnan(v) if v.dtype.kind == 'f' else np.zeros(len(v), dtype=bool)
+    if blank_zero:
+        blank |= v == 0
+    return out[np.where(blank, len(uniq), inv)].tolist()
@@ -0,0 +1,232 @@
+import os
+from bisect import bisect_left, bisect_right
+import numpy as np
+import pandas as pd
+from utils.cache import load_source
+
+INFO = 'Client Equity Code/UCID/Name'
+MARKERS = ('Equity:-', 'Mutual Fund:-', 'FnO:-', 'Bond:-')
+EQUITY_COLS = (1, 2, 4, 5, 10)
+MF_COLS = (2, 3, 5, 6, 12)
+NEXT = {'Equity:-': 'Mutual Fund:-', 'Mutual Fund:-': 'FnO:-', 'FnO:-': 'Bond:-'}
+
+def holdings_files(folder):
+    files = []
+    for f in sorted(os.listdir(folder)):
+        if f.endswith(('.xlsx', '.xls')) and not f.startswith('~$') and 'Consolidated' not in f:
+            files.append(os.path.join(folder, f))
+    return files
+
+def load_holdings(path):
+    return load_source(path)
+
+class Section:
+    __slots__ = ('label', 'marker', 'header', 'start', 'end', 'total')
+    
+    def __init__(self, label, marker, end, total):
+        self.label = label
+        self.marker = marker
+        self.header = marker + 1
+        self.start = marker + 2
+        self.end = end
+        self.total = total
+
+class HoldingsSheet:
+    def __init__(self, df):
+        self.rows = len(df)
+        self.markers = {}
+        self.totals = []
+        self.blanks = []
+        
+        col = df.iloc[:, 0].tolist() if df.shape[1] else []
+        for i, v in enumerate(col):
+            if pd.isna(v) or v == '':
+                self.blanks.append(i)
+                continue
+            if not isinstance(v, str):
+                continue
+            
+            label = v.strip()
+            if label == INFO or label in MARKERS:
+                self.markers.setdefault(label, i)
+            elif 'TOTAL:' in label.upper():
+                self.totals.append(i)
+        
+        self.client_info = None
+        info_row = self.markers.get(INFO)
+        if info_row is not None and df.shape[1] > 1:
+            self.client_info = str(df.iloc[info_row, 1]).strip()
+        
+        self.sections = {}
+        for label in MARKERS:
+            marker = self.markers.get(label)
+            if marker is None:
+                continue
+            
+            nxt = self.markers.get(NEXT.get(label))
+            if label == 'Bond:-':
+                i = bisect_left(self.blanks, marker + 2)
+                end = self.blanks[i] if i < len(self.blanks) else self.rows
+            elif nxt is not None:
+                end = nxt - 4
+            else:
+                end = None
+            
+            i = bisect_right(self.totals, marker + 1)
+            total = self.totals[i] if i < len(self.totals) else None
+            
+            self.sections[label] = Section(label, marker, end, total)
+    
+    def __getitem__(self, label):
+        return self.sections[label]
+    
+    def get(self, label):
+        return self.sections.get(label)
+    
+    @property
+    def client_code(self):
+        return self.client_info.split('/')[0].strip()
+    
+    @property
+    def client_name(self):
+        return self.client_info.split('/')[-1].strip()
+
+def num_col(col):
+    v = pd.to_numeric(col, errors='coerce').to_numpy()
+    if v.dtype.kind not in 'iuf':
+        v = v.astype(float)
+    return v
+
+class ClientHeader:
+    __slots__ = ('info', 'code', 'ucid', 'name')
+    
+    def __init__(self, info):
+        parts = info.split('/')
+        self.info = info
+        self.code = parts[0].strip()
+        self.ucid = parts[1].strip() if len(parts) > 2 else ''
+        self.name = parts[-1].strip()
+
+class Positions:
+    __slots__ = ('name_col', 'asset_col', 'names', 'assets', 'values', 'header')
+    
+    def __init__(self, name_col, names, values, header=None, asset_col=None, assets=None):
+        self.name_col = name_col
+        self.asset_col = asset_col
+        self.names = names
+        self.assets = assets
+        self.values = values
+        self.header = header
+    
+    @classmethod
+    def from_block(cls, block, header, name_col, num_cols, asset_col=None):
+        names = pd.Categorical(block.iloc[:, name_col].to_numpy())
+        assets = None
+        if asset_col is not None:
+            assets = pd.Categorical(block.iloc[:, asset_col].to_numpy())
+        values = {c: num_col(block.iloc[:, c]) for c in num_cols}
+        return cls(name_col, names, values, header, asset_col, assets)
+    
+    def __len__(self):
+        return len(self.names)
+    
+    @property
+    def empty(self):
+        return len(self.names) == 0
+    
+    def contains(self, pat):
+        cats = pd.Series(self.names.categories, dtype=object)
+        hit = cats.str.contains(pat, na=False).to_numpy(dtype=bool)
+        codes = self.names.codes
+        return np.where(codes >= 0, hit[codes], False) if len(hit) else np.zeros(len(codes), dtype=bool)
+    
+    def asset_is(self, value):
+        if self.assets is None:
+            return np.zeros(len(self), dtype=bool)
+        return np.asarray(self.assets == value, dtype=bool)
+    
+    def take(self, mask):
+        assets = None if self.assets is None else self.assets[mask]
+        values = {c: v[mask] for c, v in self.values.items()}
+        return Positions(self.name_col, self.names[mask], values, self.header, self.asset_col, assets)
+    
+    def remap(self, name_col, cols, asset_col=None):
+        values = {cols[c]: v for c, v in self.values.items() if c in cols}
+        return Positions(name_col, self.names, values, self.header, asset_col, None)
+    
+    def append(self, other):
+        names = pd.Categorical(np.concatenate([np.asarray(self.names, dtype=object),
+                                               np.asarray(other.names, dtype=object)]))
+        assets = None
+        if self.asset_col is not None:
+            mine = np.full(len(self), np.nan, dtype=object) if self.assets is None else np.asarray(self.assets, dtype=object)
+            theirs = np.full(len(other), np.nan, dtype=object) if other.assets is None else np.asarray(other.assets, dtype=object)
+            assets = pd.Categorical(np.concatenate([mine, theirs]))
+        values = {}
+        for c, v in self.values.items():
+            w = other.values.get(c)
+            if w is None:
+                w = np.full(len(other), np.nan)
+            values[c] = np.concatenate([v, w])
+        return Positions(self.name_col, names, values, self.header, self.asset_col, assets)
+    
+    def col(self, c):
+        return self.values[c]
+    
+    def total(self, c, default=0):
+        v = self.values[c]
+        if v.dtype.kind != 'f':
+            return v.sum() if len(v) else default
+        nan = np.isnan(v)
+        if nan.all():
+            return default
+        if not nan.any() and (v == np.trunc(v)).all():
+            return v.astype(np.int64).sum()
+        return np.nansum(v)
+    
+    def rows(self):
+        names = np.asarray(self.names, dtype=object)
+        assets = None if self.assets is None else np.asarray(self.assets, dtype=object)
+        values = {c: v.tolist() for c, v in self.values.items()}
+        for i in range(len(names)):
+            row = {c: v[i] for c, v in values.items()}
+            row[self.name_col] = names[i]
+            if assets is not None:
+                row[self.asset_col] = assets[i]
+            yield row
+
+class ClientHoldings:
+    __slots__ = ('header', 'equity', 'mf', 'bond')
+    
+    def __init__(self, header, equity, mf, bond):
+        self.header = header
+        self.equity = equity
+        self.mf = mf
+        self.bond = bond
+    
+    @classmethod
+    def from_frame(cls, df, sheet=None):
+        if sheet is None:
+            sheet = HoldingsSheet(df)
+        
+        def block(label):
+            sec = sheet[label]
+            data = df.iloc[sec.start:sec.end]
+            data = data[data.iloc[:, 0] != 'Total:']
+            return data, df.iloc[sec.header].tolist()
+        
+        eq_data, eq_header = block('Equity:-')
+        mf_data, mf_header = block('Mutual Fund:-')
+        bond_data, bond_header = block('Bond:-')
+        
+        return cls(
+            ClientHeader(sheet.client_info),
+            Positions.from_block(eq_data, eq_header, 0, EQUITY_COLS),
+            Positions.from_block(mf_data, mf_header, 1, MF_COLS, asset_col=0),
+            Positions.from_block(bond_data, bond_header, 0, EQUITY_COLS),
+        )
+
+def as_holdings(df, sheet=None):
+    if isinstance(df, ClientHoldings):
+        return df
+    return ClientHoldings.from_frame(df, sheet)
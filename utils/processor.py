@@ -1,6 +1,94 @@
 import os
+import re
+import json
+import hashlib
 import numpy as np
 import pandas as pd
+from utils.utils import process_pool
+from utils.holdings import HoldingsSheet, holdings_files, load_holdings
+
+MANIFEST_VERSION = 1
+
+BUCKETS = ("eq", "debt", "gold", "cash")
+
+EQUITY_RULES = [
+    (("GILT BEES", "GILT", "G-SEC", "GSEC", "LONG TERM GILT", "LTGILTBEES"), ("debt", "cash")),
+    (("BOND ETF",), ("debt",)),
+    (("LONGTERM GILT", "5 YR BENCHMARK GSEC", "LIQUID BEES"), ("debt", "cash")),
+    (("GOLD BEES",), ("gold",)),
+    (None, ("eq",)),
+]
+
+BOND_RULES = [
+    (("SGB", "GOLD", "GOLDBOND", "SOVEREIGN"), ("gold", "cash")),
+    (("GOI",), ("debt", "cash")),
+    (("TAX FREE", "NCD", "NHAI"), ("debt",)),
+]
+
+MF_RULES = [
+    ("BALANCED", None, ("eq",)),
+    ("CASH", None, ("debt", "cash")),
+    ("EQUITY", None, ("eq",)),
+    ("DEBT", None, ("debt",)),
+    ("DEBT", ("GILT",), ("cash",)),
+]
+
+def kw_re(keys):
+    if keys is None:
+        return None
+    return re.compile('|'.join(re.escape(k) for k in keys))
+
+SECTION_RULES = {
+    "Equity": [(kw_re(keys), buckets) for keys, buckets in EQUITY_RULES],
+    "Bond": [(kw_re(keys), buckets) for keys, buckets in BOND_RULES],
+}
+
+MF_MATCH = [(asset, kw_re(keys), buckets) for asset, keys, buckets in MF_RULES]
+
+def rules_digest():
+    rules = [EQUITY_RULES, BOND_RULES, MF_RULES]
+    return hashlib.sha1(json.dumps(rules).encode()).hexdigest()
+
+def upper_col(df, col):
+    if col is None or col not in df.columns:
+        return pd.Series([""] * len(df), dtype=object)
+    return pd.Series(np.asarray(df[col], dtype=str), dtype=object).str.upper()
+
+def add_mask(masks, buckets, m):
+    for b in buckets:
+        masks[b] = masks[b] | m if b in masks else m
+
+def rule_masks(text, rules):
+    taken = np.zeros(len(text), dtype=bool)
+    masks = {}
+    for rx, buckets in rules:
+        m = ~taken
+        if rx is not None:
+            m = m & text.str.contains(rx).to_numpy(dtype=bool)
+        taken |= m
+        add_mask(masks, buckets, m)
+    return masks
+
+def mf_masks(asset, scheme):
+    masks = {}
+    for name, rx, buckets in MF_MATCH:
+        m = (asset == name).to_numpy()
+        if rx is not None:
+            m = m & scheme.str.contains(rx).to_numpy(dtype=bool)
+        add_mask(masks, buckets, m)
+    return masks
+
+def bucket_sum(mv, mask):
+    if mask is None or not mask.any():
+        return 0
+    return np.cumsum(np.where(mask, mv, mv.dtype.type(0)))[-1]
+
+def file_sha1(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
 
 class Processor:
     def __init__(self, folder):
@@ -9,114 +97,71 @@ class Processor:
     def log(self, msg):
         print(msg)
     
-    def extract_section(self, df, section, req_cols):
-        start_idx = df[df.iloc[:, 0].astype(str).str.contains(section, na=False)].index
-        if start_idx.empty:
-            return pd.DataFrame(), 0
+    def extract_section(self, df, section, req_cols, sheet=None):
+        if sheet is None:
+            sheet = HoldingsSheet(df)
         
-        start = start_idx[0] + 1
-        if start >= len(df):
+        sec = sheet.get(section)
+        if sec is None or sec.header >= len(df):
             return pd.DataFrame(), 0
         
-        header = df.iloc[start].dropna().tolist()
+        header = df.iloc[sec.header].dropna().tolist()
         
         cols = {col: header.index(col) for col in req_cols if col in header}
         if len(cols) != len(req_cols):
             return pd.DataFrame(), 0
         
-        df_sec = df.iloc[start + 1:].reset_index(drop=True)
-        
-        total_idx = df_sec[df_sec.iloc[:, 0].astype(str).str.contains(
-            "TOTAL:", case=False, na=False)].index
+        stop = len(df)
         total = 0
         
-        if not total_idx.empty:
-            total_row = df_sec.loc[total_idx[0]]
+        if sec.total is not None:
+            total_row = df.iloc[sec.total]
             mv_idx = cols.get("Market Value")
             
             if mv_idx is not None and mv_idx < len(total_row):
                 total = pd.to_numeric(total_row.iloc[mv_idx], errors='coerce')
             
-            df_sec = df_sec.loc[:total_idx[0] - 1]
+            stop = sec.total
         
-        df_sec = df_sec.loc[:, list(cols.values())]
+        df_sec = df.iloc[sec.start:stop, list(cols.values())].reset_index(drop=True)
         df_sec.columns = req_cols
         
         return df_sec.dropna(how='all'), total
 
     def categorize(self, df, section, asset_col=None, scheme_col=None, instr_col=None, mv_col="Market Value"):
-        eq, debt, gold, cash = 0, 0, 0, 0
-        
         df[mv_col] = pd.to_numeric(df[mv_col], errors='coerce').fillna(0)
+        mv = df[mv_col].to_numpy()
+        
+        if section in SECTION_RULES:
+            masks = rule_masks(upper_col(df, instr_col), SECTION_RULES[section])
+        elif section == "Mutual Fund":
+            masks = mf_masks(upper_col(df, asset_col), upper_col(df, scheme_col))
+        else:
+            masks = {}
         
-        for _, row in df.iterrows():
-            mv = row.get(mv_col, 0)
-            
-            if section in ["Equity", "Bond"]:
-                instr = str(row.get(instr_col, "")).upper()
-                
-                if section == "Equity":
-                    gilt_keys = ["GILT BEES", "GILT", "G-SEC", "GSEC", "LONG TERM GILT", "LTGILTBEES"]
-                    
-                    if any(k in instr for k in gilt_keys):
-                        debt += mv
-                        cash += mv
-                    elif "BOND ETF" in instr:
-                        debt += mv
-                    elif any(k in instr for k in ["LONGTERM GILT", "5 YR BENCHMARK GSEC", "LIQUID BEES"]):
-                        debt += mv
-                        cash += mv
-                    elif "GOLD BEES" in instr:
-                        gold += mv
-                    else:
-                        eq += mv
-                
-                elif section == "Bond":
-                    if any(k in instr for k in ["SGB", "GOLD", "GOLDBOND", "SOVEREIGN"]):
-                        gold += mv
-                        cash += mv
-                    elif "GOI" in instr:
-                        debt += mv
-                        cash += mv
-                    elif any(k in instr for k in ["TAX FREE", "NCD", "NHAI"]):
-                        debt += mv
-            
-            elif section == "Mutual Fund":
-                asset = str(row.get(asset_col, "")).upper()
-                scheme = str(row.get(scheme_col, "")).upper()
-                
-                if asset == "BALANCED":
-                    eq += mv
-                elif asset == "CASH":
-                    debt += mv
-                    cash += mv
-                elif asset == "EQUITY":
-                    eq += mv
-                elif asset == "DEBT":
-                    if "GILT" in scheme:
-                        cash += mv
-                    debt += mv
-        
-        return eq, debt, gold, cash
-
-    def process_holdings_file(self, path):
+        return tuple(bucket_sum(mv, masks.get(b)) for b in BUCKETS)
+
+    def process_holdings_file(self, path, frame=None):
         try:
             self.log(f"📂 Processing file: {os.path.basename(path)}")
-            df = pd.read_excel(path, header=None, engine='openpyxl')
+            if frame is None:
+                frame = load_holdings(path)
             
-            if df.empty or df.shape[1] < 2:
+            if frame.empty or frame.shape[1] < 2:
                 self.log(f"⚠️ Skipping empty file: {path}")
                 return None
             
+            sheet = HoldingsSheet(frame)
+            df = frame.astype(object)
             df.fillna(0, inplace=True)
             
             if df.shape[1] < 13:
                 raise ValueError(f"Unexpected column count in {os.path.basename(path)}")
             
-            eq_df, eq_total = self.extract_section(df, "Equity:-", ["Instrument Name", "Market Value"])
+            eq_df, eq_total = self.extract_section(df, "Equity:-", ["Instrument Name", "Market Value"], sheet)
             mf_df, mf_total = self.extract_section(df, "Mutual Fund:-", 
-                ["Asset Type", "Scheme Name", "Market Value"])
-            bond_df, bond_total = self.extract_section(df, "Bond:-", ["Instrument Name", "Market Value"])
+                ["Asset Type", "Scheme Name", "Market Value"], sheet)
+            bond_df, bond_total = self.extract_section(df, "Bond:-", ["Instrument Name", "Market Value"], sheet)
             
             eq, debt, gold, cash = 0, 0, 0, 0
             
@@ -165,24 +210,130 @@ class Processor:
             
             self.log(f"✅ Processed {path}: Value: {port_val}, Equity: {eq}, Debt: {debt}, Gold: {gold}, Cash: {cash}")
             
-            return [os.path.basename(path).replace(".xlsx", ""), port_val, eq, debt, gold, cash]
+            return [os.path.splitext(os.path.basename(path))[0], port_val, eq, debt, gold, cash]
         
         except Exception as e:
             self.log(f"❌ Error processing {path}: {e}")
             return None
 
-    def process_holdings(self):
+    def hdng_pool(self, items, workers, chunk=None):
+        if not chunk:
+            chunk = max(1, -(-len(items) // (workers * 4)))
+        
+        chunks = [items[i:i + chunk] for i in range(0, len(items), chunk)]
+        results = []
+        
+        with process_pool(workers) as pool:
+            futs = [pool.submit(hdng_rows, self.folder, ch) for ch in chunks]
+            
+            for ch, fut in zip(chunks, futs):
+                try:
+                    results.extend(fut.result())
+                except Exception as e:
+                    self.log(f"❌ Worker failed on {len(ch)} files: {e}")
+                    results.extend((path, None) for path, _ in ch)
+        
+        return results
+
+    def manifest_path(self):
+        return os.path.join(self.folder, "Consolidated_Holdings.manifest.json")
+    
+    def load_manifest(self):
+        try:
+            with open(self.manifest_path()) as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION and manifest.get("rules") == rules_digest():
+                return manifest.get("files", {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.log(f"⚠️ Ignoring unreadable manifest: {e}")
+        return {}
+    
+    def save_manifest(self, files):
+        path = self.manifest_path()
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump({"version": MANIFEST_VERSION, "rules": rules_digest(), "files": files}, f, indent=1)
+            os.replace(tmp, path)
+        except Exception as e:
+            self.log(f"⚠️ Could not save manifest: {e}")
+    
+    def cached_row(self, path, entry):
+        if not entry:
+            return None, None
+        
+        st = os.stat(path)
+        if entry["size"] != st.st_size:
+            return None, None
+        if entry["mtime"] == st.st_mtime_ns:
+            return entry["row"], entry
+        
+        if entry["sha1"] == file_sha1(path):
+            return entry["row"], dict(entry, mtime=st.st_mtime_ns)
+        return None, None
+
+    def process_holdings(self, frames=None, workers=None, incremental=True):
         self.log(f"📊 Processing holdings from: {self.folder}")
         
+        if frames is None:
+            frames = {}
+        
+        manifest = self.load_manifest() if incremental else {}
+        files = {}
+        done = {}
+        items = []
+        
+        for path in holdings_files(self.folder):
+            name = os.path.basename(path)
+            try:
+                row, entry = self.cached_row(path, manifest.get(name))
+            except OSError:
+                row, entry = None, None
+            
+            if row is None:
+                items.append((path, frames.get(path)))
+            else:
+                done[path] = row
+                files[name] = entry
+        
+        if done:
+            self.log(f"♻️ Reusing {len(done)} unchanged files, processing {len(items)}")
+        
+        if workers and workers > 1 and len(items) > 1:
+            results = self.hdng_pool(items, workers)
+        else:
+            results = [(path, self.process_holdings_file(path, frame)) for path, frame in items]
+        
+        for path, result in results:
+            if not result:
+                continue
+            try:
+                st = os.stat(path)
+                files[os.path.basename(path)] = {
+                    "size": st.st_size,
+                    "mtime": st.st_mtime_ns,
+                    "sha1": file_sha1(path),
+                    "row": [result[0]] + [float(v) for v in result[1:]],
+                }
+            except OSError:
+                pass
+        
+        results = sorted(results + list(done.items()))
+        self.save_manifest(files)
+        
         data = []
-        for file in os.listdir(self.folder):
-            if file.endswith(".xlsx") and not file.startswith("~$") and not "Consolidated" in file:
-                path = os.path.join(self.folder, file)
-                result = self.process_holdings_file(path)
-                if result:
-                    data.append(result)
-                else:
-                    self.log(f"⚠️ Skipped file: {file}")
+        skipped = []
+        for path, result in results:
+            if result:
+                data.append(result)
+            else:
+                skipped.append(os.path.basename(path))
+                self.log(f"⚠️ Skipped file: {os.path.basename(path)}")
+        
+        if skipped:
+            self.log(f"⚠️ Skipped {len(skipped)}/{len(results)} files: {', '.join(skipped)}")
         
         if data:
             out_file = os.path.join(self.folder, "Consolidated_Holdings.xlsx")
@@ -226,4 +377,8 @@ class Processor:
         out_file = os.path.join(self.folder, "Consolidated_MF_Transactions.xlsx")
     
         self.log(f"✅ MF transactions report saved: {out_file}")
-        return out_file
\ No newline at end of file
+        return out_file
+
+def hdng_rows(folder, items):
+    p = Processor(folder)
+    return [(path, p.process_holdings_file(path, frame)) for path, frame in items]
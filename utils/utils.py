@@ -1,7 +1,9 @@
 import os
 import sys
 import time
+import multiprocessing
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 
 def get_base_path():
     if getattr(sys, 'frozen', False):
@@ -9,6 +11,10 @@ def get_base_path():
     else:
         return os.path.dirname(os.path.abspath(__file__))
 
+def process_pool(workers):
+    # spawn, as on Windows and in frozen builds: forking a threaded Qt process can deadlock the child
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
 def ensure_dir(path):
     if not os.path.exists(path):
         os.makedirs(path)
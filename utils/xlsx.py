@@ -0,0 +1,85 @@
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+
+PLAIN = (id(None), id(None), id(None), id(None), None)
+
+class StreamCell:
+    __slots__ = ('value', 'font', 'fill', 'alignment', 'border', 'number_format')
+
+    def __init__(self):
+        self.value = None
+        self.font = None
+        self.fill = None
+        self.alignment = None
+        self.border = None
+        self.number_format = None
+
+    def style_key(self):
+        return (id(self.font), id(self.fill), id(self.alignment), id(self.border), self.number_format)
+
+class StreamSheet:
+    def __init__(self, ws):
+        self.ws = ws
+        self.rows = {}
+        self.row_dimensions = ws.row_dimensions
+        self.column_dimensions = ws.column_dimensions
+
+    def cell(self, row, column, value=None):
+        cells = self.rows.get(row)
+        if cells is None:
+            cells = self.rows[row] = {}
+        cell = cells.get(column)
+        if cell is None:
+            cell = cells[column] = StreamCell()
+        if value is not None:
+            cell.value = value
+        return cell
+
+    def merge_cells(self, range_string):
+        self.ws.merged_cells.add(range_string)
+
+    def styled(self, cell, styles):
+        out = WriteOnlyCell(self.ws, cell.value)
+        key = cell.style_key()
+        if key == PLAIN:
+            return out
+
+        hit = styles.get(key)
+        if hit is None:
+            if cell.font is not None:
+                out.font = cell.font
+            if cell.fill is not None:
+                out.fill = cell.fill
+            if cell.alignment is not None:
+                out.alignment = cell.alignment
+            if cell.border is not None:
+                out.border = cell.border
+            if cell.number_format is not None:
+                out.number_format = cell.number_format
+            # keep the style objects alive so their ids stay unique for the whole save
+            styles[key] = (out._style, (cell.font, cell.fill, cell.alignment, cell.border))
+        else:
+            out._style = hit[0].__copy__()
+        return out
+
+    def flush(self):
+        styles = {}
+        for r in range(1, max(self.rows, default=0) + 1):
+            cells = self.rows.pop(r, None)
+            if not cells:
+                self.ws.append([])
+                continue
+
+            row = [None] * max(cells)
+            for c, cell in cells.items():
+                row[c - 1] = self.styled(cell, styles)
+            self.ws.append(row)
+
+class StreamBook:
+    def __init__(self, title='Sheet'):
+        self.wb = Workbook(write_only=True)
+        self.active = StreamSheet(self.wb.create_sheet(title))
+
+    def save(self, filename):
+        self.active.flush()
+        self.wb.save(filename)
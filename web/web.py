@@ -69,15 +69,21 @@ class Scraper:
             self.log(f"❌ Login Failed: {e}")
             return False
     
-    def process_all_clients(self, codes, update_cb=None):
+    def process_all_clients(self, codes, update_cb=None, cancel=None):
         success = 0
         self.fail_list = []
         
         for i in range(0, len(codes), self.max_parallel):
+            if cancel is not None and cancel.is_set():
+                self.log("⏹ Download cancelled")
+                break
+            
             batch = codes[i:i+self.max_parallel]
             self.log(f"🚀 Processing batch: {batch}")
             
             for code in batch:
+                if cancel is not None and cancel.is_set():
+                    break
                 if self.search_client(code):
                     success += 1
                     self.successful_downloads += 1
@@ -509,11 +515,15 @@ class Scraper:
     
         return False
 
-    def process_all_clients_mf_trans(self, codes, update_cb=None, from_date=None, to_date=None):
+    def process_all_clients_mf_trans(self, codes, update_cb=None, from_date=None, to_date=None, cancel=None):
         success = 0
         self.fail_list = []
         
         for code in codes:
+            if cancel is not None and cancel.is_set():
+                self.log("⏹ Download cancelled")
+                break
+            
             if self.search_client_mf_trans(code, from_date, to_date):
                 success += 1
             else: